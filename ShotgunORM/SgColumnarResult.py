@@ -0,0 +1,400 @@
+# Copyright (c) 2013, Nathan Dunsworth - NFXPlugins
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the NFXPlugins nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL NFXPLUGINS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+__all__ = [
+  'SgColumnarResult',
+  'decodeRawResults',
+  'rawFieldDecoders'
+]
+
+# Python imports
+import array
+import datetime
+
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+# This module imports
+import ShotgunORM
+
+################################################################################
+#
+# Raw field decoders.
+#
+# Each decoder converts a value returned by the Shotgun API the same way the
+# _fromFieldData() of the SgField class used for the return type does, without
+# building the field.  The values are never shared with Entity objects so
+# unlike the fields they are not copied.
+#
+################################################################################
+
+def _decodeCheckbox(sgData):
+  return bool(sgData)
+
+def _decodeDate(sgData):
+  if sgData != None:
+    sgData = str(sgData)
+
+  return sgData
+
+def _decodeDateTime(sgData):
+  if sgData != None:
+    sgData = datetime.datetime(*sgData.timetuple()[:6], tzinfo=sgData.tzinfo)
+
+  return sgData
+
+def _decodeEntityMulti(sgData):
+  if sgData == None or len(sgData) <= 0:
+    return []
+
+  result = []
+  found = set()
+
+  for i in sgData:
+    key = (i['type'], i['id'])
+
+    if key in found:
+      continue
+
+    found.add(key)
+
+    e = {
+      'type': i['type'],
+      'id': i['id']
+    }
+
+    if e['type'] in ['AppWelcome', 'Banner'] and i.has_key('name'):
+      e['name'] = i['name']
+
+    result.append(e)
+
+  return result
+
+def _decodeFloat(sgData):
+  if sgData != None:
+    sgData = float(sgData)
+
+  return sgData
+
+def _decodeInt(sgData):
+  if sgData != None:
+    sgData = int(sgData)
+
+  return sgData
+
+def _decodeSerializable(sgData):
+  if sgData in [None, {}]:
+    return None
+
+  return sgData
+
+def _decodeTagList(sgData):
+  if sgData in [None, []]:
+    return []
+
+  return list(set(sgData))
+
+def _decodeText(sgData):
+  if sgData != None:
+    sgData = str(sgData)
+
+  return sgData
+
+def _decodeUrl(sgData):
+  if sgData == None:
+    return None
+
+  result = {
+    'link_type': sgData['link_type'].lower()
+  }
+
+  if result['link_type'] in ['upload', 'web']:
+    result['url'] = sgData['url']
+  else:
+    for i in [
+      'id',
+      'local_path',
+      'local_path_linux',
+      'local_path_mac',
+      'local_path_windows',
+      'local_storage',
+      'type'
+    ]:
+      result[i] = sgData[i]
+
+  result['name'] = sgData['name']
+  result['content_type'] = sgData.get('content_type', None)
+
+  return result
+
+# Decoder used by each return type, all other return types are used as is.
+_RAW_DECODERS = {
+  ShotgunORM.SgField.RETURN_TYPE_CHECKBOX: _decodeCheckbox,
+  ShotgunORM.SgField.RETURN_TYPE_DATE: _decodeDate,
+  ShotgunORM.SgField.RETURN_TYPE_DATE_TIME: _decodeDateTime,
+  ShotgunORM.SgField.RETURN_TYPE_FLOAT: _decodeFloat,
+  ShotgunORM.SgField.RETURN_TYPE_INT: _decodeInt,
+  ShotgunORM.SgField.RETURN_TYPE_MULTI_ENTITY: _decodeEntityMulti,
+  ShotgunORM.SgField.RETURN_TYPE_SERIALIZABLE: _decodeSerializable,
+  ShotgunORM.SgField.RETURN_TYPE_TAG_LIST: _decodeTagList,
+  ShotgunORM.SgField.RETURN_TYPE_TEXT: _decodeText,
+  ShotgunORM.SgField.RETURN_TYPE_TIMECODE: _decodeInt,
+  ShotgunORM.SgField.RETURN_TYPE_URL: _decodeUrl
+}
+
+# Return types stored in typed arrays by SgColumnarResult, the array typecode
+# and numpy dtype.
+_TYPED_COLUMNS = {
+  ShotgunORM.SgField.RETURN_TYPE_FLOAT: ('d', 'float64'),
+  ShotgunORM.SgField.RETURN_TYPE_INT: ('l', 'int64'),
+  ShotgunORM.SgField.RETURN_TYPE_TIMECODE: ('l', 'int64')
+}
+
+def _fieldInfo(sgEntityInfo, sgField):
+  '''
+  Internal function!
+
+  Returns the SgFieldSchemaInfo of the field, deep linked fields such as
+  "sg_sequence.Sequence.code" are followed.  None is returned when the field
+  is unknown.
+  '''
+
+  if sgEntityInfo == None:
+    return None
+
+  parts = sgField.split('.', 2)
+
+  if len(parts) == 1:
+    return sgEntityInfo.fieldInfo(sgField)
+  elif len(parts) < 3:
+    return None
+
+  return _fieldInfo(
+    sgEntityInfo.schema().entityInfo(parts[1]),
+    parts[2]
+  )
+
+def rawFieldDecoders(sgEntityInfo, sgFields):
+  '''
+  Returns a dict of field name keys and the function used to decode their raw
+  Shotgun values.
+
+  Fields whose values are used as is are not included.
+
+  Args:
+    * (SgEntitySchemaInfo) sgEntityInfo:
+      Schema info of the Entity type.
+
+    * (list) sgFields:
+      List of field names.
+  '''
+
+  result = {}
+
+  for field in sgFields:
+    info = _fieldInfo(sgEntityInfo, field)
+
+    if info == None:
+      continue
+
+    decoder = _RAW_DECODERS.get(info.returnType(), None)
+
+    if decoder != None:
+      result[field] = decoder
+
+  return result
+
+def decodeRawResults(sgEntityInfo, sgFields, sgResults):
+  '''
+  Decodes the field values of Shotgun API search results in place and returns
+  them.
+
+  Args:
+    * (SgEntitySchemaInfo) sgEntityInfo:
+      Schema info of the Entity type.
+
+    * (list) sgFields:
+      List of field names that were searched for.
+
+    * (list) sgResults:
+      Search results.
+  '''
+
+  decoders = rawFieldDecoders(sgEntityInfo, sgFields).items()
+
+  if len(decoders) <= 0:
+    return sgResults
+
+  for row in sgResults:
+    for field, decoder in decoders:
+      if row.has_key(field):
+        row[field] = decoder(row[field])
+
+  return sgResults
+
+class SgColumnarResult(object):
+  '''
+  Column oriented search result.
+
+  Each field is stored as a single column, int and float columns that do not
+  contain None values are stored as numpy arrays when numpy is installed and
+  as array.array objects otherwise.  All other columns are lists.
+
+  Created by SgConnection.findRaw(..., sgColumnar=True).
+  '''
+
+  def __contains__(self, item):
+    return self._columns.has_key(item)
+
+  def __getitem__(self, item):
+    return self._columns[item]
+
+  def __iter__(self):
+    return iter(self._fields)
+
+  def __len__(self):
+    return self._size
+
+  def __repr__(self):
+    return '<%s(type:%s, rows:%d, fields:%s)>' % (
+      type(self).__name__,
+      self._entityType,
+      self._size,
+      self._fields
+    )
+
+  def __init__(self, sgEntityInfo, sgFields, sgResults, useNumpy=None):
+    '''
+    Args:
+      * (SgEntitySchemaInfo) sgEntityInfo:
+        Schema info of the Entity type.
+
+      * (list) sgFields:
+        List of field names that were searched for.
+
+      * (list) sgResults:
+        Raw Shotgun API search results.
+
+      * (bool) useNumpy:
+        Store typed columns as numpy arrays, by default numpy is used when
+        installed.
+    '''
+
+    if useNumpy == None:
+      useNumpy = numpy != None
+    elif useNumpy and numpy == None:
+      raise RuntimeError('numpy is not installed')
+
+    self._entityType = sgEntityInfo.name()
+    self._fields = ['id'] + sorted([x for x in sgFields if x not in ['id', 'type']])
+    self._size = len(sgResults)
+
+    decoders = rawFieldDecoders(sgEntityInfo, self._fields)
+
+    columns = {}
+
+    for field in self._fields:
+      decoder = decoders.get(field, None)
+
+      if decoder == None:
+        values = [row.get(field, None) for row in sgResults]
+      else:
+        values = [decoder(row.get(field, None)) for row in sgResults]
+
+      info = _fieldInfo(sgEntityInfo, field)
+
+      typed = None
+
+      if info != None:
+        typed = _TYPED_COLUMNS.get(info.returnType(), None)
+
+      if typed != None and None not in values:
+        if useNumpy:
+          values = numpy.array(values, dtype=typed[1])
+        else:
+          values = array.array(typed[0], values)
+
+      columns[field] = values
+
+    self._columns = columns
+
+  def column(self, sgField):
+    '''
+    Returns the column of the field.
+    '''
+
+    return self._columns[sgField]
+
+  def columns(self):
+    '''
+    Returns a dict of field name keys and their columns.
+    '''
+
+    return dict(self._columns)
+
+  def entityType(self):
+    '''
+    Returns the Entity type of the result.
+    '''
+
+    return self._entityType
+
+  def fields(self):
+    '''
+    Returns the list of fields, "id" is always first.
+    '''
+
+    return list(self._fields)
+
+  def row(self, index):
+    '''
+    Returns the row at index as a dict.
+    '''
+
+    result = {
+      'type': self._entityType
+    }
+
+    for field in self._fields:
+      value = self._columns[field][index]
+
+      # Unwrap numpy scalars.
+      if hasattr(value, 'item'):
+        value = value.item()
+
+      result[field] = value
+
+    return result
+
+  def rows(self):
+    '''
+    Returns a generator yielding each row as a dict.
+    '''
+
+    for i in xrange(self._size):
+      yield self.row(i)
@@ -0,0 +1,411 @@
+# Copyright (c) 2013, Nathan Dunsworth - NFXPlugins
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the NFXPlugins nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL NFXPLUGINS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+__all__ = [
+  'SgCommitQueue'
+]
+
+# Python imports
+import atexit
+import collections
+import threading
+import time
+import weakref
+
+# This module imports
+import ShotgunORM
+
+SGORM_COMMIT_QUEUES = weakref.WeakSet()
+
+def sgorm_commit_queue_atexit():
+  '''
+  Internal function!
+
+  Flushes any pending write-behind commits before the interpreter exits.
+  '''
+
+  for commitQueue in list(SGORM_COMMIT_QUEUES):
+    try:
+      commitQueue.shutdown()
+    except Exception, e:
+      ShotgunORM.LoggerConnection.error(e)
+
+atexit.register(sgorm_commit_queue_atexit)
+
+class SgCommitQueue(object):
+  '''
+  Write-behind queue for Entity commits.
+
+  When a connection has write-behind enabled SgEntity.commit() adds the Entity
+  to the queue instead of publishing it immediately.  Committing the same
+  Entity again before the queue flushes merges the requested fields so each
+  Entity is sent once per flush, field values are read when the queue flushes
+  which coalesces repeated updates of a field into a single request carrying
+  the latest value.
+
+  The queue flushes in a single batch when it holds maxSize Entities, when the
+  oldest queued Entity has waited maxDelay seconds or when flush() is called.
+  Every flushed Entity receives its afterCommit() call with the batch result or
+  error.
+
+  An Entity whose toBatchData() or beforeCommit() raises is left out of the
+  batch and keeps its modifications, the other Entities are still committed.
+  '''
+
+  def __enter__(self):
+    self.__lock.acquire()
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.__lock.release()
+
+    return False
+
+  def __len__(self):
+    return len(self.__pending)
+
+  def __repr__(self):
+    connection = self.connection()
+
+    if connection == None:
+      return '<SgCommitQueue>'
+
+    return '<SgCommitQueue(url:"%(url)s", script:"%(script)s">' % {
+      'url': connection.url(),
+      'script': connection.scriptName()
+    }
+
+  def __init__(self, sgConnection, maxSize=None, maxDelay=None):
+    if maxSize == None:
+      maxSize = ShotgunORM.config.WRITE_BEHIND_MAX_SIZE
+
+    if maxDelay == None:
+      maxDelay = ShotgunORM.config.WRITE_BEHIND_MAX_DELAY
+
+    self.__lock = threading.RLock()
+    self.__flushLock = threading.Lock()
+
+    self.__connection = weakref.ref(sgConnection)
+
+    self.__maxSize = max(0, int(maxSize))
+    self.__maxDelay = max(0.0, float(maxDelay))
+
+    # id(entity) -> [entity, field names or None for all, time queued]
+    self.__pending = collections.OrderedDict()
+
+    self.__event = threading.Event()
+    self.__shutdownEvent = threading.Event()
+
+    self.__workerThread = threading.Thread(
+      name=self.__repr__(),
+      target=SgCommitQueueWorker,
+      args=[
+        weakref.ref(self),
+        self.__event,
+        self.__shutdownEvent
+      ]
+    )
+
+    self.__workerThread.setDaemon(True)
+
+    SGORM_COMMIT_QUEUES.add(self)
+
+  def _flushDelay(self):
+    '''
+    Internal function!
+
+    Returns the number of seconds until the time trigger fires or None when
+    there is nothing waiting on it.
+    '''
+
+    with self:
+      if len(self.__pending) <= 0 or self.__maxDelay <= 0:
+        return None
+
+      queuedAt = self.__pending.itervalues().next()[2]
+
+      return max(0.0, queuedAt + self.__maxDelay - time.time())
+
+  def _isFlushDue(self):
+    '''
+    Internal function!
+
+    Returns True when either the size or time trigger has been reached.
+    '''
+
+    with self:
+      pendingSize = len(self.__pending)
+
+      if pendingSize <= 0:
+        return False
+
+      if self.__maxSize > 0 and pendingSize >= self.__maxSize:
+        return True
+
+      return self._flushDelay() == 0.0
+
+  def connection(self):
+    '''
+    Returns the connection the queue belongs to.
+    '''
+
+    return self.__connection()
+
+  def enqueue(self, sgEntity, sgFields=None):
+    '''
+    Adds the Entity to the queue.
+
+    If the Entity is already queued the fields are merged with the previously
+    queued fields.
+
+    Args:
+      * (SgEntity) sgEntity:
+        Entity to commit.
+
+      * (list) sgFields:
+        List of fields to commit, None for all modified fields.
+    '''
+
+    if not isinstance(sgEntity, ShotgunORM.SgEntity):
+      raise TypeError('expected an SgEntity got %s' % sgEntity)
+
+    if sgEntity.connection() != self.connection():
+      raise ValueError(
+        'entity %s does not belong to this connection %s' % (
+          sgEntity,
+          self.connection()
+        )
+      )
+
+    if sgFields != None:
+      if isinstance(sgFields, str):
+        sgFields = [sgFields]
+
+      sgFields = set(sgFields)
+
+    with self:
+      if self.__shutdownEvent.isSet():
+        raise RuntimeError('commit queue has been shutdown')
+
+      key = id(sgEntity)
+
+      entry = self.__pending.get(key, None)
+
+      if entry == None:
+        self.__pending[key] = [sgEntity, sgFields, time.time()]
+
+        wakeWorker = len(self.__pending) == 1
+      else:
+        if entry[1] != None:
+          if sgFields == None:
+            entry[1] = None
+          else:
+            entry[1].update(sgFields)
+
+        wakeWorker = False
+
+      if self.__maxSize > 0 and len(self.__pending) >= self.__maxSize:
+        wakeWorker = True
+
+      if not self.__workerThread.isAlive():
+        self.__workerThread.start()
+
+      if wakeWorker:
+        self.__event.set()
+
+  def flush(self):
+    '''
+    Commits all queued Entities and returns the batch result.
+
+    Raises the first batch exception after every Entity has received its
+    afterCommit() call.  Entities that fail to build their commit are not
+    committed, the remaining Entities are and then the first of their errors is
+    raised.
+    '''
+
+    with self.__flushLock:
+      with self:
+        entries = self.__pending.values()
+
+        self.__pending.clear()
+
+      if len(entries) <= 0:
+        return []
+
+      connection = self.connection()
+
+      if connection == None:
+        raise RuntimeError('connection no longer exists')
+
+      ShotgunORM.LoggerConnection.debug('%(queue)s.flush()', {'queue': self})
+      ShotgunORM.LoggerConnection.debug('    * entities: %(size)d', {'size': len(entries)})
+
+      entities = []
+
+      for entry in entries:
+        entry[0]._lock()
+
+        entities.append(entry[0])
+
+      # (entity, exception) of Entities that failed to build their commit.
+      failed = []
+
+      try:
+        batchRequests = []
+
+        for entity, fields, queuedAt in entries:
+          try:
+            commitData = entity.toBatchData(fields)
+          except Exception, e:
+            failed.append((entity, e))
+
+            continue
+
+          if len(commitData) <= 0:
+            continue
+
+          batchRequests.append(
+            {
+              'entity': entity,
+              'batch_data': commitData
+            }
+          )
+
+        try:
+          result = connection._batch(
+            batchRequests,
+            False,
+            ShotgunORM.config.BATCH_CHUNK_SIZE,
+            ShotgunORM.config.BATCH_CHUNK_BYTES,
+            ShotgunORM.config.BATCH_MAX_WORKERS,
+            failed
+          )
+        finally:
+          for entity, error in failed:
+            ShotgunORM.LoggerConnection.error(
+              'unable to commit %(entity)s, %(error)s' % {
+                'entity': entity,
+                'error': error
+              }
+            )
+      finally:
+        for entity in entities:
+          entity._unlock()
+
+      if len(failed) > 0:
+        raise failed[0][1]
+
+      return result
+
+  def isPending(self, sgEntity):
+    '''
+    Returns True if the Entity is waiting in the queue.
+    '''
+
+    with self:
+      return self.__pending.has_key(id(sgEntity))
+
+  def isShutdown(self):
+    '''
+    Returns True if the queue has been shutdown.
+    '''
+
+    return self.__shutdownEvent.isSet()
+
+  def maxDelay(self):
+    '''
+    Returns the max number of seconds an Entity waits in the queue.
+    '''
+
+    return self.__maxDelay
+
+  def maxSize(self):
+    '''
+    Returns the number of queued Entities that triggers a flush.
+    '''
+
+    return self.__maxSize
+
+  def pending(self):
+    '''
+    Returns the list of queued Entities.
+    '''
+
+    with self:
+      return [x[0] for x in self.__pending.values()]
+
+  def shutdown(self):
+    '''
+    Stops the background flush thread and commits any queued Entities.
+    '''
+
+    with self:
+      if self.__shutdownEvent.isSet():
+        return []
+
+      self.__shutdownEvent.set()
+      self.__event.set()
+
+      SGORM_COMMIT_QUEUES.discard(self)
+
+    return self.flush()
+
+def SgCommitQueueWorker(commitQueue, event, eventShutdown):
+  '''
+  Internal function!
+
+  Background thread that flushes a SgCommitQueue when its size or time trigger
+  fires.
+  '''
+
+  while not eventShutdown.isSet():
+    q = commitQueue()
+
+    if q == None:
+      return
+
+    try:
+      delay = q._flushDelay()
+    finally:
+      del q
+
+    event.wait(delay)
+    event.clear()
+
+    if eventShutdown.isSet():
+      return
+
+    q = commitQueue()
+
+    if q == None:
+      return
+
+    try:
+      if q._isFlushDue():
+        q.flush()
+    except Exception, e:
+      ShotgunORM.LoggerConnection.error(e)
+    finally:
+      del q
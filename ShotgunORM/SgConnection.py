@@ -25,16 +25,18 @@
 #
 
 __all__ = [
+  'SgBulkCreateError',
   'SgConnection',
   'SgConnectionMeta'
 ]
 
 # Python imports
 import atexit
-import copy
 import os
+import Queue
 import re
 import threading
+import time
 import types
 import weakref
 import webbrowser
@@ -53,6 +55,23 @@ def sgorm_connection_atexit():
 
 atexit.register(sgorm_connection_atexit)
 
+class SgBulkCreateError(Exception):
+  '''
+  Raised by SgConnection.bulkCreate() when a chunk fails.
+
+  The created attribute contains a {'type': type, 'id': id} handle for every
+  Entity the successful chunks created, in row order, and error contains the
+  exception of the first failed chunk.
+  '''
+
+  def __init__(self, error, created):
+    super(SgBulkCreateError, self).__init__(
+      '%s (%d Entities were created)' % (error, len(created))
+    )
+
+    self.error = error
+    self.created = created
+
 class SgConnectionMeta(type):
   '''
   Singleton metaclass for SgSchema objects.
@@ -173,21 +192,119 @@ class SgConnectionPriv(SgSite):
     self._scriptName = str(scriptName)
     self._scriptKey = str(scriptkey)
 
-    self._connection = ShotgunORM.SHOTGUN_API.shotgun.Shotgun(
-       base_url=self.url().lower(),
-       script_name=self._scriptName,
-       api_key=self._scriptKey,
-       convert_datetimes_to_utc=datetimeToUtc,
-       http_proxy=httpProxy,
-       ensure_ascii=ensureASCII,
-       connect=connect,
-       ca_certs=caCerts,
-       login=login,
-       password=password,
-       sudo_as_login=suAsLogin,
-       session_token=sessionToken,
-       auth_token=authToken
-    )
+    self._apiConnectionArgs = {
+      'base_url': self.url().lower(),
+      'script_name': self._scriptName,
+      'api_key': self._scriptKey,
+      'convert_datetimes_to_utc': datetimeToUtc,
+      'http_proxy': httpProxy,
+      'ensure_ascii': ensureASCII,
+      'connect': connect,
+      'ca_certs': caCerts,
+      'login': login,
+      'password': password,
+      'sudo_as_login': suAsLogin,
+      'session_token': sessionToken,
+      'auth_token': authToken
+    }
+
+    self.__apiPoolLock = threading.Lock()
+    self.__apiPool = []
+
+    self.__metrics = ShotgunORM.SgConnectionMetrics(self.url(), self._scriptName)
+    self.__recorder = None
+
+    self._connection = self._createApiConnection()
+
+  def _createApiConnection(self):
+    '''
+    Internal function!
+
+    Returns a new Shotgun Python API connection object.
+    '''
+
+    return ShotgunORM.SHOTGUN_API.shotgun.Shotgun(**self._apiConnectionArgs)
+
+  def _sg_call(self, callName, apiFunc, args, lock=True):
+    '''
+    Internal function!
+
+    Calls apiFunc(*args) and records the call in the connections metrics and
+    request recording.
+
+    Args:
+      * (str) callName:
+        Shotgun API function name the call is recorded as.
+
+      * (function) apiFunc:
+        Shotgun API function.
+
+      * (tuple) args:
+        Args passed to apiFunc.
+
+      * (bool) lock:
+        Hold the global Shotgun Python API lock during the call.
+    '''
+
+    metrics = self.__metrics
+    recorder = self.__recorder
+
+    metricsEnabled = metrics.isEnabled()
+
+    if not metricsEnabled and recorder == None:
+      if lock:
+        with ShotgunORM.SHOTGUN_API_LOCK:
+          return apiFunc(*args)
+
+      return apiFunc(*args)
+
+    payloadBytes = metrics.payloadSize(args)
+
+    start = time.time()
+
+    if lock:
+      ShotgunORM.SHOTGUN_API_LOCK.acquire()
+
+    try:
+      acquired = time.time()
+
+      try:
+        result = apiFunc(*args)
+      except Exception, e:
+        elapsed = time.time() - acquired
+
+        if metricsEnabled:
+          metrics.record(
+            callName,
+            elapsed,
+            acquired - start,
+            payloadBytes=payloadBytes,
+            error=e
+          )
+
+        if recorder != None:
+          recorder.record(callName, args, elapsed, error=e)
+
+        raise
+    finally:
+      if lock:
+        ShotgunORM.SHOTGUN_API_LOCK.release()
+
+    elapsed = time.time() - acquired
+
+    if metricsEnabled:
+      metrics.record(
+        callName,
+        elapsed,
+        acquired - start,
+        result,
+        payloadBytes
+      )
+
+    if recorder != None:
+      recorder.record(callName, args, elapsed, result)
+
+    return result
 
   def _sg_batch(self, requests):
     '''
@@ -196,8 +313,95 @@ class SgConnectionPriv(SgSite):
     This will lock the global Shotgun Python API lock.
     '''
 
-    with ShotgunORM.SHOTGUN_API_LOCK:
-      return self.connection().batch(requests)
+    return self._sg_call('batch', self.connection().batch, (requests, ))
+
+  def _sg_batch_chunks(self, chunks, maxWorkers=1):
+    '''
+    Calls the Shotgun Python API batch function once for each chunk of
+    requests, each chunk is its own transaction.
+
+    Returns a list of (result, exception) tuples in the same order as chunks,
+    a failed chunk does not prevent the remaining chunks from being sent.
+
+    When maxWorkers is greater than one the chunks are submitted concurrently,
+    each worker uses its own Shotgun Python API connection so the workers do
+    not serialize on the global Shotgun Python API lock.
+
+    Args:
+      * (list) chunks:
+        List of batch request lists.
+
+      * (int) maxWorkers:
+        Max number of chunks submitted at the same time.
+    '''
+
+    results = [None] * len(chunks)
+
+    if maxWorkers <= 1 or len(chunks) <= 1:
+      for i in xrange(len(chunks)):
+        try:
+          results[i] = (self._sg_batch(chunks[i]), None)
+        except Exception, e:
+          results[i] = (None, e)
+
+      return results
+
+    jobs = Queue.Queue()
+
+    for i in xrange(len(chunks)):
+      jobs.put(i)
+
+    def worker():
+      with self.__apiPoolLock:
+        if len(self.__apiPool) > 0:
+          api = self.__apiPool.pop()
+        else:
+          api = None
+
+      try:
+        if api == None:
+          api = self._createApiConnection()
+
+        while True:
+          try:
+            i = jobs.get_nowait()
+          except Queue.Empty:
+            break
+
+          try:
+            results[i] = (
+              self._sg_call('batch', api.batch, (chunks[i], ), lock=False),
+              None
+            )
+          except Exception, e:
+            results[i] = (None, e)
+      except Exception, e:
+        # Unable to create an API connection, fail what remains.
+        while True:
+          try:
+            results[jobs.get_nowait()] = (None, e)
+          except Queue.Empty:
+            break
+      finally:
+        if api != None:
+          with self.__apiPoolLock:
+            self.__apiPool.append(api)
+
+    threads = []
+
+    for i in xrange(min(maxWorkers, len(chunks))):
+      thread = threading.Thread(name='%s._sg_batch_chunks' % self, target=worker)
+
+      thread.setDaemon(True)
+
+      threads.append(thread)
+
+      thread.start()
+
+    for thread in threads:
+      thread.join()
+
+    return results
 
   def _sg_delete(self, entityType, entityId):
     '''
@@ -206,8 +410,11 @@ class SgConnectionPriv(SgSite):
     This will lock the global Shotgun Python API lock.
     '''
 
-    with ShotgunORM.SHOTGUN_API_LOCK:
-      return self.connection().delete(entityType, entityId)
+    return self._sg_call(
+      'delete',
+      self.connection().delete,
+      (entityType, entityId)
+    )
 
   def _sg_find(
     self,
@@ -231,8 +438,10 @@ class SgConnectionPriv(SgSite):
     if fields != None:
       fields = list(fields)
 
-    with ShotgunORM.SHOTGUN_API_LOCK:
-      result = self.connection().find(
+    result = self._sg_call(
+      'find',
+      self.connection().find,
+      (
         entity_type,
         filters,
         fields,
@@ -244,13 +453,14 @@ class SgConnectionPriv(SgSite):
         include_archived_projects,
         additional_filter_presets
       )
+    )
 
-      return ShotgunORM.onSearchResult(
-        self,
-        entity_type,
-        fields,
-        result
-      )
+    return ShotgunORM.onSearchResult(
+      self,
+      entity_type,
+      fields,
+      result
+    )
 
   def _sg_find_one(
     self,
@@ -272,8 +482,10 @@ class SgConnectionPriv(SgSite):
     if fields != None:
       fields = list(fields)
 
-    with ShotgunORM.SHOTGUN_API_LOCK:
-      result = self.connection().find_one(
+    result = self._sg_call(
+      'find_one',
+      self.connection().find_one,
+      (
         entity_type,
         filters,
         fields,
@@ -283,21 +495,25 @@ class SgConnectionPriv(SgSite):
         include_archived_projects,
         additional_filter_presets
       )
+    )
 
-      return ShotgunORM.onSearchResult(
-        self,
-        entity_type,
-        fields,
-        [result]
-      )[0]
+    return ShotgunORM.onSearchResult(
+      self,
+      entity_type,
+      fields,
+      [result]
+    )[0]
 
   def _sg_note_thread_read(self, note_id, entity_fields=None):
     '''
 
     '''
 
-    with ShotgunORM.SHOTGUN_API_LOCK:
-      return self.connection().note_thread_read(note_id, entity_fields)
+    return self._sg_call(
+      'note_thread_read',
+      self.connection().note_thread_read,
+      (note_id, entity_fields)
+    )
 
   def _sg_revive(self, entityType, entityId):
     '''
@@ -306,32 +522,44 @@ class SgConnectionPriv(SgSite):
     This will lock the global Shotgun Python API lock.
     '''
 
-    with ShotgunORM.SHOTGUN_API_LOCK:
-      return self.connection().revive(entityType, entityId)
+    return self._sg_call(
+      'revive',
+      self.connection().revive,
+      (entityType, entityId)
+    )
 
   def _sg_schema_entity_read(self, project_entity=None):
     '''
 
     '''
 
-    with ShotgunORM.SHOTGUN_API_LOCK:
-      return self.connection().schema_entity_read(project_entity)
+    return self._sg_call(
+      'schema_entity_read',
+      self.connection().schema_entity_read,
+      (project_entity, )
+    )
 
   def _sg_schema_field_read(self, entity_type, field_name=None, project_entity=None):
     '''
 
     '''
 
-    with ShotgunORM.SHOTGUN_API_LOCK:
-      return self.connection().schema_field_read(entity_type, field_name, project_entity)
+    return self._sg_call(
+      'schema_field_read',
+      self.connection().schema_field_read,
+      (entity_type, field_name, project_entity)
+    )
 
   def _sg_schema_read(self, project_entity=None):
     '''
 
     '''
 
-    with ShotgunORM.SHOTGUN_API_LOCK:
-      return self.connection().schema_read(project_entity)
+    return self._sg_call(
+      'schema_read',
+      self.connection().schema_read,
+      (project_entity, )
+    )
 
   def _sg_summarize(
     self,
@@ -348,8 +576,10 @@ class SgConnectionPriv(SgSite):
     This will lock the global Shotgun Python API lock.
     '''
 
-    with ShotgunORM.SHOTGUN_API_LOCK:
-      return self.connection().summarize(
+    return self._sg_call(
+      'summarize',
+      self.connection().summarize,
+      (
         entity_type,
         filters,
         summary_fields,
@@ -357,6 +587,7 @@ class SgConnectionPriv(SgSite):
         grouping,
         include_archived_projects
       )
+    )
 
   def _sg_text_search(
     self,
@@ -369,13 +600,16 @@ class SgConnectionPriv(SgSite):
 
     '''
 
-    with ShotgunORM.SHOTGUN_API_LOCK:
-      return self.connection().text_search(
+    return self._sg_call(
+      'text_search',
+      self.connection().text_search,
+      (
         text,
         entity_types,
         project_ids,
         limit
       )
+    )
 
   def _sg_update(
     self,
@@ -388,13 +622,16 @@ class SgConnectionPriv(SgSite):
 
     '''
 
-    with ShotgunORM.SHOTGUN_API_LOCK:
-      return self.connection().update(
+    return self._sg_call(
+      'update',
+      self.connection().update,
+      (
         entity_type,
         entity_id,
         data,
         multi_entity_update_modes
       )
+    )
 
   def connect(self):
     '''
@@ -433,6 +670,13 @@ class SgConnectionPriv(SgSite):
 
     return self.connection()._connection != None
 
+  def isRecording(self):
+    '''
+    Returns True if the connection is recording its Shotgun API requests.
+    '''
+
+    return self.__recorder != None
+
   def key(self):
     '''
     Returns the Shotgun key for the connection.
@@ -440,6 +684,22 @@ class SgConnectionPriv(SgSite):
 
     return self._key
 
+  def metrics(self):
+    '''
+    Returns the SgConnectionMetrics recording the Shotgun API calls made by the
+    connection.
+    '''
+
+    return self.__metrics
+
+  def recorder(self):
+    '''
+    Returns the SgRequestRecorder recording the connections Shotgun API
+    requests or None when not recording.
+    '''
+
+    return self.__recorder
+
   def scriptName(self):
     '''
     Returns the Shotgun script name for the connection.
@@ -447,6 +707,69 @@ class SgConnectionPriv(SgSite):
 
     return self._scriptName
 
+  def startRecording(self, filename, compression=None, recordSchema=True):
+    '''
+    Starts recording every Shotgun API request made by the connection, its
+    time and its response to filename.
+
+    The recording can be replayed with a SgReplayConnection to reproduce the
+    request pattern of a tool offline.
+
+    The schema is read from Shotgun when the connection is created, before
+    recording can start, so when recordSchema is True the schema requests are
+    made again and recorded.  This lets a SgReplayConnection created in a new
+    process build its schema from the recording.
+
+    Returns the SgRequestRecorder.
+
+    Args:
+      * (str) filename:
+        Recording file, a ".gz" or ".bz2" extension compresses it.
+
+      * (str) compression:
+        Compression to use, "gzip", "bz2" or "none".
+
+      * (bool) recordSchema:
+        Record the schema requests.
+    '''
+
+    recorder = ShotgunORM.SgRequestRecorder(filename, 'wb', compression)
+
+    previous = self.__recorder
+
+    self.__recorder = recorder
+
+    if previous != None:
+      previous.close()
+
+    if recordSchema:
+      try:
+        self._sg_schema_entity_read()
+        self._sg_schema_read()
+      except:
+        self.stopRecording()
+
+        raise
+
+    return recorder
+
+  def stopRecording(self):
+    '''
+    Stops recording the connections Shotgun API requests and closes the
+    recording.
+
+    Returns the SgRequestRecorder or None if the connection was not recording.
+    '''
+
+    recorder = self.__recorder
+
+    self.__recorder = None
+
+    if recorder != None:
+      recorder.close()
+
+    return recorder
+
 class SgConnection(SgConnectionPriv):
   '''
   Class that represents a connection to Shotgun.
@@ -477,22 +800,23 @@ class SgConnection(SgConnectionPriv):
   def __exit__(self, exc_type, exc_value, traceback):
     self.__lockCache.release()
 
-  def __getattribute__(self, item):
-    try:
-      return super(SgConnection, self).__getattribute__(item)
-    except AttributeError, e:
-      if (
-        isinstance(item, str) and
-        ' ' not in item and
-        self.__schema.hasEntityType(item)
-      ):
-        return self._factory.entityClass(
-          self.__schema.entityApiName(item)
-        )
-      else:
-        raise
-    except:
-      raise
+  def __getattr__(self, item):
+    # Only called when normal attribute lookup fails.  Private attributes are
+    # never Entity types, this also prevents recursion before __init__ has set
+    # the schema.
+    if (
+      isinstance(item, str) and
+      not item.startswith('_') and
+      ' ' not in item and
+      self.__schema.hasEntityType(item)
+    ):
+      return self._factory.entityClass(
+        self.__schema.entityApiName(item)
+      )
+
+    raise AttributeError(
+      '\'%s\' object has no attribute \'%s\'' % (type(self).__name__, item)
+    )
 
   # def __dir__(self):
     # entity_names = []
@@ -565,13 +889,15 @@ class SgConnection(SgConnectionPriv):
     )
 
     if enableUndo == True:
-      self.__undo = ShotgunORM.SgUndo(self)
-    else:
       self.__undo = ShotgunORM.SgUndo(self, ShotgunORM.SgUndoStackRoot())
+    else:
+      self.__undo = ShotgunORM.SgUndo(self)
 
     self.__entityCache = {}
     self.__entityCaching = ShotgunORM.config.DEFAULT_CONNECTION_CACHING
 
+    self.__commitQueue = None
+
     self.__currentUser = None
 
   @classmethod
@@ -605,116 +931,223 @@ class SgConnection(SgConnectionPriv):
     one.
     '''
 
-    ShotgunORM.LoggerConnection.debug(
-      '%(connection)s._createEntity(...)', {'connection': self}
-    )
+    if ShotgunORM.LoggerConnection.isDebugging():
+      ShotgunORM.LoggerConnection.debug(
+        '%(connection)s._createEntity(...)', {'connection': self}
+      )
 
-    ShotgunORM.LoggerConnection.debug(
-      '    * sgEntityType: %(entityName)s', {'entityName': sgEntityType}
-    )
+      ShotgunORM.LoggerConnection.debug(
+        '    * sgEntityType: %(entityName)s', {'entityName': sgEntityType}
+      )
 
-    ShotgunORM.LoggerConnection.debug(
-      '    * sgData: %(sgData)s', {'sgData': sgData}
-    )
+      ShotgunORM.LoggerConnection.debug(
+        '    * sgData: %(sgData)s', {'sgData': sgData}
+      )
 
     with self:
-      sgData = dict(sgData)
+      result, onCreate = self.__createEntity(
+        self.classFactory(),
+        sgEntityType,
+        sgData
+      )
 
-      factory = self.classFactory()
+      # Entities that do not exist yet have nothing to sync.
+      if sgSyncFields != None and result.exists():
+        result.sync(
+          sgSyncFields,
+          ignoreValid=True,
+          ignoreWithUpdate=True,
+          backgroundPull=True
+        )
 
-      result = None
+      if onCreate:
+        ShotgunORM.onEntityCreate(result)
 
-      eId = None
+      return result
 
-      if sgData.has_key('id'):
-        eId = int(sgData['id'])
-      else:
-        eId = -1
+  def _createEntities(self, sgEntityType, sgData, sgSyncFields=None):
+    '''
+    Internal function!
+
+    Bulk version of _createEntity().  The connection is locked once for all the
+    rows, cached Entities are returned and only the Entities not found in the
+    cache are built.  onEntityCreate callbacks are fired after all the Entities
+    have been created.
+
+    Args:
+      * (str) sgEntityType:
+        Entity type of the rows, when None the "type" key of each row is used.
 
-      if not self.__entityCache.has_key(sgEntityType):
-        self.__entityCache[sgEntityType] = {}
+      * (list) sgData:
+        List of Shotgun formatted Entity dicts.
 
-      # Return immediately if the Entity does not exist.
-      if eId <= -1:
-        result = factory.createEntity(sgEntityType, sgData)
+      * (list|dict) sgSyncFields:
+        Fields to background sync for every Entity, or a dict of Entity type
+        keys and the list of fields to sync for that type.
+    '''
 
-        ShotgunORM.onEntityCreate(result)
+    if ShotgunORM.LoggerConnection.isDebugging():
+      ShotgunORM.LoggerConnection.debug(
+        '%(connection)s._createEntities(...)', {'connection': self}
+      )
 
-        return result
+      ShotgunORM.LoggerConnection.debug(
+        '    * sgEntityType: %(entityName)s', {'entityName': sgEntityType}
+      )
 
-      onCreate = False
+      ShotgunORM.LoggerConnection.debug(
+        '    * rows: %(rows)d', {'rows': len(sgData)}
+      )
 
-      # Check the cache and if its found update any non-valid fields that
-      # have data contained in the passed sgData.  If not found create the
-      # Entity and add it to the cache.]
-      if self.__entityCache[sgEntityType].has_key(eId):
-        cacheData = self.__entityCache[sgEntityType][eId]
-        result = cacheData['entity']
+    result = []
+    created = []
 
-        if result != None:
-          result = result()
+    with self:
+      factory = self.classFactory()
 
-        if result == None:
-          tmpData = {
-            'id': eId,
-            'type': sgEntityType
-          }
+      for data in sgData:
+        entityType = sgEntityType
 
-          tmpData.update(cacheData['cache'])
+        if entityType == None:
+          entityType = data['type']
 
-          result = factory.createEntity(sgEntityType, tmpData)
+        entity, onCreate = self.__createEntity(factory, entityType, data)
 
-          result._SgEntity__caching = cacheData['cache_state']
+        result.append(entity)
 
-          cacheData['entity'] = weakref.ref(result)
+        if onCreate:
+          created.append(entity)
 
-          onCreate = True
+      if sgSyncFields != None:
+        qEng = self.queryEngine()
 
-        with result:
-          del sgData['id']
-          del sgData['type']
+        qEng.block()
 
-          for field, value in sgData.items():
-            fieldObj = result.field(field)
+        try:
+          for entity in result:
+            if isinstance(sgSyncFields, dict):
+              syncFields = sgSyncFields.get(entity.type, None)
+            else:
+              syncFields = sgSyncFields
 
-            if (
-              fieldObj == None or
-              fieldObj.isValid() or
-              fieldObj.hasCommit() or
-              fieldObj.hasSyncUpdate()
-            ):
+            if syncFields == None or not entity.exists():
               continue
 
-            fieldObj.invalidate()
+            entity.sync(
+              syncFields,
+              ignoreValid=True,
+              ignoreWithUpdate=True,
+              backgroundPull=True
+            )
+        finally:
+          qEng.unblock()
 
-            fieldObj._updateValue = value
+      for entity in created:
+        ShotgunORM.onEntityCreate(entity)
 
-            fieldObj.setHasSyncUpdate(True)
-      else:
-        result = factory.createEntity(sgEntityType, sgData)
+    return result
+
+  def __createEntity(self, factory, sgEntityType, sgData):
+    '''
+    Internal function!
+
+    Returns a tuple of the Entity for sgData and True if the Entity was built.
+    The connection must be locked by the caller.
+    '''
+
+    sgData = dict(sgData)
+
+    result = None
+
+    eId = None
+
+    if sgData.has_key('id'):
+      eId = int(sgData['id'])
+    else:
+      eId = -1
+
+    typeCache = self.__entityCache.get(sgEntityType, None)
+
+    if typeCache == None:
+      typeCache = {}
+
+      self.__entityCache[sgEntityType] = typeCache
+
+    # Return immediately if the Entity does not exist.
+    if eId <= -1:
+      return (factory.createEntity(sgEntityType, sgData), True)
+
+    onCreate = False
+
+    # Check the cache and if its found update any non-valid fields that
+    # have data contained in the passed sgData.  If not found create the
+    # Entity and add it to the cache.
+    cacheData = typeCache.get(eId, None)
+
+    if cacheData != None:
+      result = cacheData['entity']
 
-        self.__entityCache[sgEntityType][eId] = {
-          'entity': weakref.ref(result),
-          'cache': {},
-          'cache_state': -1
+      if result != None:
+        result = result()
+
+      if result == None:
+        tmpData = {
+          'id': eId,
+          'type': sgEntityType
         }
 
+        tmpData.update(cacheData['cache'])
+
+        result = factory.createEntity(sgEntityType, tmpData)
+
+        result._SgEntity__caching = cacheData['cache_state']
+
+        cacheData['entity'] = weakref.ref(result)
+
         onCreate = True
 
-      if sgSyncFields != None:
-        result.sync(
-          sgSyncFields,
-          ignoreValid=True,
-          ignoreWithUpdate=True,
-          backgroundPull=True
-        )
+      with result:
+        del sgData['id']
+        del sgData['type']
 
-      if onCreate:
-        ShotgunORM.onEntityCreate(result)
+        for field, value in sgData.items():
+          fieldObj = result.field(field)
 
-      return result
+          if (
+            fieldObj == None or
+            fieldObj.isValid() or
+            fieldObj.hasCommit() or
+            fieldObj.hasSyncUpdate()
+          ):
+            continue
+
+          fieldObj.invalidate()
 
-  def _batch(self, requests, sgDryRun):
+          fieldObj._updateValue = value
+
+          fieldObj.setHasSyncUpdate(True)
+    else:
+      result = factory.createEntity(sgEntityType, sgData)
+
+      typeCache[eId] = {
+        'entity': weakref.ref(result),
+        'cache': {},
+        'cache_state': -1
+      }
+
+      onCreate = True
+
+    return (result, onCreate)
+
+  def _batch(
+    self,
+    requests,
+    sgDryRun,
+    sgChunkSize=0,
+    sgChunkBytes=0,
+    sgMaxWorkers=1,
+    sgFailed=None
+  ):
     def undoEntities(batchConfigs, exception):
       if len(batchConfigs) <= 0:
         return
@@ -729,14 +1162,64 @@ class SgConnection(SgConnectionPriv):
         except:
           pass
 
-    if len(requests) <= 0:
-      return []
+    def undoValues(batchConfigs):
+      result = {}
 
-    batchConfigs = []
-    batchData = []
-    batchSize = []
+      for data in batchConfigs:
+        entity = data['entity']
 
-    for i in requests:
+        for request in data['batch_data']:
+          if request['request_type'] != 'update':
+            continue
+
+          values = {}
+
+          for name in request['data']:
+            field = entity.field(name)
+
+            if field.hasUndoValue():
+              values[name] = field.undoValue()
+
+          result[(request['entity_type'], request['entity_id'])] = values
+
+      return result
+
+    def dryRunResult(batchData):
+      sgResult = []
+
+      for batchJob in batchData:
+        jobType = batchJob['request_type']
+
+        if jobType == 'update':
+          data = {
+            'type': batchJob['entity_type'],
+            'id': batchJob['entity_id'],
+          }
+
+          data.update(batchJob['data'])
+
+          sgResult.append(data)
+        elif jobType == 'create':
+          data = {
+            'type': batchJob['entity_type'],
+          }
+
+          data.update(batchJob['data'])
+
+          data['id'] = -1
+
+          sgResult.append(data)
+        elif jobType in ['delete', 'revive']:
+          sgResult.append(True)
+
+      return sgResult
+
+    if len(requests) <= 0:
+      return []
+
+    batchConfigs = []
+
+    for i in requests:
       entity = i['entity']
 
       entityBatchData = i['batch_data']
@@ -751,6 +1234,13 @@ class SgConnection(SgConnectionPriv):
         except:
           pass
 
+        # Callers that pass a list of failures commit the remaining Entities
+        # without the one that failed.
+        if sgFailed != None:
+          sgFailed.append((entity, e))
+
+          continue
+
         undoEntities(batchConfigs, e)
 
         raise e
@@ -763,83 +1253,147 @@ class SgConnection(SgConnectionPriv):
         }
       )
 
-      batchData.extend(entityBatchData)
-      batchSize.append(len(entityBatchData))
+    chunks = self._batchChunks(batchConfigs, sgChunkSize, sgChunkBytes)
 
     undo_stack = self.undo()
 
-    undo_action = None
+    undo_enabled = sgDryRun != True and undo_stack.isEnabled()
 
     try:
       if sgDryRun == True:
-        sgResult = []
+        chunkResults = []
 
-        for batchJob in batchData:
-          jobType = batchJob['request_type']
+        for chunk in chunks:
+          chunkResults.append((dryRunResult(chunk['batch_data']), None))
+      else:
+        chunkResults = self._sg_batch_chunks(
+          [chunk['batch_data'] for chunk in chunks],
+          sgMaxWorkers
+        )
+    except Exception, e:
+      undoEntities(batchConfigs, e)
 
-          if jobType == 'update':
-            data = {
-              'type': batchJob['entity_type'],
-              'id': batchJob['entity_id'],
-            }
+      raise e
 
-            data.update(batchJob['data'])
+    # A single chunk is a single transaction, preserve raising before any
+    # Entity is updated.
+    if len(chunks) == 1 and chunkResults[0][1] != None:
+      undoEntities(batchConfigs, chunkResults[0][1])
 
-            sgResult.append(data)
-          elif jobType == 'create':
-            data = {
-              'type': batchJob['entity_type'],
-            }
+      raise chunkResults[0][1]
 
-            data.update(batchJob['data'])
+    result = []
 
-            data['id'] = -1
+    exception = None
 
-            sgResult.append(data)
-          elif jobType in ['delete', 'revive']:
-            sgResult.append(True)
-      else:
-        sgResult = self._sg_batch(batchData)
+    for chunk, chunkResult in zip(chunks, chunkResults):
+      sgResult, chunkException = chunkResult
 
-        undo_action = ShotgunORM.SgUndoAction(batchData, sgResult)
+      if chunkException != None:
+        undoEntities(chunk['configs'], chunkException)
 
-      result = copy.deepcopy(sgResult)
-    except Exception, e:
-      undoEntities(batchConfigs, e)
+        if exception == None:
+          exception = chunkException
 
-      raise e
+        continue
 
-    exception = None
+      # The result is shared by the caller and each Entities slice of it so it
+      # is never copied or modified.
+      sgResult = tuple(sgResult)
+
+      # Undo values must be gathered before afterCommit() clears them.
+      if undo_enabled:
+        undo_stack.push(
+          ShotgunORM.SgUndoAction.fromBatch(
+            chunk['batch_data'],
+            sgResult,
+            undoValues(chunk['configs'])
+          )
+        )
 
-    for configData in batchConfigs:
-      entity = configData['entity']
-      entityBatchData = configData['batch_data']
-      entityCommitData = configData['commit_data']
+      result.extend(sgResult)
 
-      resultSize = batchSize.pop(0)
+      offset = 0
 
-      entityResult = []
+      for configData in chunk['configs']:
+        entity = configData['entity']
+        entityBatchData = configData['batch_data']
+        entityCommitData = configData['commit_data']
 
-      for n in xrange(0, resultSize):
-        entityResult.append(sgResult.pop(0))
+        resultSize = len(entityBatchData)
 
-      try:
-        entity.afterCommit(
-          entityBatchData,
-          entityResult,
-          entityCommitData,
-          sgDryRun,
-          None
-        )
-      except Exception, e:
-        if exception == None:
-          exception = e
+        entityResult = sgResult[offset:offset + resultSize]
+
+        offset += resultSize
+
+        try:
+          entity.afterCommit(
+            entityBatchData,
+            entityResult,
+            entityCommitData,
+            sgDryRun,
+            None
+          )
+        except Exception, e:
+          if exception == None:
+            exception = e
 
     if exception != None:
       raise exception
 
     return result
 
+  def _batchChunks(self, batchConfigs, sgChunkSize=0, sgChunkBytes=0):
+    '''
+    Internal function!
+
+    Splits the batch configs into chunks of at most sgChunkSize requests and
+    sgChunkBytes of estimated JSON payload.  An Entities requests are never
+    split across chunks, an Entity that exceeds the limits on its own gets a
+    chunk to itself.
+
+    Returns a list of dicts with the keys "configs" and "batch_data".
+    '''
+
+    result = []
+
+    configs = []
+    batchData = []
+    chunkBytes = 0
+
+    for config in batchConfigs:
+      entityBatchData = config['batch_data']
+
+      entityBytes = 0
+
+      if sgChunkBytes > 0:
+        for request in entityBatchData:
+          entityBytes += len(ShotgunORM.toJson(request))
+
+      if len(configs) > 0 and (
+        (
+          sgChunkSize > 0 and
+          len(batchData) + len(entityBatchData) > sgChunkSize
+        ) or (
+          sgChunkBytes > 0 and
+          chunkBytes + entityBytes > sgChunkBytes
+        )
+      ):
+        result.append({'configs': configs, 'batch_data': batchData})
+
+        configs = []
+        batchData = []
+        chunkBytes = 0
+
+      configs.append(config)
+      batchData.extend(entityBatchData)
+      chunkBytes += entityBytes
+
+    if len(configs) > 0:
+      result.append({'configs': configs, 'batch_data': batchData})
+
+    return result
+
   def addAsyncSearch(self, sgAsyncSearch):
     '''
     Add the SgAsyncSearch to the front of the async search queue.
@@ -876,15 +1430,70 @@ class SgConnection(SgConnectionPriv):
 
     return {}
 
-  def batch(self, requests, sgDryRun=False):
+  def batch(
+    self,
+    requests,
+    sgDryRun=False,
+    sgChunkSize=None,
+    sgChunkBytes=None,
+    sgAllOrNothing=False,
+    sgMaxWorkers=None
+  ):
     '''
     Make a batch request of several create, update, and/or delete calls at one
     time. This is for performance when making large numbers of requests, as it
-    cuts down on the overhead of roundtrips to the server and back. All requests
-    are performed within a transaction, and if any request fails, all of them
+    cuts down on the overhead of roundtrips to the server and back.
+
+    Large batches can be split into chunks by request count and/or payload
+    size, each chunk is sent as its own transaction and independent chunks are
+    submitted concurrently.  When a chunk fails the Entities in it are rolled
+    back while Entities in successful chunks keep their committed state, the
+    first exception is raised after all chunks have been processed.
+
+    When sgAllOrNothing is True chunking is disabled and all requests are
+    performed within a single transaction, if any request fails all of them
     will be rolled back.
+
+    Note:
+      The returned result dicts are shared with the committed Entities and
+      their afterEntityCommit callbacks and must not be modified.
+
+    Args:
+      * (list) requests:
+        Entities to commit.
+
+      * (bool) sgDryRun:
+        Perform a dry run without sending anything to Shotgun.
+
+      * (int) sgChunkSize:
+        Max requests per chunk, 0 disables.  Defaults to
+        config.BATCH_CHUNK_SIZE.
+
+      * (int) sgChunkBytes:
+        Max estimated payload bytes per chunk, 0 disables.  Defaults to
+        config.BATCH_CHUNK_BYTES.
+
+      * (bool) sgAllOrNothing:
+        Send all requests in a single transaction.
+
+      * (int) sgMaxWorkers:
+        Max chunks submitted concurrently.  Defaults to
+        config.BATCH_MAX_WORKERS.
     '''
 
+    if sgAllOrNothing:
+      sgChunkSize = 0
+      sgChunkBytes = 0
+    else:
+      if sgChunkSize == None:
+        sgChunkSize = ShotgunORM.config.BATCH_CHUNK_SIZE
+
+      if sgChunkBytes == None:
+        sgChunkBytes = ShotgunORM.config.BATCH_CHUNK_BYTES
+
+    if sgMaxWorkers == None:
+      sgMaxWorkers = ShotgunORM.config.BATCH_MAX_WORKERS
+
     if isinstance(requests, ShotgunORM.SgEntity):
       requests = set([requests])
 
@@ -918,13 +1527,181 @@ class SgConnection(SgConnectionPriv):
           }
         )
 
-      result = self._batch(batchRequests, sgDryRun)
+      result = self._batch(
+        batchRequests,
+        sgDryRun,
+        sgChunkSize,
+        sgChunkBytes,
+        sgMaxWorkers
+      )
 
       return result
     finally:
       for entity in requests:
         entity._unlock()
 
+  def bulkCreate(
+    self,
+    sgEntityType,
+    sgRows,
+    sgChunkSize=None,
+    sgReturnHandles=False,
+    sgDryRun=False,
+    sgMaxWorkers=None
+  ):
+    '''
+    Creates a new Entity in the Shotgun database for each row of field data.
+
+    Unlike create() no SgEntity objects are built, rows are consumed from the
+    iterable one chunk at a time, passed through the beforeEntityCreate
+    callbacks, validated against the schema and submitted as chunked batch
+    calls.  This keeps memory flat when importing large numbers of records.
+
+    Returns the number of Entities created or when sgReturnHandles is True a
+    list of {'type': sgEntityType, 'id': id} dicts in the same order as the
+    rows.  Live Entities can be retrieved later with find().
+
+    When a chunk fails the chunks submitted alongside it are still completed
+    and a SgBulkCreateError is raised without consuming the remaining rows, its
+    created attribute holds the handles of every Entity that was created.
+
+    Args:
+      * (str) sgEntityType:
+        Type of Entity to create.
+
+      * (iter) sgRows:
+        Iterable of Shotgun formated dictionaries of field data.
+
+      * (int) sgChunkSize:
+        Max rows per batch call.  Defaults to config.BULK_CREATE_CHUNK_SIZE.
+
+      * (bool) sgReturnHandles:
+        Return id handles for the created Entities.
+
+      * (bool) sgDryRun:
+        Validate the rows without sending anything to Shotgun, returned
+        handles will have an id of None.
+
+      * (int) sgMaxWorkers:
+        Max chunks submitted concurrently.  Defaults to
+        config.BATCH_MAX_WORKERS.
+    '''
+
+    ShotgunORM.LoggerConnection.debug(
+      '%(connection)s.bulkCreate(...)', {'connection': self}
+    )
+
+    ShotgunORM.LoggerConnection.debug(
+      '    * sgEntityType: %(entityName)s', {'entityName': sgEntityType}
+    )
+
+    if sgChunkSize == None:
+      sgChunkSize = ShotgunORM.config.BULK_CREATE_CHUNK_SIZE
+
+    if sgMaxWorkers == None:
+      sgMaxWorkers = ShotgunORM.config.BATCH_MAX_WORKERS
+
+    sgChunkSize = max(1, sgChunkSize)
+    sgMaxWorkers = max(1, sgMaxWorkers)
+
+    schema = self.schema()
+
+    sgEntityType = schema.entityApiName(sgEntityType)
+
+    entityInfo = schema.entityInfo(sgEntityType)
+
+    if entityInfo == None:
+      raise RuntimeError('unknown Entity type "%s"' % sgEntityType)
+
+    commitFields = set()
+
+    for name, fieldInfo in entityInfo.fieldInfos().items():
+      if fieldInfo.isCommitable() and fieldInfo.isEditable():
+        commitFields.add(name)
+
+    flattenFilters = ShotgunORM.SgSearchFilterBasic.flattenFilters
+    beforeEntityCreate = ShotgunORM.beforeEntityCreate
+
+    # Ids of the created Entities are always kept so a failure can report
+    # what exists in Shotgun.
+    createdIds = []
+
+    def handles():
+      return [{'type': sgEntityType, 'id': i} for i in createdIds]
+
+    def submit(chunks):
+      if sgDryRun:
+        for chunk in chunks:
+          createdIds.extend([None] * len(chunk))
+
+        return
+
+      error = None
+
+      for sgResult, exception in self._sg_batch_chunks(chunks, sgMaxWorkers):
+        if exception != None:
+          if error == None:
+            error = exception
+
+          continue
+
+        createdIds.extend([i['id'] for i in sgResult])
+
+      if error != None:
+        raise SgBulkCreateError(error, handles())
+
+    chunks = []
+    chunk = []
+
+    for row in sgRows:
+      sgData = flattenFilters(row)
+
+      sgData.pop('type', None)
+
+      sgData = beforeEntityCreate(self, sgEntityType, sgData)
+
+      for name in sgData:
+        if not name in commitFields:
+          raise ValueError(
+            '"%s" is not an editable field of Entity type "%s"' % (
+              name,
+              sgEntityType
+            )
+          )
+
+      chunk.append(
+        {
+          'request_type': 'create',
+          'entity_type': sgEntityType,
+          'data': sgData
+        }
+      )
+
+      if len(chunk) >= sgChunkSize:
+        chunks.append(chunk)
+
+        chunk = []
+
+        if len(chunks) >= sgMaxWorkers:
+          submit(chunks)
+
+          chunks = []
+
+    if len(chunk) > 0:
+      chunks.append(chunk)
+
+    if len(chunks) > 0:
+      submit(chunks)
+
+    ShotgunORM.LoggerConnection.debug(
+      '    * created: %(created)d', {'created': len(createdIds)}
+    )
+
+    if sgReturnHandles:
+      return handles()
+
+    return len(createdIds)
+
   def cacheEntity(self, sgEntity):
     '''
     Caches the passed Entities field values.
@@ -1067,6 +1844,100 @@ class SgConnection(SgConnectionPriv):
         except KeyError:
           pass
 
+  def commitQueue(self):
+    '''
+    Returns the SgCommitQueue used for write-behind commits or None when
+    write-behind is disabled.
+    '''
+
+    return self.__commitQueue
+
+  def count(
+    self,
+    sgEntityType,
+    filters=[],
+    filter_operator=None,
+    include_archived_projects=True
+  ):
+    '''
+    Returns the number of Entities that match the filters.
+
+    The count is computed by Shotgun with a single summarize request, no rows
+    are returned and no Entity objects are built.
+
+    Args:
+      * (str) sgEntityType:
+        Entity type to count.
+
+      * (list) filters:
+        List of Shotgun formatted filters.
+
+      * (str) filter_operator:
+        Controls how the filters are matched, "all" or "any".
+
+      * (bool) include_archived_projects:
+        Count Entities of archived projects.
+    '''
+
+    entity_type = self.schema().entityApiName(sgEntityType)
+    filters = ShotgunORM.SgSearchFilterBasic.flattenFilters(filters)
+
+    result = self._sg_summarize(
+      entity_type,
+      filters,
+      [
+        {
+          'field': 'id',
+          'type': 'record_count'
+        }
+      ],
+      filter_operator,
+      None,
+      include_archived_projects
+    )
+
+    return int(result['summaries']['id'] or 0)
+
+  def countSearch(
+    self,
+    sgEntityType,
+    sgSearchExp,
+    sgSearchArgs=[],
+    include_archived_projects=True
+  ):
+    '''
+    Same as count(...) but uses a search expression instead of a filter list.
+
+    Args:
+      * (str) sgEntityType:
+        Entity type to count.
+
+      * (str) sgSearchExp:
+        Search expression string.
+
+      * (list) sgSearchArgs:
+        Args used by the search expression string during evaluation.
+
+      * (bool) include_archived_projects:
+        Count Entities of archived projects.
+    '''
+
+    schema = self.schema()
+
+    entity_type = schema.entityApiName(sgEntityType)
+
+    filters = ShotgunORM.parseToLogicalOp(
+      schema.entityInfo(entity_type),
+      sgSearchExp,
+      sgSearchArgs
+    )
+
+    return self.count(
+      entity_type,
+      filters,
+      include_archived_projects=include_archived_projects
+    )
+
   def currentUser(self, sgFields=None):
     '''
     Searches Shotgun for a HumanUser with a login of the current system user
@@ -1242,32 +2113,170 @@ class SgConnection(SgConnectionPriv):
     elif result == set(['none']):
       result = set([])
 
-    return result
+    return result
+
+  def disableCaching(self):
+    '''
+    Disables the caching of Entities.
+    '''
+
+    with self:
+      if not self.isCaching():
+        return False
+
+      self.__entityCaching = False
+
+      # No need to break links for currently alive Entity objects so just clear
+      # the field value cache.
+      self.clearCache(fieldValuesOnly=True)
+
+      return True
+
+  def disableWriteBehind(self):
+    '''
+    Disables write-behind commits.
+
+    Any Entities still waiting in the commit queue are committed before this
+    returns.
+    '''
+
+    with self:
+      commitQueue = self.__commitQueue
+
+      if commitQueue == None:
+        return False
+
+      self.__commitQueue = None
+
+    commitQueue.shutdown()
+
+    return True
+
+  def enableCaching(self):
+    '''
+    Enables the caching of Entities.
+    '''
+
+    with self:
+      self.__entityCaching = True
+
+  def enableWriteBehind(self, maxSize=None, maxDelay=None):
+    '''
+    Enables write-behind commits.
+
+    While enabled SgEntity.commit() queues the Entity and returns immediately,
+    queued Entities are committed in batches once maxSize Entities are queued,
+    the oldest has waited maxDelay seconds or flush() is called.
+
+    Args:
+      * (int) maxSize:
+        Number of queued Entities that triggers a flush, 0 disables.  Defaults
+        to config.WRITE_BEHIND_MAX_SIZE.
+
+      * (float) maxDelay:
+        Max seconds an Entity waits in the queue, 0 disables.  Defaults to
+        config.WRITE_BEHIND_MAX_DELAY.
+    '''
+
+    with self:
+      if self.__commitQueue != None:
+        return False
+
+      self.__commitQueue = ShotgunORM.SgCommitQueue(self, maxSize, maxDelay)
+
+      return True
+
+  def exists(
+    self,
+    sgEntityType,
+    filters=[],
+    filter_operator=None,
+    retired_only=False,
+    include_archived_projects=True
+  ):
+    '''
+    Returns True if at least one Entity matches the filters.
+
+    Only the id of a single row is requested and no Entity objects are built.
+
+    Args:
+      * (str) sgEntityType:
+        Entity type to find.
+
+      * (list) filters:
+        List of Shotgun formatted filters.
+
+      * (str) filter_operator:
+        Controls how the filters are matched, "all" or "any".
+
+      * (bool) retired_only:
+        Only check retired Entities.
+
+      * (bool) include_archived_projects:
+        Check Entities of archived projects.
+    '''
+
+    entity_type = self.schema().entityApiName(sgEntityType)
+    filters = ShotgunORM.SgSearchFilterBasic.flattenFilters(filters)
+
+    result = self._sg_find(
+      entity_type,
+      filters,
+      [],
+      None,
+      filter_operator,
+      1,
+      retired_only,
+      0,
+      include_archived_projects
+    )
+
+    return len(result) >= 1
+
+  def existsSearch(
+    self,
+    sgEntityType,
+    sgSearchExp,
+    sgSearchArgs=[],
+    retired_only=False,
+    include_archived_projects=True
+  ):
+    '''
+    Same as exists(...) but uses a search expression instead of a filter list.
+
+    Args:
+      * (str) sgEntityType:
+        Entity type to find.
+
+      * (str) sgSearchExp:
+        Search expression string.
+
+      * (list) sgSearchArgs:
+        Args used by the search expression string during evaluation.
+
+      * (bool) retired_only:
+        Only check retired Entities.
 
-  def disableCaching(self):
-    '''
-    Disables the caching of Entities.
+      * (bool) include_archived_projects:
+        Check Entities of archived projects.
     '''
 
-    with self:
-      if not self.isCaching():
-        return False
-
-      self.__entityCaching = False
-
-      # No need to break links for currently alive Entity objects so just clear
-      # the field value cache.
-      self.clearCache(fieldValuesOnly=True)
+    schema = self.schema()
 
-      return True
+    entity_type = schema.entityApiName(sgEntityType)
 
-  def enableCaching(self):
-    '''
-    Enables the caching of Entities.
-    '''
+    filters = ShotgunORM.parseToLogicalOp(
+      schema.entityInfo(entity_type),
+      sgSearchExp,
+      sgSearchArgs
+    )
 
-    with self:
-      self.__entityCaching = True
+    return self.exists(
+      entity_type,
+      filters,
+      retired_only=retired_only,
+      include_archived_projects=include_archived_projects
+    )
 
   def fieldQueryTemplate(self):
     '''
@@ -1295,7 +2304,8 @@ class SgConnection(SgConnectionPriv):
     page=0,
     include_archived_projects=True,
     additional_filter_presets=None,
-    sgQueryFieldTemplate=None
+    sgQueryFieldTemplate=None,
+    readOnly=False
   ):
     '''
     Find entities.
@@ -1327,6 +2337,9 @@ class SgConnection(SgConnectionPriv):
       * (int) page:
         Return a single specified page number of records instead of the entire
         result set
+
+      * (bool) readOnly:
+        Return read-only SgEntityView objects instead of Entities.
     '''
 
     schema = self.schema()
@@ -1355,25 +2368,26 @@ class SgConnection(SgConnectionPriv):
           sgQueryFieldTemplate
         )
 
-    ShotgunORM.LoggerConnection.debug(
-      '%(sgConnection)s.find(...)', {'sgConnection': self}
-    )
+    if ShotgunORM.LoggerConnection.isDebugging():
+      ShotgunORM.LoggerConnection.debug(
+        '%(sgConnection)s.find(...)', {'sgConnection': self}
+      )
 
-    ShotgunORM.LoggerConnection.debug(
-      '    * entity_type: %(entityType)s', {'entityType': entity_type}
-    )
+      ShotgunORM.LoggerConnection.debug(
+        '    * entity_type: %(entityType)s', {'entityType': entity_type}
+      )
 
-    ShotgunORM.LoggerConnection.debug(
-      '    * filters: %(sgFilters)s', {'sgFilters': filters}
-    )
+      ShotgunORM.LoggerConnection.debug(
+        '    * filters: %(sgFilters)s', {'sgFilters': filters}
+      )
 
-    ShotgunORM.LoggerConnection.debug(
-      '    * fields: %(sgFields)s', {'sgFields': fields}
-    )
+      ShotgunORM.LoggerConnection.debug(
+        '    * fields: %(sgFields)s', {'sgFields': fields}
+      )
 
-    ShotgunORM.LoggerConnection.debug(
-      '    * queryFieldTemplate: %(sgQueryFieldTemplate)s', {'sgQueryFieldTemplate': sgQueryFieldTemplate}
-    )
+      ShotgunORM.LoggerConnection.debug(
+        '    * queryFieldTemplate: %(sgQueryFieldTemplate)s', {'sgQueryFieldTemplate': sgQueryFieldTemplate}
+      )
 
     searchResult = self._sg_find(
       entity_type=entity_type,
@@ -1388,13 +2402,15 @@ class SgConnection(SgConnectionPriv):
       additional_filter_presets=additional_filter_presets
     )
 
-    if searchResult != None:
-      newResult = []
-
-      for i in searchResult:
-        newResult.append(self._createEntity(entity_type, i))
+    if searchResult != None and readOnly:
+      entityInfo = schema.entityInfo(entity_type)
 
-      searchResult = newResult
+      searchResult = [
+        ShotgunORM.SgEntityView(self, entityInfo, x) for x in
+        ShotgunORM.decodeRawResults(entityInfo, list(fields), searchResult)
+      ]
+    elif searchResult != None:
+      searchResult = self._createEntities(entity_type, searchResult)
 
     return searchResult
 
@@ -1432,6 +2448,69 @@ class SgConnection(SgConnectionPriv):
       sgQueryFieldTemplate
     )
 
+  def findEventLogEntries(
+    self,
+    filters,
+    fields=None,
+    order=None,
+    filter_operator=None,
+    limit=0,
+    page=0
+  ):
+    '''
+    Find EventLogEntrys.
+
+    Returns a list of read-only SgEventLogEntry objects instead of SgEntity
+    objects.  See SgEventLogEntry for more information.
+
+    Args:
+      * (list) filters:
+        List of Shotgun formatted filters.
+
+      * (list) fields:
+        Fields that return results will have filled in with data from Shotgun.
+        When None the default query fields for EventLogEntry plus the fields
+        in SgEventLogEntry.ENTITY_FIELDS are used.
+
+      * (list) order:
+        List of Shotgun formatted order filters.
+
+      * (str) filter_operator:
+        Controls how the filters are matched.
+
+      * (int) limit:
+        Limits the amount of events that can be returned.
+
+      * (int) page:
+        Return a single specified page number of records instead of the entire
+        result set
+    '''
+
+    filters = ShotgunORM.SgSearchFilterBasic.flattenFilters(filters)
+
+    if fields == None:
+      fields = set(self.defaultEntityQueryFields('EventLogEntry'))
+      fields.update(ShotgunORM.SgEventLogEntry.ENTITY_FIELDS)
+    elif isinstance(fields, str):
+      fields = [fields]
+
+    searchResult = self._sg_find(
+      entity_type='EventLogEntry',
+      filters=filters,
+      fields=list(fields),
+      order=order,
+      filter_operator=filter_operator,
+      limit=limit,
+      page=page
+    )
+
+    if searchResult == None:
+      return []
+
+    eventClass = ShotgunORM.SgEventLogEntry
+
+    return [eventClass(self, i) for i in searchResult]
+
   def findIterator(
     self,
     entity_type,
@@ -1588,6 +2667,115 @@ class SgConnection(SgConnectionPriv):
 
     return self.findOneAsync(**sgSearchParameters.parameters())
 
+  def findRaw(
+    self,
+    entity_type,
+    filters,
+    fields=None,
+    order=None,
+    filter_operator=None,
+    limit=0,
+    retired_only=False,
+    page=0,
+    include_archived_projects=True,
+    additional_filter_presets=None,
+    sgQueryFieldTemplate=None,
+    sgColumnar=False,
+    sgNumpy=None
+  ):
+    '''
+    Find entities without creating Entity objects.
+
+    Field values are decoded the same way Entity fields decode them and the
+    results are returned as a list of dicts or, when sgColumnar is True, as a
+    SgColumnarResult.
+
+    Useful for reporting and exporting data where the overhead of building
+    Entity objects is not needed.
+
+    See find() for a more detailed description of the search args.
+
+    Args:
+      * (bool) sgColumnar:
+        Return a SgColumnarResult instead of a list of dicts.
+
+      * (bool) sgNumpy:
+        Store the int and float columns of a columnar result as numpy arrays,
+        by default numpy is used when installed.
+    '''
+
+    schema = self.schema()
+
+    entity_type = schema.entityApiName(entity_type)
+    filters = ShotgunORM.SgSearchFilterBasic.flattenFilters(filters)
+
+    entityInfo = schema.entityInfo(entity_type)
+
+    if fields == None:
+      fields = self.defaultEntityQueryFields(
+        entity_type,
+        sgQueryFieldTemplate
+      )
+    else:
+      if isinstance(fields, str):
+        fields = [fields]
+
+      fields = set(fields)
+
+      if 'all' in fields:
+        fields = entityInfo.fieldNames()
+      elif 'default' in fields:
+        fields.discard('default')
+
+        fields.update(
+          self.defaultEntityQueryFields(entity_type, sgQueryFieldTemplate)
+        )
+
+    fields = list(fields)
+
+    if ShotgunORM.LoggerConnection.isDebugging():
+      ShotgunORM.LoggerConnection.debug(
+        '%(sgConnection)s.findRaw(...)', {'sgConnection': self}
+      )
+
+      ShotgunORM.LoggerConnection.debug(
+        '    * entity_type: %(entityType)s', {'entityType': entity_type}
+      )
+
+      ShotgunORM.LoggerConnection.debug(
+        '    * filters: %(sgFilters)s', {'sgFilters': filters}
+      )
+
+      ShotgunORM.LoggerConnection.debug(
+        '    * fields: %(sgFields)s', {'sgFields': fields}
+      )
+
+    searchResult = self._sg_find(
+      entity_type=entity_type,
+      filters=filters,
+      fields=fields,
+      order=order,
+      filter_operator=filter_operator,
+      limit=limit,
+      retired_only=retired_only,
+      page=page,
+      include_archived_projects=include_archived_projects,
+      additional_filter_presets=additional_filter_presets
+    )
+
+    if searchResult == None:
+      searchResult = []
+
+    if sgColumnar:
+      return ShotgunORM.SgColumnarResult(
+        entityInfo,
+        fields,
+        searchResult,
+        sgNumpy
+      )
+
+    return ShotgunORM.decodeRawResults(entityInfo, fields, searchResult)
+
   def findSearchParameters(self, sgSearchParameters):
     '''
 
@@ -1616,6 +2804,19 @@ class SgConnection(SgConnectionPriv):
 
     return self.findAsync(**sgSearchParameters.parameters())
 
+  def flush(self):
+    '''
+    Commits all Entities waiting in the write-behind queue and returns the
+    batch result.
+    '''
+
+    commitQueue = self.__commitQueue
+
+    if commitQueue == None:
+      return []
+
+    return commitQueue.flush()
+
   def info(self):
     '''
     Returns the Shotgun server api info.
@@ -1688,6 +2889,13 @@ class SgConnection(SgConnectionPriv):
 
     return self.schema().isInitialized()
 
+  def isWriteBehind(self):
+    '''
+    Returns True if write-behind commits are enabled.
+    '''
+
+    return self.__commitQueue != None
+
   def project(self, sgProject, sgFields=None):
     '''
     Returns the project Entity named "sgProject".
@@ -1806,7 +3014,8 @@ class SgConnection(SgConnectionPriv):
 
           undo = self.undo()
 
-          undo.push(ShotgunORM.SgUndoAction(batchData, [sgResult]))
+          if undo.isEnabled():
+            undo.push(ShotgunORM.SgUndoAction.fromBatch(batchData, [sgResult]))
       except Exception, e:
         try:
           sgEntity.afterCommit(batchData, None, commitData, sgDryRun, e)
@@ -1853,7 +3062,8 @@ class SgConnection(SgConnectionPriv):
     page=0,
     include_archived_projects=True,
     additional_filter_presets=None,
-    sgQueryFieldTemplate=None
+    sgQueryFieldTemplate=None,
+    readOnly=False
   ):
     '''
     Uses a search string to find entities in Shotgun instead of a list.
@@ -1885,6 +3095,9 @@ class SgConnection(SgConnectionPriv):
       * (int) page:
         Return a single specified page number of records instead of the entire
         result set.
+
+      * (bool) readOnly:
+        Return read-only SgEntityView objects instead of Entities.
     '''
 
     schema = self.schema()
@@ -1940,7 +3153,8 @@ class SgConnection(SgConnectionPriv):
       page=page,
       include_archived_projects=include_archived_projects,
       additional_filter_presets=additional_filter_presets,
-      sgQueryFieldTemplate=sgQueryFieldTemplate
+      sgQueryFieldTemplate=sgQueryFieldTemplate,
+      readOnly=readOnly
     )
 
   def searchAsync(
@@ -2145,6 +3359,53 @@ class SgConnection(SgConnectionPriv):
       isSingle=True
     )
 
+  def searchRaw(
+    self,
+    sgEntityType,
+    sgSearchExp,
+    sgFields=None,
+    sgSearchArgs=[],
+    order=None,
+    limit=0,
+    retired_only=False,
+    page=0,
+    include_archived_projects=True,
+    additional_filter_presets=None,
+    sgQueryFieldTemplate=None,
+    sgColumnar=False,
+    sgNumpy=None
+  ):
+    '''
+    Uses a search string to find entities without creating Entity objects.
+
+    See findRaw() and search() for a more detailed description.
+    '''
+
+    schema = self.schema()
+
+    entity_type = schema.entityApiName(sgEntityType)
+
+    filters = ShotgunORM.parseToLogicalOp(
+      schema.entityInfo(entity_type),
+      sgSearchExp,
+      sgSearchArgs
+    )
+
+    return self.findRaw(
+      entity_type,
+      filters,
+      sgFields,
+      order=order,
+      limit=limit,
+      retired_only=retired_only,
+      page=page,
+      include_archived_projects=include_archived_projects,
+      additional_filter_presets=additional_filter_presets,
+      sgQueryFieldTemplate=sgQueryFieldTemplate,
+      sgColumnar=sgColumnar,
+      sgNumpy=sgNumpy
+    )
+
   def setFieldQueryTemplate(self, sgQueryTemplate):
     '''
     Sets the connections default field query template.
@@ -2251,76 +3512,68 @@ class SgConnection(SgConnectionPriv):
       'terms': text
     }
 
-    projects = {}
-    sync_fields = {
-      'Project': None
-    }
+    sync_fields = None
 
     if backgroundSync == True:
-      sync_fields['Project'] = self.defaultEntityQueryFields('Project')
-
-    q_eng = self.queryEngine()
-
-    schema = self.schema()
-
-    q_eng.block()
-
-    try:
-      for match in search['matches']:
-        data = {
-          'image': match['image'],
-          'name': match['name'],
-          'project': None,
-          'status': match['status']
-        }
-
-        e_type = match['type']
-        e_id = match['id']
+      sync_fields = {
+        'Project': self.defaultEntityQueryFields('Project')
+      }
 
-        proj_id = match['project_id']
+    proj_ids = []
+    e_rows = []
 
-        if proj_id != None:
-          proj = projects.get(proj_id, None)
+    for match in search['matches']:
+      e_type = match['type']
 
-          if proj == None:
-            proj = self._createEntity(
-              'Project',
-              {'id': proj_id, 'type': 'Project'},
-              sync_fields['Project']
-            )
+      e_field_data = {
+        'id': match['id'],
+        'type': e_type
+      }
 
-          projects[proj_id] = proj
+      if schema.entityInfo(e_type).hasField('image'):
+        e_field_data['image'] = match['image']
 
-          data['project'] = proj
+      e_rows.append(e_field_data)
 
-        e_sync_fields = None
+      proj_id = match['project_id']
 
-        if backgroundSync == True:
-          if e_type not in sync_fields:
-            e_sync_fields = self.defaultEntityQueryFields(e_type)
+      if proj_id != None and proj_id not in proj_ids:
+        proj_ids.append(proj_id)
 
-            sync_fields[e_type] = e_sync_fields
-          else:
-            e_sync_fields = sync_fields[e_type]
+      if backgroundSync == True and e_type not in sync_fields:
+        sync_fields[e_type] = self.defaultEntityQueryFields(e_type)
 
-        e_field_data = {
-          'id': e_id,
-          'type': e_type
-        }
+    q_eng = self.queryEngine()
 
-        if schema.entityInfo(e_type).hasField('image'):
-          e_field_data['image'] = data['image']
+    q_eng.block()
 
-        data['entity'] = self._createEntity(
-          e_type,
-          e_field_data,
-          e_sync_fields
+    try:
+      projects = dict(
+        zip(
+          proj_ids,
+          self._createEntities(
+            'Project',
+            [{'id': x, 'type': 'Project'} for x in proj_ids],
+            sync_fields
+          )
         )
+      )
 
-        matches.append(data)
+      entities = self._createEntities(None, e_rows, sync_fields)
     finally:
       q_eng.unblock()
 
+    for match, entity in zip(search['matches'], entities):
+      matches.append(
+        {
+          'entity': entity,
+          'image': match['image'],
+          'name': match['name'],
+          'project': projects.get(match['project_id'], None),
+          'status': match['status']
+        }
+      )
+
     return result
 
   def timeout(self):
@@ -2333,7 +3586,7 @@ class SgConnection(SgConnectionPriv):
 
   def undo(self):
     '''
-
+    Returns the SgUndo object of the connection.
     '''
 
     return self.__undo
@@ -516,20 +516,17 @@ class SgEntity(object):
       **kwargs
     )
 
-  def __getattribute__(self, item):
+  def __getattr__(self, item):
+    # Schema fields are descriptors on the factory built class, this is only
+    # reached for user fields and fields that have no descriptor.
     try:
-      return super(SgEntity, self).__getattribute__(item)
-    except AttributeError, e:
-      try:
-        fieldObj = super(SgEntity, self).__getattribute__('_fields')[item]
-      except KeyError:
-        raise e
-      except:
-        raise
-
-      return fieldObj.value()
-    except:
-      raise
+      fieldObj = self.__dict__['_fields'][item]
+    except KeyError:
+      raise AttributeError(
+        '\'%s\' object has no attribute \'%s\'' % (type(self).__name__, item)
+      )
+
+    return fieldObj.value()
 
   def __getitem__(self, item):
     field = self.field(item)
@@ -567,6 +564,8 @@ class SgEntity(object):
       return self.id == item
     elif isinstance(item, str):
       return self.type == item
+    elif isinstance(item, ShotgunORM.SgEntityView):
+      return item == self
 
   def __ne__(self, item):
     return not self == item
@@ -747,7 +746,8 @@ class SgEntity(object):
         List of Shotgun formatted batch commit data.
 
       * (list) sgBatchResult:
-        The result returned from Shotgun.
+        The result returned from Shotgun, shared with the batch result and must
+        not be modified.
 
       * (dict) sgCommitData:
         Dictionary used to pass user data between beforeCommit() and
@@ -773,7 +773,8 @@ class SgEntity(object):
         List of Shotgun formatted batch commit data.
 
       * (list) sgBatchResult:
-        The result returned from Shotgun.
+        The result returned from Shotgun, shared with the batch result and must
+        not be modified.
 
       * (dict) sgCommitData:
         Dictionary used to pass user data between beforeCommit() and
@@ -827,7 +828,9 @@ class SgEntity(object):
         if commitType == 'create':
           self.field('id')._value = result['id']
     else:
-      for batch, result in map(None, sgBatchData, sgBatchResult):
+      for batch in sgBatchData:
+        commitType = batch['request_type']
+
         if commitType == 'delete':
           pass
         elif commitType == 'revive':
@@ -983,14 +986,6 @@ class SgEntity(object):
 
       newField = fieldClass(None, sgFieldSchemaInfo=fieldInfo, sgEntity=self)
 
-      if hasattr(self.__class__, fieldName):
-        ShotgunORM.LoggerField.warn(
-          'Entity type %(entity)s field name "%(name)s confilicts with class method of same name' % {
-            'entity': self.schemaInfo().name(),
-            'name': fieldName
-          }
-        )
-
       self._fields[fieldName] = newField
 
     self._buildFields()
@@ -1075,6 +1070,10 @@ class SgEntity(object):
 
     Returns True if anything modifcations were published to Shotgun.
 
+    When the connection has write-behind enabled the Entity is added to the
+    connections commit queue and True is returned, see
+    SgConnection.enableWriteBehind().
+
     Args:
       * (dict) sgFields:
         List of fields to commit.  When specified only those fields will be
@@ -1096,6 +1095,13 @@ class SgEntity(object):
 
       connection = self.connection()
 
+      commitQueue = connection.commitQueue()
+
+      if commitQueue != None and not sgDryRun:
+        commitQueue.enqueue(self, sgFields)
+
+        return True
+
       connection._batch(
         [
           {
@@ -1179,7 +1185,8 @@ class SgEntity(object):
 
   def eventLogs(self, sgEventType=None, sgFields=None, sgRecordLimit=0):
     '''
-    Returns the event log Entities for this Entity
+    Returns the event logs for this Entity as read-only SgEventLogEntry
+    objects.
 
     Args:
       * (str) sgEventType:
@@ -1210,8 +1217,7 @@ class SgEntity(object):
         ]
       )
 
-    result = connection.find(
-      'EventLogEntry',
+    result = connection.findEventLogEntries(
       filters,
       sgFields,
       order=order,
@@ -1718,7 +1724,7 @@ class SgEntity(object):
 
   def lastEventLog(self, sgEventType=None, sgFields=None):
     '''
-    Returns the last event log Entity for this field.
+    Returns the last event log for this Entity as a SgEventLogEntry.
 
     Args:
       * (str) sgEventType:
@@ -2108,8 +2114,11 @@ class SgEntity(object):
         List of specific field return types to filter by.
     '''
 
-    ShotgunORM.LoggerEntity.debug('%(entity)s.valuesSg()', {'entity': self})
-    ShotgunORM.LoggerEntity.debug('    * requested: %(sgFields)s', {'sgFields': sgFields})
+    debug = ShotgunORM.LoggerEntity.isDebugging()
+
+    if debug:
+      ShotgunORM.LoggerEntity.debug('%(entity)s.valuesSg()', {'entity': self})
+      ShotgunORM.LoggerEntity.debug('    * requested: %(sgFields)s', {'sgFields': sgFields})
 
     if not self.exists():
       return {}
@@ -2127,11 +2136,14 @@ class SgEntity(object):
 
       pullFields.append(field.name())
 
-    ShotgunORM.LoggerEntity.debug('    * pulling: %(sgFields)s', {'sgFields': pullFields})
+    if debug:
+      ShotgunORM.LoggerEntity.debug('    * pulling: %(sgFields)s', {'sgFields': pullFields})
 
     if len(pullFields) <= 0:
       return {}
 
+    ShotgunORM.SgField.__profiler__.profilePull(self, pullFields)
+
     result = self.connection()._sg_find_one(
       self.type,
       self.toEntitySearchPattern(),
@@ -25,7 +25,8 @@
 #
 
 __all__ = [
-  'SgEntityClassFactory'
+  'SgEntityClassFactory',
+  'SgEntityFieldDescriptor'
 ]
 
 # Python imports
@@ -36,6 +37,55 @@ import weakref
 # This module imports
 import ShotgunORM
 
+class SgEntityFieldDescriptor(object):
+  '''
+  Descriptor added to factory built Entity classes for each schema field.
+
+  Returns the value of the Entities field so that attribute access such as
+  entity.code does not need to fallback to a field lookup.
+  '''
+
+  __slots__ = [
+    '_name'
+  ]
+
+  def __init__(self, sgField):
+    self._name = sgField
+
+  def __get__(self, instance, owner):
+    # Entity defines __eq__ so compare identity.
+    if instance is None:
+      return self
+
+    try:
+      fieldObj = instance._fields[self._name]
+    except KeyError:
+      raise AttributeError(
+        '\'%s\' object has no attribute \'%s\'' % (owner.__name__, self._name)
+      )
+
+    return fieldObj.value()
+
+  def __set__(self, instance, value):
+    try:
+      fieldObj = instance._fields[self._name]
+    except KeyError:
+      raise AttributeError(
+        '\'%s\' object has no attribute \'%s\'' % (
+          type(instance).__name__,
+          self._name
+        )
+      )
+
+    fieldObj.setValue(value)
+
+  def name(self):
+    '''
+    Returns the name of the field.
+    '''
+
+    return self._name
+
 class SgEntityClassFactory(object):
   '''
   Class factory for building a SgConnections Entity objects.
@@ -118,6 +168,23 @@ class SgEntityClassFactory(object):
 
         ShotgunORM.LoggerFactory.debug('        + Using %(baseClass)s', {'baseClass': entityBaseClass})
 
+        # Add a descriptor for each field so attribute access of a field does
+        # not need to go through SgEntity.__getattr__.  Fields that conflict
+        # with an attribute of the base class are only reachable through
+        # entity['field'].
+        for fieldName in entityInfo.fieldInfos().keys():
+          if hasattr(entityBaseClass, fieldName):
+            ShotgunORM.LoggerField.warn(
+              'Entity type %(entity)s field name "%(name)s confilicts with class method of same name' % {
+                'entity': entityTypeName,
+                'name': fieldName
+              }
+            )
+
+            continue
+
+          fieldProps[fieldName] = SgEntityFieldDescriptor(fieldName)
+
         newEntityClass = type(entityTypeName, (entityBaseClass, ), fieldProps)
 
         newClassCache[entityTypeName] = newEntityClass
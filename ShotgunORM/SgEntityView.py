@@ -0,0 +1,280 @@
+# Copyright (c) 2013, Nathan Dunsworth - NFXPlugins
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the NFXPlugins nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL NFXPLUGINS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+__all__ = [
+  'SgEntityView'
+]
+
+# Python imports
+import weakref
+
+# This module imports
+import ShotgunORM
+
+class SgEntityView(object):
+  '''
+  Read-only view of an Entity returned by find(..., readOnly=True).
+
+  Views store the decoded field values of a single search result and share the
+  SgEntitySchemaInfo of their Entity type.  Unlike SgEntity objects they have
+  no lock, no field objects and are not added to the connections Entity cache
+  which makes them cheap to create in large numbers.
+
+  Field values are accessed the same way as on an SgEntity, view['field'] or
+  view.field, fields that were not part of the search raise a KeyError.  Entity
+  and multi-entity fields return views of the linked Entities which only
+  contain the "type", "id" and "name" values that Shotgun returned.
+
+  Use toEntity() to get the SgEntity when a field needs to be modified.
+  '''
+
+  __slots__ = [
+    '_connection',
+    '_data',
+    '_info',
+    '__weakref__'
+  ]
+
+  def __init__(self, sgConnection, sgEntityInfo, sgData):
+    '''
+    Args:
+      * (SgConnection) sgConnection:
+        Connection the view belongs to.
+
+      * (SgEntitySchemaInfo) sgEntityInfo:
+        Schema info of the Entity type.
+
+      * (dict) sgData:
+        Decoded Shotgun search result, see decodeRawResults().
+    '''
+
+    if not isinstance(sgConnection, weakref.ref):
+      sgConnection = weakref.ref(sgConnection)
+
+    object.__setattr__(self, '_connection', sgConnection)
+    object.__setattr__(self, '_data', sgData)
+    object.__setattr__(self, '_info', sgEntityInfo)
+
+  def __contains__(self, item):
+    return self._data.has_key(item)
+
+  def __copy__(self):
+    return self
+
+  def __deepcopy__(self, memo):
+    return self
+
+  def __eq__(self, item):
+    if isinstance(item, (SgEntityView, ShotgunORM.SgEntity)):
+      return (
+        self.type == item.type and self['id'] == item['id'] and
+        self.isFromSameSite(item)
+      )
+    elif isinstance(item, int):
+      return self['id'] == item
+    elif isinstance(item, str):
+      return self.type == item
+
+    return False
+
+  def __ne__(self, item):
+    return not self == item
+
+  def __hash__(self):
+    return hash((self.type, self['id']))
+
+  def __getattr__(self, item):
+    # Private attributes are never fields, this also prevents recursion when
+    # the slots have not been set.
+    if item.startswith('_'):
+      raise AttributeError(item)
+
+    try:
+      return self[item]
+    except KeyError:
+      raise AttributeError(
+        '%s has no attribute or searched field "%s"' % (self, item)
+      )
+
+  def __getitem__(self, item):
+    try:
+      value = self._data[item]
+    except KeyError:
+      if self._info.hasField(item):
+        raise KeyError('field "%s" was not part of the search' % item)
+
+      raise KeyError('invalid field key "%s"' % item)
+
+    if value == None or item in ['id', 'type']:
+      return value
+
+    fieldInfo = self._info.fieldInfo(item)
+
+    if fieldInfo == None:
+      return value
+
+    returnType = fieldInfo.returnType()
+
+    if returnType == ShotgunORM.SgField.RETURN_TYPE_ENTITY:
+      return self._linkView(value)
+    elif returnType == ShotgunORM.SgField.RETURN_TYPE_MULTI_ENTITY:
+      return [self._linkView(x) for x in value]
+
+    return value
+
+  def __int__(self):
+    return self['id']
+
+  def __iter__(self):
+    return iter(self.fieldNames())
+
+  def __repr__(self):
+    if self._info.isCustom():
+      name = self._info.label()
+    else:
+      name = self.type
+
+    return '<Shotgun.%s(id:%d, readonly)>' % (name, self['id'])
+
+  def __setattr__(self, item, value):
+    raise AttributeError('%s is read-only' % self)
+
+  def __setitem__(self, item, value):
+    raise TypeError('%s is read-only' % self)
+
+  def _linkView(self, sgData):
+    '''
+    Internal function!
+
+    Returns a SgEntityView for the Shotgun formatted Entity dict.
+    '''
+
+    connection = self.connection()
+
+    if connection == None:
+      return dict(sgData)
+
+    info = connection.schema().entityInfo(sgData['type'])
+
+    if info == None:
+      return dict(sgData)
+
+    return SgEntityView(self._connection, info, dict(sgData))
+
+  def connection(self):
+    '''
+    Returns the SgConnection the view belongs to.
+    '''
+
+    return self._connection()
+
+  def data(self):
+    '''
+    Returns a copy of the decoded field values as a dict.
+    '''
+
+    return dict(self._data)
+
+  def fieldNames(self):
+    '''
+    Returns a list of the field names contained in the view.
+    '''
+
+    return sorted(self._data.keys())
+
+  def hasField(self, sgField):
+    '''
+    Returns True if the view contains the field specified.
+
+    Args:
+      * (str) sgField:
+        Field name.
+    '''
+
+    return self._data.has_key(sgField)
+
+  def isCustom(self):
+    '''
+    Returns True if the Entity type is a custom Entity.
+    '''
+
+    return self._info.isCustom()
+
+  def isFromSameSite(self, other):
+    '''
+    Returns True if this view belongs to the same Shotgun site as other.
+
+    Args:
+      * (SgEntityView, SgEntity) other:
+        View or Entity to compare against.
+    '''
+
+    if not isinstance(other, (SgEntityView, ShotgunORM.SgEntity)):
+      raise ValueError('arg is not an SgEntityView or SgEntity')
+
+    connection = self.connection()
+    otherConnection = other.connection()
+
+    if connection is None or otherConnection is None:
+      return False
+
+    return (
+      connection is otherConnection or
+      connection.url() == otherConnection.url()
+    )
+
+  def schemaInfo(self):
+    '''
+    Returns the SgEntitySchemaInfo object that defines the Entity type.
+    '''
+
+    return self._info
+
+  def toEntity(self):
+    '''
+    Returns the SgEntity of the view.
+
+    The view values are used to fill in any fields of the Entity that are not
+    valid yet.
+    '''
+
+    connection = self.connection()
+
+    if connection == None:
+      raise RuntimeError('connection no longer exists')
+
+    return connection._createEntity(self.type, self._data)
+
+  def toEntityFieldData(self):
+    '''
+    Retruns a Shotgun formatted dict search pattern used for the field value
+    of another Entities search pattern.
+    '''
+
+    return {
+      'type': self.type,
+      'id': self['id']
+    }
@@ -0,0 +1,234 @@
+# Copyright (c) 2013, Nathan Dunsworth - NFXPlugins
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the NFXPlugins nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL NFXPLUGINS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+__all__ = [
+  'SgEventLogEntry'
+]
+
+# Python imports
+import weakref
+
+# This module imports
+import ShotgunORM
+
+class SgEventLogEntry(object):
+  '''
+  Class that represents a read-only EventLogEntry record.
+
+  EventLogEntrys are immutable log rows so building a full SgEntity for each
+  one, with its fields, cache bookkeeping and callbacks, is wasted work.  This
+  class is a lightweight view over the raw dict returned by Shotgun.
+
+  Field values are accessible by item or attribute, ie event['event_type'] or
+  event.event_type.  The Entity fields "entity", "project" and "user" are
+  resolved to SgEntity objects the first time they are accessed.
+
+  Note:
+    Values are returned as is and must not be modified.  Use toEntity() to
+    retrieve a full SgEntity for the event.
+  '''
+
+  __slots__ = [
+    '_connection',
+    '_data',
+    '_resolved'
+  ]
+
+  # Fields whose values are resolved to SgEntity objects on first access.
+  ENTITY_FIELDS = frozenset(['entity', 'project', 'user'])
+
+  def __contains__(self, item):
+    return item in self._data
+
+  def __eq__(self, item):
+    if isinstance(item, SgEventLogEntry):
+      return self._data['id'] == item._data['id']
+    elif isinstance(item, ShotgunORM.SgEntity):
+      return item.type == 'EventLogEntry' and item['id'] == self._data['id']
+
+    return False
+
+  def __ne__(self, item):
+    return not self.__eq__(item)
+
+  def __getattr__(self, item):
+    try:
+      return self.__getitem__(item)
+    except KeyError:
+      raise AttributeError(
+        '%s has no attribute "%s"' % (type(self).__name__, item)
+      )
+
+  def __getitem__(self, item):
+    if item in self.ENTITY_FIELDS:
+      return self.__resolve(item)
+
+    return self._data[item]
+
+  def __hash__(self):
+    return self._data['id']
+
+  def __init__(self, sgConnection, sgData):
+    if sgConnection != None:
+      sgConnection = weakref.ref(sgConnection)
+
+    object.__setattr__(self, '_connection', sgConnection)
+    object.__setattr__(self, '_data', sgData)
+    object.__setattr__(self, '_resolved', None)
+
+  def __iter__(self):
+    return iter(self._data)
+
+  def __len__(self):
+    return len(self._data)
+
+  def __repr__(self):
+    return '<EventLogEntry(id:%(id)s, event_type:%(event_type)s)>' % {
+      'id': self._data['id'],
+      'event_type': self._data.get('event_type', None)
+    }
+
+  def __resolve(self, fieldName):
+    value = self._data[fieldName]
+
+    if value == None:
+      return None
+
+    resolved = self._resolved
+
+    if resolved == None:
+      resolved = {}
+
+      object.__setattr__(self, '_resolved', resolved)
+    elif resolved.has_key(fieldName):
+      return resolved[fieldName]
+
+    connection = self.connection()
+
+    if connection == None:
+      raise RuntimeError(
+        'unable to resolve field "%s", event has no connection' % fieldName
+      )
+
+    result = connection._createEntity(value['type'], value)
+
+    resolved[fieldName] = result
+
+    return result
+
+  def __setattr__(self, item, value):
+    raise AttributeError('%s is read-only' % type(self).__name__)
+
+  def __setitem__(self, item, value):
+    raise TypeError('%s is read-only' % type(self).__name__)
+
+  def connection(self):
+    '''
+    Returns the SgConnection the event belongs to.
+
+    Events that were not retrieved from Shotgun, for example ones replayed from
+    a file, may have no connection in which case None is returned.
+    '''
+
+    if self._connection == None:
+      return None
+
+    return self._connection()
+
+  def fieldNames(self):
+    '''
+    Returns a list of the field names the event contains.
+    '''
+
+    return self._data.keys()
+
+  def fieldValues(self):
+    '''
+    Returns a copy of the raw field values of the event.
+
+    Unlike SgEntity.fieldValues() Entity fields are returned as Shotgun
+    formatted dicts.
+    '''
+
+    return dict(self._data)
+
+  def get(self, fieldName, default=None):
+    '''
+    Returns the value of the field or default if the event does not contain
+    it.
+
+    Args:
+      * (str) fieldName:
+        Name of the field.
+
+      * (obj) default:
+        Value returned when the field does not exist.
+    '''
+
+    if not self._data.has_key(fieldName):
+      return default
+
+    return self.__getitem__(fieldName)
+
+  def has_key(self, fieldName):
+    '''
+    Returns True if the event contains the field.
+
+    Args:
+      * (str) fieldName:
+        Name of the field.
+    '''
+
+    return self._data.has_key(fieldName)
+
+  def hasField(self, fieldName):
+    '''
+    See has_key().
+    '''
+
+    return self._data.has_key(fieldName)
+
+  def toEntity(self):
+    '''
+    Returns the SgEntity for the event.
+    '''
+
+    connection = self.connection()
+
+    if connection == None:
+      raise RuntimeError('event has no connection')
+
+    return connection._createEntity('EventLogEntry', self._data)
+
+  def valuesSg(self):
+    '''
+    Returns the raw Shotgun data of the event.
+
+    Note:
+      The returned dict is shared with the event and must not be modified.
+    '''
+
+    return self._data
@@ -0,0 +1,494 @@
+# Copyright (c) 2013, Nathan Dunsworth - NFXPlugins
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the NFXPlugins nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL NFXPLUGINS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+__all__ = [
+  'SgEventRecorder',
+  'SgEventReplaySource',
+  'SgEventSource',
+  'SgShotgunEventSource'
+]
+
+# Python imports
+from abc import abstractmethod
+
+import threading
+
+# This module imports
+import ShotgunORM
+
+class SgEventSource(object):
+  '''
+  Base class for the sources SgEventWatchers retrieve EventLogEntrys from.
+  '''
+
+  def __repr__(self):
+    return '<%s>' % type(self).__name__
+
+  def close(self):
+    '''
+    Close up any resources used by the source.
+
+    Default function does nothing.
+    '''
+
+    pass
+
+  def connection(self):
+    '''
+    Returns the SgConnection returned events belong to or None.
+    '''
+
+    return None
+
+  @abstractmethod
+  def fetch(self, lastId, sgSearchFilters, limit, aborted=None):
+    '''
+    Returns a list of SgEventLogEntry objects with an ID greater than lastId in
+    ascending ID order.
+
+    Returns None if aborted() returned True before retrieval completed.
+
+    Default function raises NotImplementedError.
+
+    Args:
+      * (int) lastId:
+        ID of the last processed event.
+
+      * (SgSearchFilters) sgSearchFilters:
+        Additional EventLogEntry search filters.
+
+      * (int) limit:
+        Batch size hint.
+
+      * (callable) aborted:
+        Returns True when retrieval should halt.
+    '''
+
+    raise NotImplementedError()
+
+  def isExhausted(self):
+    '''
+    Returns True if the source will never return any more events.
+
+    Default returns False.
+    '''
+
+    return False
+
+  def isLive(self):
+    '''
+    Returns True if the source is polled at the watchers update interval.
+
+    Sources that are not live, such as replays, are drained as fast as
+    handlers can process their events.
+
+    Default returns True.
+    '''
+
+    return True
+
+  @abstractmethod
+  def lastEventId(self):
+    '''
+    Returns the ID of the newest event the source contains or None if it
+    contains no events.
+
+    Default function raises NotImplementedError.
+    '''
+
+    raise NotImplementedError()
+
+  def pollKey(self):
+    '''
+    Returns the object SgEventWatcherHubs use to determine if watchers can
+    share a poll.
+
+    Default returns the source itself.
+    '''
+
+    return self
+
+class SgShotgunEventSource(SgEventSource):
+  '''
+  Event source that polls Shotgun for EventLogEntrys.
+
+  This is the default source of SgEventWatcher.
+  '''
+
+  def __repr__(self):
+    return '<%s(connection=%s)>' % (type(self).__name__, self.__connection)
+
+  def __init__(self, sgConnection):
+    super(SgShotgunEventSource, self).__init__()
+
+    self.__connection = sgConnection
+
+  def connection(self):
+    '''
+    Returns the SgConnection the source polls.
+    '''
+
+    return self.__connection
+
+  def fetch(self, lastId, sgSearchFilters, limit, aborted=None):
+    '''
+    Retrieves all EventLogEntrys with an ID greater than lastId.
+
+    See SgEventWatcherFetch() for more information.
+    '''
+
+    return ShotgunORM.SgEventWatcherFetch(
+      self.__connection,
+      sgSearchFilters,
+      lastId,
+      limit,
+      aborted
+    )
+
+  def lastEventId(self):
+    '''
+    Returns the ID of the newest EventLogEntry in Shotgun.
+    '''
+
+    result = self.__connection._sg_find_one(
+      'EventLogEntry',
+      [],
+      [],
+      order=[
+        {
+          'field_name': 'id',
+          'direction': 'desc'
+        }
+      ]
+    )
+
+    if result == None:
+      return None
+
+    return result['id']
+
+  def pollKey(self):
+    '''
+    Returns the SgConnection so all watchers of a connection share polls.
+    '''
+
+    return self.__connection
+
+class SgEventReplaySource(SgEventSource):
+  '''
+  Event source that replays EventLogEntrys recorded by a SgEventRecorder.
+
+  The file contains one JSON encoded EventLogEntry per line and may be gzip or
+  bzip2 compressed, see ShotgunORM.openFile().  Events are expected to be in
+  ascending ID order.
+
+  Replay sources are not live so a watcher drains them as fast as its handlers
+  process events and stops once the end of the file is reached, this makes
+  them suitable for benchmarking handlers and backfills.
+
+  Note:
+    EventLogEntry search filters can not be evaluated locally and are ignored.
+    Events reference the connection passed in, when None the events Entity
+    fields can not be resolved.
+  '''
+
+  def __repr__(self):
+    return '<%s(filename="%s")>' % (type(self).__name__, self.__filename)
+
+  def __init__(self, filename, sgConnection=None, compression=None):
+    super(SgEventReplaySource, self).__init__()
+
+    self.__lock = threading.RLock()
+    self.__filename = filename
+    self.__compression = compression
+    self.__connection = sgConnection
+    self.__file = None
+    self.__pending = None
+    self.__lastReturnedId = None
+    self.__lastEventId = -1
+    self.__exhausted = False
+
+  def __open(self):
+    if self.__file != None:
+      self.__file.close()
+
+    self.__file = ShotgunORM.openFile(
+      self.__filename,
+      'rb',
+      self.__compression
+    )
+
+    self.__pending = None
+    self.__lastReturnedId = None
+    self.__exhausted = False
+
+  def __readEvent(self):
+    if self.__pending != None:
+      result = self.__pending
+
+      self.__pending = None
+
+      return result
+
+    while True:
+      line = self.__file.readline()
+
+      if not line:
+        return None
+
+      line = line.strip()
+
+      if line:
+        return ShotgunORM.fromJson(line)
+
+  def close(self):
+    '''
+    Closes the replay file.
+    '''
+
+    with self.__lock:
+      if self.__file != None:
+        self.__file.close()
+
+        self.__file = None
+
+  def connection(self):
+    '''
+    Returns the SgConnection replayed events belong to.
+    '''
+
+    return self.__connection
+
+  def fetch(self, lastId, sgSearchFilters, limit, aborted=None):
+    '''
+    Returns the next batch of at most limit events with an ID greater than
+    lastId.
+    '''
+
+    with self.__lock:
+      if (
+        self.__file == None or
+        (self.__lastReturnedId != None and lastId < self.__lastReturnedId)
+      ):
+        self.__open()
+
+      result = []
+
+      while len(result) < limit:
+        if aborted != None and aborted():
+          return None
+
+        data = self.__readEvent()
+
+        if data == None:
+          self.__exhausted = True
+
+          break
+
+        if data['id'] <= lastId:
+          continue
+
+        result.append(ShotgunORM.SgEventLogEntry(self.__connection, data))
+
+      if len(result) > 0:
+        self.__lastReturnedId = result[-1]['id']
+
+      return result
+
+  def filename(self):
+    '''
+    Returns the replay filename.
+    '''
+
+    return self.__filename
+
+  def isExhausted(self):
+    '''
+    Returns True once the end of the replay file has been reached.
+    '''
+
+    return self.__exhausted
+
+  def isLive(self):
+    '''
+    Returns False.
+    '''
+
+    return False
+
+  def lastEventId(self):
+    '''
+    Returns the ID of the last event in the replay file.
+
+    Note:
+      The first call reads the entire file.
+    '''
+
+    with self.__lock:
+      if self.__lastEventId == -1:
+        self.__lastEventId = None
+
+        fh = ShotgunORM.openFile(self.__filename, 'rb', self.__compression)
+
+        try:
+          for line in fh:
+            line = line.strip()
+
+            if line:
+              self.__lastEventId = ShotgunORM.fromJson(line)['id']
+        finally:
+          fh.close()
+
+      return self.__lastEventId
+
+class SgEventRecorder(SgEventSource):
+  '''
+  Event source that records the events of another source to a file.
+
+  Each event returned by the wrapped source is written as a single JSON line,
+  the file can later be replayed with a SgEventReplaySource.
+
+  When mode is None the file is appended to, bzip2 files can not be appended
+  to and are overwritten instead.
+
+  Example:
+    watcher.setEventSource(
+      SgEventRecorder(watcher.eventSource(), '/tmp/events.jsonl.gz')
+    )
+  '''
+
+  def __repr__(self):
+    return '<%s(source=%s, filename="%s")>' % (
+      type(self).__name__,
+      self.__source,
+      self.__filename
+    )
+
+  def __init__(self, sgEventSource, filename, mode=None, compression=None):
+    super(SgEventRecorder, self).__init__()
+
+    if not isinstance(sgEventSource, SgEventSource):
+      raise TypeError(
+        'expected a SgEventSource got %s' % type(sgEventSource).__name__
+      )
+
+    if mode == None:
+      if compression == 'bz2' or (
+        compression == None and filename.endswith('.bz2')
+      ):
+        mode = 'wb'
+      else:
+        mode = 'ab'
+
+    self.__lock = threading.Lock()
+    self.__source = sgEventSource
+    self.__filename = filename
+    self.__file = ShotgunORM.openFile(filename, mode, compression)
+    self.__recorded = 0
+
+  def close(self):
+    '''
+    Closes the recording and the wrapped source.
+    '''
+
+    with self.__lock:
+      if self.__file != None:
+        self.__file.close()
+
+        self.__file = None
+
+    self.__source.close()
+
+  def connection(self):
+    '''
+    Returns the SgConnection of the wrapped source.
+    '''
+
+    return self.__source.connection()
+
+  def fetch(self, lastId, sgSearchFilters, limit, aborted=None):
+    '''
+    Retrieves events from the wrapped source and records them.
+    '''
+
+    result = self.__source.fetch(lastId, sgSearchFilters, limit, aborted)
+
+    if result:
+      lines = [ShotgunORM.toJson(i.valuesSg()) for i in result]
+
+      with self.__lock:
+        if self.__file == None:
+          raise RuntimeError('recorder has been closed')
+
+        self.__file.write('\n'.join(lines))
+        self.__file.write('\n')
+        self.__file.flush()
+
+        self.__recorded += len(lines)
+
+    return result
+
+  def filename(self):
+    '''
+    Returns the recording filename.
+    '''
+
+    return self.__filename
+
+  def isExhausted(self):
+    '''
+    Returns True if the wrapped source is exhausted.
+    '''
+
+    return self.__source.isExhausted()
+
+  def isLive(self):
+    '''
+    Returns True if the wrapped source is live.
+    '''
+
+    return self.__source.isLive()
+
+  def lastEventId(self):
+    '''
+    Returns the last event ID of the wrapped source.
+    '''
+
+    return self.__source.lastEventId()
+
+  def recorded(self):
+    '''
+    Returns the number of events that have been recorded.
+    '''
+
+    return self.__recorded
+
+  def source(self):
+    '''
+    Returns the wrapped SgEventSource.
+    '''
+
+    return self.__source
@@ -30,6 +30,7 @@ __all__ = [
   'SgEventFilterer',
   'SgEventHandler',
   'SgEventWatcher',
+  'SgEventWatcherFetch'
 ]
 
 # Python imports
@@ -37,6 +38,7 @@ from abc import abstractmethod
 
 import socket
 import threading
+import time
 
 # This module imports
 import ShotgunORM
@@ -52,7 +54,7 @@ class SgEvent(object):
 
   def event(self):
     '''
-    Returns the events Entity object.
+    Returns the events SgEventLogEntry object.
     '''
 
     return self.__event
@@ -179,6 +181,17 @@ class SgEventHandler(SgEventFilterer):
     if self.__lock:
       self.__lock.acquire()
 
+  def batchFinished(self):
+    '''
+    Called by the SgEventWatcher after it finishes processing a batch of
+    events.
+
+    Handlers that accumulate events, for example to send them together, can
+    use this to emit what they have collected.  Default function does nothing.
+    '''
+
+    pass
+
   def close(self):
     '''
     Close up any resources used by the handler.
@@ -230,13 +243,13 @@ class SgEventHandler(SgEventFilterer):
       if self.filter(sgEvent):
         try:
           self.processEvent(sgEvent)
-
-          return True
         except Exception, e:
-          self.handleError(sgEvent, sgEvent)
-        finally:
+          self.handleError(sgEvent, e)
+
           return False
 
+        return True
+
     return False
 
   @abstractmethod
@@ -292,12 +305,17 @@ class SgEventWatcher(SgEventFilterer):
     self,
     sgConnection,
     startProcessingAtId=None,
-    updateInterval=10
+    updateInterval=10,
+    sgEventSource=None
   ):
     super(SgEventWatcher, self).__init__()
 
+    if sgEventSource == None:
+      sgEventSource = ShotgunORM.SgShotgunEventSource(sgConnection)
+
     self.__lock = threading.RLock()
     self.__connection = sgConnection
+    self.__eventSource = sgEventSource
     self.__handlers = []
     self.__updateInterval = int(updateInterval)
     self.__search_filters = ShotgunORM.SgEntitySearchFilters(
@@ -315,6 +333,14 @@ class SgEventWatcher(SgEventFilterer):
     self.__aborted = False
     self.__running = False
     self.__lastEvent = None
+    self.__lastEventId = None
+    self.__hub = None
+    self.__stats = {
+      'batches': 0,
+      'events': 0,
+      'handled': 0,
+      'seconds': 0.0
+    }
     self.__threadData = {
       'event': threading.Event(),
       'start_at_id': startProcessingAtId,
@@ -323,6 +349,82 @@ class SgEventWatcher(SgEventFilterer):
 
     self.__monitorThread = None
 
+  def _processEvents(self, sgEventLogEntries):
+    '''
+    Internal!
+
+    Processes a batch of EventLogEntrys retrieved by the worker thread or the
+    SgEventWatcherHub the watcher belongs to.
+    '''
+
+    if len(sgEventLogEntries) <= 0:
+      return
+
+    with self:
+      handled = 0
+
+      startTime = time.time()
+
+      for i in sgEventLogEntries:
+        handled += self.processEvent(i)
+
+      for handler in self.__handlers:
+        try:
+          handler.batchFinished()
+        except Exception, e:
+          self.logger().error(str(e))
+
+      stats = self.__stats
+
+      stats['seconds'] += time.time() - startTime
+      stats['batches'] += 1
+      stats['events'] += len(sgEventLogEntries)
+      stats['handled'] += handled
+
+      self.__lastEventId = sgEventLogEntries[-1]['id']
+
+  def _resolveStartId(self):
+    '''
+    Internal!
+
+    Returns the EventLogEntry ID the watcher has processed up to, event
+    retrieval will begin at the first event greater than the returned ID.
+    '''
+
+    lastId = self.__threadData['start_at_id']
+
+    if lastId >= 0:
+      return lastId - 1
+
+    if lastId == self.FIRST_EVENT:
+      return lastId
+
+    lastEventId = self.__eventSource.lastEventId()
+
+    if lastEventId == None:
+      return -1
+
+    if lastId == self.LAST_EVENT:
+      return lastEventId - 1
+
+    # NO_EVENT, only process events created from here on.
+    return lastEventId
+
+  def _setHub(self, sgEventWatcherHub):
+    '''
+    Internal!
+
+    Sets the SgEventWatcherHub that drives the watcher.
+    '''
+
+    with self:
+      if sgEventWatcherHub != None and self.isRunning():
+        raise RuntimeError(
+          'event watcher is running, unable to add it to a hub'
+        )
+
+      self.__hub = sgEventWatcherHub
+
   def _workerFinished(self):
     '''
     Internal!
@@ -330,8 +432,8 @@ class SgEventWatcher(SgEventFilterer):
 
     self.__threadData['event'].clear()
 
-    if self.__lastEvent != None:
-      self.__threadData['start_at_id'] = self.__lastEvent['id'] + 1
+    if self.__lastEventId != None:
+      self.__threadData['start_at_id'] = self.__lastEventId + 1
 
     self.__aborted = False
     self.__running = False
@@ -393,6 +495,13 @@ class SgEventWatcher(SgEventFilterer):
 
     return self.__connection
 
+  def eventSource(self):
+    '''
+    Returns the SgEventSource the watcher retrieves events from.
+    '''
+
+    return self.__eventSource
+
   def handlers(self):
     '''
     Returns a list of all the SgEventHandlers the watcher contains.
@@ -400,6 +509,13 @@ class SgEventWatcher(SgEventFilterer):
 
     return list(self.__handlers)
 
+  def hub(self):
+    '''
+    Returns the SgEventWatcherHub the watcher belongs to or None.
+    '''
+
+    return self.__hub
+
   def isRunning(self):
     '''
     Returns True if the watcher is running and monitoring Shotgun for events
@@ -433,7 +549,7 @@ class SgEventWatcher(SgEventFilterer):
     Processes the EventLogEntry.
 
     Args:
-      * (SgEntity) sgEventLogEntry:
+      * (SgEventLogEntry) sgEventLogEntry:
         Event to process.
     '''
 
@@ -472,7 +588,7 @@ class SgEventWatcher(SgEventFilterer):
       handlers = list(self.__handlers)
 
       try:
-        handlers.remove(handler)
+        handlers.remove(sgEventHandler)
 
         self.__handlers = handlers
       except ValueError:
@@ -480,6 +596,19 @@ class SgEventWatcher(SgEventFilterer):
 
     return result
 
+  def resetStats(self):
+    '''
+    Resets the processing statistics returned by stats().
+    '''
+
+    with self:
+      self.__stats = {
+        'batches': 0,
+        'events': 0,
+        'handled': 0,
+        'seconds': 0.0
+      }
+
   def searchFilters(self):
     '''
 
@@ -519,6 +648,33 @@ class SgEventWatcher(SgEventFilterer):
 
       self.__threadData['start_at_id'] = idNumber
 
+  def setEventSource(self, sgEventSource):
+    '''
+    Sets the SgEventSource the watcher retrieves events from.
+
+    If the watcher is already running when this function is called a
+    RuntimeError will be raised.
+
+    Args:
+      * (SgEventSource) sgEventSource:
+        Event source, when None the watchers connection is polled.
+    '''
+
+    if sgEventSource == None:
+      sgEventSource = ShotgunORM.SgShotgunEventSource(self.connection())
+    elif not isinstance(sgEventSource, ShotgunORM.SgEventSource):
+      raise TypeError(
+        'expected a SgEventSource got %s' % type(sgEventSource).__name__
+      )
+
+    with self:
+      if self.isRunning():
+        raise RuntimeError(
+          'event watcher is already running, unable to set the event source'
+        )
+
+      self.__eventSource = sgEventSource
+
   def setSearchFilters(self, sgSearchFilters):
     '''
 
@@ -561,6 +717,11 @@ class SgEventWatcher(SgEventFilterer):
       if self.isRunning():
         return
 
+      if self.__hub != None:
+        raise RuntimeError(
+          'event watcher is managed by %s, unable to start it' % self.__hub
+        )
+
       self.beforeStart()
 
       self.logger().debug('start')
@@ -580,6 +741,28 @@ class SgEventWatcher(SgEventFilterer):
 
       self.__monitorThread.start()
 
+  def stats(self):
+    '''
+    Returns a dict of event processing statistics.
+
+    Keys:
+      * batches: number of batches processed.
+      * events: number of events processed.
+      * handled: number of events handled by at least one handler.
+      * seconds: time spent processing events.
+      * events_per_second: processing throughput.
+    '''
+
+    with self:
+      result = dict(self.__stats)
+
+    if result['seconds'] > 0:
+      result['events_per_second'] = result['events'] / result['seconds']
+    else:
+      result['events_per_second'] = 0.0
+
+    return result
+
   def stop(self):
     '''
     Stops the event watcher, if not running returns immediately.
@@ -601,6 +784,30 @@ class SgEventWatcher(SgEventFilterer):
 
       self.afterShutdown()
 
+  def wait(self, timeout=None):
+    '''
+    Blocks until the watcher has stopped running.
+
+    Useful with event sources that are not live, the watcher stops on its own
+    once the source is exhausted.
+
+    Returns True if the watcher stopped before the timeout expired.
+
+    Args:
+      * (float) timeout:
+        Max number of seconds to wait, None waits forever.
+    '''
+
+    thread = self.__monitorThread
+
+    if thread != None:
+      thread.join(timeout)
+
+      if thread.isAlive():
+        return False
+
+    return True
+
   def updateInterval(self):
     '''
     Returns the update interval that Shotgun will be queried for new events.
@@ -610,42 +817,88 @@ class SgEventWatcher(SgEventFilterer):
 
     return self.__updateInterval
 
+def SgEventWatcherFetch(
+  sgConnection,
+  sgSearchFilters,
+  lastId,
+  limit,
+  aborted=None
+):
+  '''
+  Retrieves all EventLogEntrys with an ID greater than lastId, paging through
+  the results limit entries at a time.
+
+  Returns None if aborted() returned True before all pages were retrieved.
+
+  Args:
+    * (SgConnection) sgConnection:
+      Connection to query.
+
+    * (SgSearchFilters) sgSearchFilters:
+      Additional filters applied to the search.
+
+    * (int) lastId:
+      ID of the last processed event.
+
+    * (int) limit:
+      Number of events retrieved per page.
+
+    * (callable) aborted:
+      Called before each page, returning True halts retrieval.
+  '''
+
+  order = [{'field_name':'id','direction':'asc'}]
+
+  search_filters = ShotgunORM.SgEntitySearchFilters(
+    'EventLogEntry',
+    [
+      [
+        'id',
+        'greater_than',
+        lastId
+      ]
+    ]
+  )
+
+  search_filters.appendFilter(sgSearchFilters)
+
+  filters = search_filters.toLogicalOp(sgConnection).toFilter()
+
+  events = []
+  page = 1
+
+  while True:
+    if aborted != None and aborted():
+      return None
+
+    eventBuffer = sgConnection.findEventLogEntries(
+      filters,
+      order=order,
+      page=page,
+      limit=limit
+    )
+
+    events.extend(eventBuffer)
+
+    if len(eventBuffer) < limit:
+      break
+
+    page += 1
+
+  return events
+
 def SgEventWatcherWorker(monitor, threadData):
   '''
   Worker thread used by SgEventWatcher to monitor Shotgun for events.
   '''
 
-  e = threadData['event']
+  event = threadData['event']
 
-  connection = monitor.connection()
+  source = monitor.eventSource()
   logger = monitor.logger()
 
-  lastId = threadData['start_at_id']
+  lastId = monitor._resolveStartId()
 
-  if lastId < 0:
-    if lastId == monitor.FIRST_EVENT:
-      pass
-    else:
-      lastEvent = connection.findOne(
-        'EventLogEntry',
-        [],
-        order=[
-          {
-            'field_name': 'id',
-            'direction': 'desc'
-          }
-        ]
-      )
-
-      if lastEvent:
-        if lastId == monitor.LAST_EVENT:
-          lastId = lastEvent['id'] - 1
-      else:
-        lastId = -1
-  else:
-    lastId -= 1
-
-  order=[{'field_name':'id','direction':'asc'}]
   limit = threadData['batch_size']
 
   while True:
@@ -660,63 +913,44 @@ def SgEventWatcherWorker(monitor, threadData):
 
       return
 
-    events = []
-    page = 1
-
-    e.wait(monitor.updateInterval())
+    # Sources that are not live, ie replays, are drained as fast as possible.
+    if source.isLive():
+      event.wait(monitor.updateInterval())
 
-    while True:
-      if monitor.aborted():
-        monitor._workerFinished()
-
-        return
-
-      search_filters = ShotgunORM.SgEntitySearchFilters(
-        'EventLogEntry',
-        [
-          [
-            'id',
-            'greater_than',
-            lastId
-          ]
-        ]
+    try:
+      events = source.fetch(
+        lastId,
+        monitor.searchFilters(),
+        limit,
+        monitor.aborted
       )
+    except (
+      ShotgunORM.SHOTGUN_API.ProtocolError,
+      ShotgunORM.SHOTGUN_API.ResponseError,
+      socket.error
+    ), e:
+      logger.warn(str(e))
 
-      search_filters.appendFilter(monitor.searchFilters())
-
-      try:
-        eventBuffer = connection.find(
-          'EventLogEntry',
-          search_filters.toLogicalOp(connection).toFilter(),
-          order=order,
-          page=page,
-          limit=limit
-        )
-      except (
-        ShotgunORM.SHOTGUN_API.ProtocolError,
-        ShotgunORM.SHOTGUN_API.ResponseError,
-        socket.error
-      ), e:
-        logger.warn(str(e))
-
-        continue
-
-      logger.debug(
-        'retrieved %(count)s events' % {
-          'count': len(events)
-        }
-      )
+      continue
 
-      events.extend(eventBuffer)
+    if events == None:
+      monitor._workerFinished()
 
-      if len(eventBuffer) < limit:
-        break
+      return
 
-      page += 1
+    logger.debug(
+      'retrieved %(count)s events' % {
+        'count': len(events)
+      }
+    )
 
-    with monitor:
-      for i in events:
-        monitor.processEvent(i)
+    monitor._processEvents(events)
 
     if len(events) > 0:
       lastId = events[-1]['id']
+    elif source.isExhausted():
+      logger.debug('event source %(source)s exhausted' % {'source': source})
+
+      monitor._workerFinished()
+
+      return
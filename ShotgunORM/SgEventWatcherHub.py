@@ -0,0 +1,504 @@
+# Copyright (c) 2013, Nathan Dunsworth - NFXPlugins
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the NFXPlugins nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL NFXPLUGINS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+__all__ = [
+  'SgEventWatcherHub'
+]
+
+# Python imports
+import Queue
+import socket
+import threading
+
+# This module imports
+import ShotgunORM
+
+class SgEventWatcherPollGroup(object):
+  '''
+  Internal!
+
+  Group of SgEventWatchers that share an event source and EventLogEntry search
+  filters and can therefore share a single poll.
+  '''
+
+  def __init__(self, sgEventSource, sgSearchFilters):
+    self.source = sgEventSource
+    self.searchFilters = sgSearchFilters
+    self.watchers = []
+
+  def accepts(self, sgEventWatcher):
+    '''
+    Returns True if the watcher can share this groups poll.
+    '''
+
+    return (
+      sgEventWatcher.eventSource().pollKey() is self.source.pollKey() and
+      sgEventWatcher.searchFilters() == self.searchFilters
+    )
+
+class SgEventWatcherHub(object):
+  '''
+  Class that drives multiple SgEventWatchers from a single scheduler.
+
+  Instead of every watcher running its own polling thread the hub polls each
+  event source, by default one per connection, once and shares each batch of
+  EventLogEntrys with all the watchers registered for that connection.
+  Watchers keep their own filters, handlers and checkpoints so a watcher that
+  has fallen behind only receives the events it has not yet processed.
+
+  Watchers are grouped by SgEventSource.pollKey() and search filters, the
+  polls for each group are executed by a small pool of worker threads.
+
+  Note:
+    While a watcher belongs to a hub its own update interval is ignored and
+    calling its start() raises a RuntimeError.
+  '''
+
+  UPDATE_INTERVAL_MIN = ShotgunORM.SgEventWatcher.UPDATE_INTERVAL_MIN
+
+  def __del__(self):
+    try:
+      self.stop()
+    except:
+      pass
+
+  def __enter__(self):
+    self.__lock.acquire()
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.__lock.release()
+
+    return False
+
+  def __repr__(self):
+    return '<SgEventWatcherHub(watchers=%(watchers)d)>' % {
+      'watchers': len(self.__watchers)
+    }
+
+  def __init__(self, updateInterval=10, maxWorkers=4):
+    self.__lock = threading.RLock()
+    self.__pollCondition = threading.Condition(self.__lock)
+    self.__event = threading.Event()
+
+    self.__watchers = []
+    self.__checkpoints = {}
+    self.__polling = set()
+
+    self.__maxWorkers = max(1, int(maxWorkers))
+    self.__updateInterval = self.UPDATE_INTERVAL_MIN
+
+    self.setUpdateInterval(updateInterval)
+
+    self.__aborted = False
+    self.__running = False
+
+    self.__jobQueue = None
+    self.__schedulerThread = None
+    self.__workerThreads = []
+
+  def _pollGroup(self, sgPollGroup):
+    '''
+    Internal!
+
+    Retrieves the events for the poll group and passes them to each watcher
+    in the group.
+    '''
+
+    logger = self.logger()
+
+    try:
+      checkpoints = []
+
+      for watcher in sgPollGroup.watchers:
+        lastId = self.__checkpoints.get(watcher, None)
+
+        if lastId == None:
+          lastId = watcher._resolveStartId()
+
+          self.__checkpoints[watcher] = lastId
+
+        checkpoints.append(lastId)
+
+      limit = max([i.batchSize() for i in sgPollGroup.watchers])
+
+      try:
+        events = sgPollGroup.source.fetch(
+          min(checkpoints),
+          sgPollGroup.searchFilters,
+          limit,
+          self.aborted
+        )
+      except (
+        ShotgunORM.SHOTGUN_API.ProtocolError,
+        ShotgunORM.SHOTGUN_API.ResponseError,
+        socket.error
+      ), e:
+        logger.warn(str(e))
+
+        return
+
+      if events == None or len(events) <= 0:
+        return
+
+      logger.debug(
+        'retrieved %(count)s events for %(watchers)d watchers' % {
+          'count': len(events),
+          'watchers': len(sgPollGroup.watchers)
+        }
+      )
+
+      for watcher, lastId in zip(sgPollGroup.watchers, checkpoints):
+        if lastId >= events[-1]['id']:
+          continue
+
+        # Events are ordered by id so the watchers new events are always the
+        # tail of the batch.
+        index = 0
+
+        if lastId >= events[0]['id']:
+          while events[index]['id'] <= lastId:
+            index += 1
+
+        try:
+          watcher._processEvents(events[index:])
+        except Exception, e:
+          logger.error(str(e))
+
+        self.__checkpoints[watcher] = events[-1]['id']
+    finally:
+      with self:
+        for watcher in sgPollGroup.watchers:
+          self.__polling.discard(watcher)
+
+        self.__pollCondition.notifyAll()
+
+  def _pollGroups(self):
+    '''
+    Internal!
+
+    Returns the watchers the hub contains grouped by shared polls.
+    '''
+
+    groups = []
+
+    with self:
+      for watcher in self.__watchers:
+        group = None
+
+        for i in groups:
+          if i.accepts(watcher):
+            group = i
+
+            break
+
+        if group == None:
+          group = SgEventWatcherPollGroup(
+            watcher.eventSource(),
+            watcher.searchFilters()
+          )
+
+          groups.append(group)
+
+        group.watchers.append(watcher)
+
+    return groups
+
+  def _schedule(self):
+    '''
+    Internal!
+
+    Queues a poll for every group that does not currently have one in progress.
+    '''
+
+    with self:
+      for group in self._pollGroups():
+        if self.__polling.intersection(group.watchers):
+          continue
+
+        self.__polling.update(group.watchers)
+
+        self.__jobQueue.put(group)
+
+  def aborted(self):
+    '''
+    Returns True if the hub has been instructed to stop operation.
+    '''
+
+    return self.__aborted
+
+  def addWatcher(self, sgEventWatcher):
+    '''
+    Adds the SgEventWatcher to the hub.
+
+    The watcher must not be running and can only belong to a single hub.
+
+    Args:
+      * (SgEventWatcher) sgEventWatcher:
+        Watcher to add.
+    '''
+
+    if not isinstance(sgEventWatcher, ShotgunORM.SgEventWatcher):
+      raise TypeError(
+        'expected a SgEventWatcher got %s' % type(sgEventWatcher).__name__
+      )
+
+    with self:
+      if sgEventWatcher in self.__watchers:
+        return
+
+      if sgEventWatcher.hub() != None:
+        raise RuntimeError('event watcher already belongs to a hub')
+
+      sgEventWatcher._setHub(self)
+
+      watchers = list(self.__watchers)
+
+      watchers.append(sgEventWatcher)
+
+      self.__watchers = watchers
+
+  def checkpoint(self, sgEventWatcher):
+    '''
+    Returns the ID of the last EventLogEntry the hub has passed to the watcher
+    or None if the watcher has not been polled yet.
+
+    Args:
+      * (SgEventWatcher) sgEventWatcher:
+        Watcher to return the checkpoint for.
+    '''
+
+    return self.__checkpoints.get(sgEventWatcher, None)
+
+  def isRunning(self):
+    '''
+    Returns True if the hub is running.
+    '''
+
+    return self.__running
+
+  def logger(self):
+    '''
+    Returns the logger used by the hub.
+    '''
+
+    return ShotgunORM.LoggerEventWatcher
+
+  def maxWorkers(self):
+    '''
+    Returns the number of worker threads used to poll Shotgun.
+    '''
+
+    return self.__maxWorkers
+
+  def removeWatcher(self, sgEventWatcher):
+    '''
+    Removes the SgEventWatcher from the hub.
+
+    If a poll is in progress for the watcher this blocks until it completes.
+    The watchers start id is set to its checkpoint so that starting it again
+    resumes where the hub left off.
+
+    Returns True if the watcher was removed.
+
+    Args:
+      * (SgEventWatcher) sgEventWatcher:
+        Watcher to remove.
+    '''
+
+    with self:
+      if not sgEventWatcher in self.__watchers:
+        return False
+
+      watchers = list(self.__watchers)
+
+      watchers.remove(sgEventWatcher)
+
+      self.__watchers = watchers
+
+      while sgEventWatcher in self.__polling:
+        self.__pollCondition.wait()
+
+      self.__releaseWatcher(sgEventWatcher)
+
+    return True
+
+  def __releaseWatcher(self, sgEventWatcher):
+    lastId = self.__checkpoints.pop(sgEventWatcher, None)
+
+    sgEventWatcher._setHub(None)
+
+    if lastId != None:
+      sgEventWatcher.setBeginProcessingAt(lastId + 1)
+
+  def setUpdateInterval(self, secs):
+    '''
+    Sets the update interval that Shotgun will be queried for new events.
+
+    Args:
+      * (int) secs:
+        Interval in seconds.
+    '''
+
+    secs = int(secs)
+
+    if secs < self.UPDATE_INTERVAL_MIN:
+      secs = self.UPDATE_INTERVAL_MIN
+
+    self.__updateInterval = secs
+
+  def start(self):
+    '''
+    Starts the hub, if already started returns immediately.
+    '''
+
+    with self:
+      if self.isRunning():
+        return
+
+      self.logger().debug('hub start')
+
+      self.__aborted = False
+      self.__running = True
+
+      self.__event.clear()
+
+      self.__jobQueue = Queue.Queue()
+
+      self.__workerThreads = []
+
+      for i in range(self.__maxWorkers):
+        thread = threading.Thread(
+          name='%s worker %d' % (self.__repr__(), i),
+          target=SgEventWatcherHubWorker,
+          args=[self, self.__jobQueue]
+        )
+
+        thread.setDaemon(True)
+
+        self.__workerThreads.append(thread)
+
+      self.__schedulerThread = threading.Thread(
+        name=self.__repr__(),
+        target=SgEventWatcherHubScheduler,
+        args=[self, self.__event]
+      )
+
+      self.__schedulerThread.setDaemon(True)
+
+      for thread in self.__workerThreads:
+        thread.start()
+
+      self.__schedulerThread.start()
+
+  def stop(self):
+    '''
+    Stops the hub, if not running returns immediately.
+
+    Each watchers start id is set to its checkpoint so the hub or the watcher
+    itself can be started again without re-processing events.
+    '''
+
+    with self:
+      if not self.isRunning():
+        return
+
+      self.logger().debug('hub stop')
+
+      self.__aborted = True
+
+      self.__event.set()
+
+      scheduler = self.__schedulerThread
+      workers = self.__workerThreads
+
+    scheduler.join()
+
+    for thread in workers:
+      self.__jobQueue.put(None)
+
+    for thread in workers:
+      thread.join()
+
+    with self:
+      for watcher, lastId in self.__checkpoints.items():
+        if lastId != None:
+          watcher.setBeginProcessingAt(lastId + 1)
+
+      self.__checkpoints = {}
+      self.__polling = set()
+
+      self.__schedulerThread = None
+      self.__workerThreads = []
+      self.__jobQueue = None
+
+      self.__running = False
+
+  def updateInterval(self):
+    '''
+    Returns the update interval that Shotgun will be queried for new events.
+
+    Value is in seconds.
+    '''
+
+    return self.__updateInterval
+
+  def watchers(self):
+    '''
+    Returns a list of the SgEventWatchers the hub contains.
+    '''
+
+    return list(self.__watchers)
+
+def SgEventWatcherHubScheduler(hub, event):
+  '''
+  Scheduler thread used by SgEventWatcherHub to queue polls.
+  '''
+
+  while True:
+    event.wait(hub.updateInterval())
+
+    if hub.aborted():
+      return
+
+    hub._schedule()
+
+def SgEventWatcherHubWorker(hub, jobQueue):
+  '''
+  Worker thread used by SgEventWatcherHub to poll Shotgun for events.
+  '''
+
+  while True:
+    group = jobQueue.get()
+
+    if group == None or hub.aborted():
+      return
+
+    try:
+      hub._pollGroup(group)
+    except Exception, e:
+      hub.logger().error(str(e))
+    finally:
+      del group
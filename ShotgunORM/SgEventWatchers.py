@@ -34,9 +34,12 @@ __all__ = [
 ]
 
 # Python imports
+import calendar
 import os
 import socket
 import sys
+import threading
+import time
 
 # This module imports
 import ShotgunORM
@@ -113,12 +116,238 @@ class SgEntryTypeEventHandler(ShotgunORM.SgEventHandler):
 
     self.addFilter(SgTypeFilter(sgEventTypes))
 
+class DummyStream(object):
+  @staticmethod
+  def write(msg):
+    pass
+
+class SgEventBufferedWriter(object):
+  '''
+  Buffers messages written by event handlers and writes them in large chunks.
+
+  The buffer is written once it holds bufferSize bytes or flushInterval seconds
+  have passed since the last write.  In background mode the chunks are written
+  by a dedicated thread so slow I/O never blocks the event watcher, writers
+  block only when more than 4 x bufferSize bytes are pending.
+  '''
+
+  def __init__(
+    self,
+    writeFunc,
+    flushFunc,
+    bufferSize=65536,
+    flushInterval=None,
+    background=False
+  ):
+    self.__writeFunc = writeFunc
+    self.__flushFunc = flushFunc
+    self.__bufferSize = max(1, int(bufferSize))
+    self.__flushInterval = flushInterval
+    self.__background = bool(background)
+
+    self.__ioLock = threading.Lock()
+    self.__condition = threading.Condition(threading.Lock())
+
+    self.__buffer = []
+    self.__bufferBytes = 0
+    self.__lastWrite = time.time()
+    self.__flushRequests = 0
+    self.__flushes = 0
+    self.__closing = False
+
+    self.__thread = None
+
+    if self.__background:
+      self.__thread = threading.Thread(
+        name='<SgEventBufferedWriter>',
+        target=self.__run
+      )
+
+      self.__thread.setDaemon(True)
+
+      self.__thread.start()
+
+  def __drain(self, buffer):
+    if len(buffer) <= 0:
+      return
+
+    with self.__ioLock:
+      self.__writeFunc(''.join(buffer))
+      self.__flushFunc()
+
+  def __run(self):
+    condition = self.__condition
+
+    while True:
+      with condition:
+        while (
+          not self.__closing and
+          self.__flushRequests == self.__flushes and
+          self.__bufferBytes < self.__bufferSize
+        ):
+          if self.__flushInterval == None:
+            condition.wait()
+          else:
+            remaining = self.__lastWrite + self.__flushInterval - time.time()
+
+            if remaining <= 0:
+              if self.__bufferBytes > 0:
+                break
+
+              self.__lastWrite = time.time()
+
+              remaining = self.__flushInterval
+
+            condition.wait(remaining)
+
+        buffer = self.__buffer
+        closing = self.__closing
+        flushRequests = self.__flushRequests
+
+        self.__buffer = []
+        self.__bufferBytes = 0
+        self.__lastWrite = time.time()
+
+        condition.notifyAll()
+
+      try:
+        self.__drain(buffer)
+      except Exception, e:
+        ShotgunORM.LoggerEventWatcher.error(str(e))
+
+      with condition:
+        self.__flushes = flushRequests
+
+        condition.notifyAll()
+
+      if closing:
+        return
+
+  def close(self):
+    '''
+    Writes any buffered messages and stops the background thread.
+    '''
+
+    if self.__thread == None:
+      self.flush()
+
+      return
+
+    with self.__condition:
+      self.__closing = True
+
+      self.__condition.notifyAll()
+
+    self.__thread.join()
+
+    self.__thread = None
+
+  def flush(self):
+    '''
+    Writes any buffered messages, in background mode this blocks until the
+    background thread has written them.
+    '''
+
+    if self.__thread == None:
+      with self.__condition:
+        buffer = self.__buffer
+
+        self.__buffer = []
+        self.__bufferBytes = 0
+        self.__lastWrite = time.time()
+
+      self.__drain(buffer)
+
+      return
+
+    with self.__condition:
+      self.__flushRequests += 1
+
+      request = self.__flushRequests
+
+      self.__condition.notifyAll()
+
+      while self.__flushes < request and self.__thread.isAlive():
+        self.__condition.wait(1.0)
+
+  def isBackground(self):
+    '''
+    Returns True if messages are written by a background thread.
+    '''
+
+    return self.__background
+
+  def write(self, msg):
+    '''
+    Buffers the message.
+
+    Args:
+      * (str) msg:
+        Message to write.
+    '''
+
+    buffer = None
+
+    with self.__condition:
+      if self.__thread != None:
+        while (
+          self.__bufferBytes >= self.__bufferSize * 4 and
+          self.__thread.isAlive()
+        ):
+          self.__condition.wait(1.0)
+
+      self.__buffer.append(msg)
+      self.__bufferBytes += len(msg)
+
+      ready = (
+        self.__bufferBytes >= self.__bufferSize or (
+          self.__flushInterval != None and
+          time.time() - self.__lastWrite >= self.__flushInterval
+        )
+      )
+
+      if ready:
+        if self.__thread != None:
+          self.__condition.notifyAll()
+        else:
+          buffer = self.__buffer
+
+          self.__buffer = []
+          self.__bufferBytes = 0
+          self.__lastWrite = time.time()
+
+    if buffer != None:
+      self.__drain(buffer)
+
 class SgStreamEventHandler(ShotgunORM.SgEventHandler):
   '''
   Event handler class that sends events to an ostream.
+
+  By default every message is written to the stream as soon as the event is
+  processed.  Setting bufferSize enables buffered mode where messages are
+  written in chunks, see SgEventBufferedWriter.
+
+  Args:
+    * (stream) stream:
+      Stream messages are written to, defaults to sys.stdout.
+
+    * (int) bufferSize:
+      Bytes buffered before they are written, 0 disables buffering.
+
+    * (float) flushInterval:
+      Max seconds messages stay in the buffer.
+
+    * (bool) background:
+      Write buffered messages from a background thread.
   '''
 
-  def __init__(self, stream=None):
+  def __init__(
+    self,
+    stream=None,
+    bufferSize=0,
+    flushInterval=None,
+    background=False
+  ):
     super(SgStreamEventHandler, self).__init__()
 
     if stream == None:
@@ -126,17 +355,59 @@ class SgStreamEventHandler(ShotgunORM.SgEventHandler):
 
     self._stream = stream
 
+    self.__writer = None
+
+    if bufferSize > 0 or background:
+      self.__writer = SgEventBufferedWriter(
+        self._write,
+        self._flushStream,
+        bufferSize or 65536,
+        flushInterval,
+        background
+      )
+
+  def _flushStream(self):
+    '''
+    Subclass portion of flush().
+
+    Flushes the stream if it has a "flush" attribute.
+    '''
+
+    if hasattr(self._stream, 'flush'):
+      self._stream.flush()
+
+  def _write(self, data):
+    '''
+    Subclass portion of writeMessage().
+
+    Writes the data to the stream, in buffered mode data contains multiple
+    messages.
+    '''
+
+    self._stream.write(data)
+
+  def close(self):
+    '''
+    Writes any buffered messages and stops the background writer.
+    '''
+
+    if self.__writer != None:
+      self.__writer.close()
+
+    super(SgStreamEventHandler, self).close()
+
   def flush(self):
     '''
     Flush the handlers stream.
 
-    This function looks for an attribute on the stream called "flush" and if it
-    exists calls it.
+    In buffered mode any buffered messages are written first.
     '''
 
-    with self:
-      if hasattr(self._stream, 'flush'):
-        self._stream.flush()
+    if self.__writer != None:
+      self.__writer.flush()
+    else:
+      with self:
+        self._flushStream()
 
   def formatMessage(self, sgEvent):
     '''
@@ -155,6 +426,13 @@ class SgStreamEventHandler(ShotgunORM.SgEventHandler):
       ) + '\n'
     )
 
+  def isBuffered(self):
+    '''
+    Returns True if the handler buffers messages.
+    '''
+
+    return self.__writer != None
+
   def processEvent(self, sgEvent):
     '''
     Processes the event and writes a formatted string to the handlers stream.
@@ -175,39 +453,184 @@ class SgStreamEventHandler(ShotgunORM.SgEventHandler):
         Message to write.
     '''
 
-    try:
-      self._stream.write(msg)
-    except (KeyboardInterrupt, SystemExit):
-      raise
-    except:
-      raise
-
-class DummyStream(object):
-  @staticmethod
-  def write(msg):
-    pass
+    if self.__writer != None:
+      self.__writer.write(msg)
+    else:
+      self._write(msg)
 
 class SgFileEventHandler(SgStreamEventHandler):
   '''
   Event handler class that writes events to files.
+
+  Files can be gzip or bzip2 compressed, see ShotgunORM.openFile().  When
+  maxBytes is set the file is rotated once that many bytes have been written,
+  rotated files are named "name.1.ext" through "name.<backupCount>.ext".
+
+  Note:
+    For compressed files maxBytes counts the uncompressed bytes written by the
+    handler, a file that is appended to starts from its size on disk.
+
+  Args:
+    * (str) filename:
+      File events are written to.
+
+    * (str) mode:
+      Mode the file is opened with, when None the file is appended to.  Bzip2
+      files can not be appended to and are overwritten instead.
+
+    * (bool) delay:
+      Open the file when the first message is written.
+
+    * (int) bufferSize:
+      See SgStreamEventHandler.
+
+    * (float) flushInterval:
+      See SgStreamEventHandler.
+
+    * (bool) background:
+      See SgStreamEventHandler.
+
+    * (str) compression:
+      "gzip", "bz2" or "none", when None the filename extension is used.
+
+    * (int) maxBytes:
+      Bytes written before the file is rotated, 0 disables rotation.
+
+    * (int) backupCount:
+      Number of rotated files kept.
   '''
 
-  def __init__(self, filename, mode='a', delay=True):
+  COMPRESSION_EXTENSIONS = ('.gz', '.bz2')
+
+  def __init__(
+    self,
+    filename,
+    mode=None,
+    delay=True,
+    bufferSize=0,
+    flushInterval=None,
+    background=False,
+    compression=None,
+    maxBytes=0,
+    backupCount=0
+  ):
+    isBz2 = compression == 'bz2' or (
+      compression == None and filename.endswith('.bz2')
+    )
+
+    if mode == None:
+      if isBz2:
+        mode = 'w'
+      else:
+        mode = 'a'
+    elif isBz2 and 'a' in mode:
+      raise ValueError('bz2 file "%s" can not be opened for append' % filename)
+
     self.__filename = filename
     self.__filenameAbs = os.path.abspath(filename)
     self.__mode = mode
+    self.__compression = compression
+    self.__maxBytes = int(maxBytes)
+    self.__backupCount = int(backupCount)
+    self.__bytesWritten = 0
+
+    if compression == None:
+      if filename.endswith(self.COMPRESSION_EXTENSIONS):
+        compression = 'compressed'
+      else:
+        compression = 'none'
+
+    if compression != 'none' and not 'b' in self.__mode:
+      self.__mode += 'b'
+
+    super(SgFileEventHandler, self).__init__(
+      DummyStream,
+      bufferSize,
+      flushInterval,
+      background
+    )
 
-    if bool(delay):
-      super(SgFileEventHandler, self).__init__(DummyStream)
-    else:
-      super(SgFileEventHandler, self).__init__(self._open())
+    if not bool(delay):
+      self._stream = self._open()
 
   def _open(self):
     '''
     Open the file and return its object.
     '''
 
-    return open(self.__filename, self.__mode)
+    self.__bytesWritten = 0
+
+    if self.__mode.startswith('a') and os.path.exists(self.__filenameAbs):
+      self.__bytesWritten = os.path.getsize(self.__filenameAbs)
+
+    return ShotgunORM.openFile(
+      self.__filenameAbs,
+      self.__mode,
+      self.__compression
+    )
+
+  def _rotate(self):
+    '''
+    Closes the current file, renames it and its backups and opens a new file.
+    '''
+
+    if self._stream != DummyStream:
+      self._stream.close()
+
+      self._stream = DummyStream
+
+    if self.__backupCount > 0:
+      base = self.__filenameAbs
+      ext = ''
+
+      for i in self.COMPRESSION_EXTENSIONS:
+        if base.endswith(i):
+          base = base[:-len(i)]
+          ext = i
+
+          break
+
+      for i in range(self.__backupCount - 1, 0, -1):
+        src = '%s.%d%s' % (base, i, ext)
+
+        if os.path.exists(src):
+          dst = '%s.%d%s' % (base, i + 1, ext)
+
+          if os.path.exists(dst):
+            os.remove(dst)
+
+          os.rename(src, dst)
+
+      dst = '%s.1%s' % (base, ext)
+
+      if os.path.exists(dst):
+        os.remove(dst)
+
+      if os.path.exists(self.__filenameAbs):
+        os.rename(self.__filenameAbs, dst)
+    elif os.path.exists(self.__filenameAbs):
+      os.remove(self.__filenameAbs)
+
+    self._stream = self._open()
+
+  def _write(self, data):
+    '''
+    Writes the data to the file, opening and rotating it as needed.
+    '''
+
+    if self._stream == DummyStream:
+      self._stream = self._open()
+
+    if (
+      self.__maxBytes > 0 and
+      self.__bytesWritten > 0 and
+      self.__bytesWritten + len(data) > self.__maxBytes
+    ):
+      self._rotate()
+
+    self._stream.write(data)
+
+    self.__bytesWritten += len(data)
 
   def close(self):
     '''
@@ -217,17 +640,17 @@ class SgFileEventHandler(SgStreamEventHandler):
     immediately.
     '''
 
+    super(SgFileEventHandler, self).close()
+
     with self:
       if self._stream != DummyStream:
-        self.flush()
+        self._flushStream()
 
         if hasattr(self._stream, 'close'):
           self._stream.close()
 
         self._stream = DummyStream
 
-      super(SgFileEventHandler, self).close()
-
   def filename(self):
     '''
     Returns the filename the handler is outputting events to.
@@ -242,27 +665,113 @@ class SgFileEventHandler(SgStreamEventHandler):
 
     return self.__mode
 
-  def processEvent(self, sgEvent):
-    '''
-    Processes the event and writes a formatted string to the handlers stream.
-
-    Args:
-      * (SgEvent) sgEvent:
-        Event to process.
-    '''
-
-    self.writeMessage(self, self.formatMessage(sgEvent))
-
 class SgUDPBroadcastEventHandler(ShotgunORM.SgEventHandler):
   '''
   Event handler class that broadcasts UDP messages.
+
+  By default a datagram is sent for every event.  In coalescing mode events
+  are packed into datagrams of at most maxDatagramSize bytes, each datagram is
+  made up of newline separated lines:
+
+    sgorm seq=<sequence> count=<events> url=<url>
+    <id> <event_type> <created_at unix time>
+    ...
+
+  Sequence numbers increase by one per datagram so listeners can detect
+  dropped datagrams.  Partially filled datagrams are sent when the watcher
+  finishes processing a batch or flush() is called.
+
+  Args:
+    * (int) port:
+      Port messages are broadcast on.
+
+    * (bool) coalesce:
+      Pack multiple events into each datagram.
+
+    * (int) maxDatagramSize:
+      Max datagram size in bytes when coalescing, defaults to a size that fits
+      a standard ethernet MTU.
+
+    * (float) maxDatagramsPerSecond:
+      Rate limit, sending blocks until the rate allows it.  None disables the
+      limit.
   '''
 
-  def __init__(self, port=7479):
+  COALESCE_HEADER = 'sgorm'
+
+  MAX_DATAGRAM_SIZE = 1400
+
+  def __init__(
+    self,
+    port=7479,
+    coalesce=False,
+    maxDatagramSize=MAX_DATAGRAM_SIZE,
+    maxDatagramsPerSecond=None
+  ):
     super(SgUDPBroadcastEventHandler, self).__init__()
     self.__socket = self.createSocket()
     self.__port = int(port)
 
+    self.__coalesce = bool(coalesce)
+    self.__maxDatagramSize = int(maxDatagramSize)
+    self.__pending = []
+    self.__pendingBytes = 0
+    self.__pendingUrl = None
+    self.__sequence = 0
+
+    self.__rate = None
+    self.__tokens = 0.0
+    self.__tokensUpdated = time.time()
+
+    if maxDatagramsPerSecond != None:
+      self.__rate = float(maxDatagramsPerSecond)
+      self.__tokens = self.__rate
+
+  def __sendPending(self):
+    if len(self.__pending) <= 0:
+      return
+
+    header = '%s seq=%d count=%d url=%s' % (
+      self.COALESCE_HEADER,
+      self.__sequence,
+      len(self.__pending),
+      self.__pendingUrl
+    )
+
+    self.__sequence = (self.__sequence + 1) % 4294967296
+
+    lines = self.__pending
+
+    self.__pending = []
+    self.__pendingBytes = 0
+
+    self.sendMessage(header + '\n' + '\n'.join(lines))
+
+  def __throttle(self):
+    now = time.time()
+
+    self.__tokens = min(
+      self.__rate,
+      self.__tokens + (now - self.__tokensUpdated) * self.__rate
+    )
+
+    self.__tokensUpdated = now
+
+    if self.__tokens < 1.0:
+      time.sleep((1.0 - self.__tokens) / self.__rate)
+
+      self.__tokens = 1.0
+      self.__tokensUpdated = time.time()
+
+    self.__tokens -= 1.0
+
+  def batchFinished(self):
+    '''
+    Sends any partially filled coalesced datagram.
+    '''
+
+    self.flush()
+
   def createSocket(self):
     '''
     Creates and returns a new socket object to be used by the handler.
@@ -278,6 +787,37 @@ class SgUDPBroadcastEventHandler(ShotgunORM.SgEventHandler):
 
     return s
 
+  def flush(self):
+    '''
+    Sends any partially filled coalesced datagram.
+    '''
+
+    with self:
+      self.__sendPending()
+
+  def formatCoalescedMessage(self, sgEvent):
+    '''
+    Returns the line used for the event in coalesced datagrams.
+
+    Subclasses can override this function to return custom lines, lines must
+    not contain newlines.
+
+    Args:
+      * (SgEvent) sgEvent:
+        Event to build the line for.
+    '''
+
+    event = sgEvent.event()
+
+    createdAt = event['created_at']
+
+    if createdAt.utcoffset() == None:
+      createdAt = int(time.mktime(createdAt.timetuple()))
+    else:
+      createdAt = calendar.timegm(createdAt.utctimetuple())
+
+    return '%d %s %d' % (event['id'], event['event_type'], createdAt)
+
   def formatMessage(self, sgEvent):
     '''
     Returns a formatted string for the event.
@@ -306,6 +846,20 @@ class SgUDPBroadcastEventHandler(ShotgunORM.SgEventHandler):
 
     return msg
 
+  def isCoalescing(self):
+    '''
+    Returns True if multiple events are packed into each datagram.
+    '''
+
+    return self.__coalesce
+
+  def maxDatagramSize(self):
+    '''
+    Returns the max size of coalesced datagrams.
+    '''
+
+    return self.__maxDatagramSize
+
   def port(self):
     '''
     Returns the port number the handler will use for broadcasting messages.
@@ -322,7 +876,31 @@ class SgUDPBroadcastEventHandler(ShotgunORM.SgEventHandler):
         Event to process.
     '''
 
-    self.sendMessage(self.formatMessage(sgEvent))
+    if not self.__coalesce:
+      self.sendMessage(self.formatMessage(sgEvent))
+
+      return
+
+    url = sgEvent.eventWatcher().connection().url()
+
+    if len(self.__pending) > 0 and url != self.__pendingUrl:
+      self.__sendPending()
+
+    line = self.formatCoalescedMessage(sgEvent)
+
+    # Header size is estimated generously, sequence and count are at most 10
+    # digits each.
+    headerSize = len(self.COALESCE_HEADER) + len(url) + 35
+
+    if (
+      len(self.__pending) > 0 and
+      headerSize + self.__pendingBytes + len(line) + 1 > self.__maxDatagramSize
+    ):
+      self.__sendPending()
+
+    self.__pendingUrl = url
+    self.__pending.append(line)
+    self.__pendingBytes += len(line) + 1
 
   def sendMessage(self, msg):
     '''
@@ -333,11 +911,21 @@ class SgUDPBroadcastEventHandler(ShotgunORM.SgEventHandler):
         Message to send.
     '''
 
+    if self.__rate != None:
+      self.__throttle()
+
     self.__socket.sendto(
       msg,
       ('<broadcast>', self.__port)
     )
 
+  def sequence(self):
+    '''
+    Returns the sequence number of the next coalesced datagram.
+    '''
+
+    return self.__sequence
+
   def socket(self):
     '''
     Returns the socket the handler uses for broadcasting messages.
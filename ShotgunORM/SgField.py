@@ -31,9 +31,16 @@ __all__ = [
 ]
 
 # Python imports
+import atexit
+import collections
 import copy
+import json
+import os
 import string
+import tempfile
 import threading
+import time
+import traceback
 import weakref
 
 from xml.etree import ElementTree as ET
@@ -41,6 +48,29 @@ from xml.etree import ElementTree as ET
 # This module imports
 import ShotgunORM
 
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+
+def sgorm_field_profiler_atexit():
+  config = ShotgunORM.config
+
+  if (
+    not config.ENABLE_FIELD_QUERY_PROFILING or
+    config.FIELD_QUERY_PROFILE_FILE in [None, '']
+  ):
+    return
+
+  try:
+    SgField.__profiler__.save(config.FIELD_QUERY_PROFILE_FILE)
+  except Exception, e:
+    ShotgunORM.LoggerField.error(
+      'unable to save field query profiles to "%s", %s' % (
+        config.FIELD_QUERY_PROFILE_FILE,
+        e
+      )
+    )
+
+atexit.register(sgorm_field_profiler_atexit)
+
 # Set later in this file.
 FIELD_RETURN_TYPES = {}
 
@@ -50,11 +80,148 @@ FIELD_RETURN_TYPE_NAMES = {}
 class SgFieldQueryProfiler(object):
   '''
   Field profiler.
+
+  Besides counting SgField.value() calls the profiler detects N+1 query
+  patterns, repeated single Entity field pulls of the same Entity type and
+  fields within a short time window.  This is usually the result of accessing
+  an Entity field inside of a loop, a warning is logged with the call-site
+  stack suggesting the fields be prefetched.
+
+  Recorded profiles can be saved and loaded so they accumulate across runs and
+  turned into query templates with applyQueryTemplates().  Applying them to
+  the template a connection uses makes find() with fields=None prefetch the
+  fields the tool actually reads instead of lazily pulling them afterwards.
   '''
 
   def __init__(self):
+    self.__lock = threading.Lock()
+
     self._fieldProfiles = {}
 
+    # (url, entity type, fields) -> deque of pull times
+    self._pulls = {}
+
+    # (url, entity type, fields, filename, line number) -> detection dict
+    self._detections = {}
+
+  def _callSite(self):
+    '''
+    Internal function!
+
+    Returns the stack up to and including the first frame outside of the
+    ShotgunORM package.
+    '''
+
+    stack = traceback.extract_stack()[:-1]
+
+    for i in xrange(len(stack) - 1, -1, -1):
+      if not os.path.abspath(stack[i][0]).startswith(_PACKAGE_DIR):
+        return stack[:i + 1]
+
+    return stack
+
+  def applyQueryTemplates(self, sgQueryTemplate=None, url=None, minCount=None):
+    '''
+    Registers the suggested query fields with SgSchema so they are used as the
+    default query fields of sgQueryTemplate.
+
+    The suggested fields are merged with the fields already registered for the
+    template so hand maintained templates are only ever extended.
+
+    Returns a dict of Entity type keys and the list of fields registered for
+    them.
+
+    Args:
+      * (str) sgQueryTemplate:
+        Name of the query template, defaults to
+        config.FIELD_QUERY_PROFILE_TEMPLATE.
+
+      * (str) url:
+        Only use the profiles of the specified url.
+
+      * (int) minCount:
+        See suggestedQueryFields().
+    '''
+
+    if sgQueryTemplate == None:
+      sgQueryTemplate = ShotgunORM.config.FIELD_QUERY_PROFILE_TEMPLATE
+
+    result = {}
+
+    for entityType, fields in self.suggestedQueryFields(url, minCount).items():
+      fields = set(fields)
+
+      fields.update(
+        ShotgunORM.SgSchema.defaultEntityQueryFields(
+          sgQueryTemplate,
+          entityType,
+          None
+        )
+      )
+
+      ShotgunORM.SgSchema.registerDefaultQueryFields(
+        entityType,
+        sgQueryTemplate,
+        fields
+      )
+
+      result[entityType] = sorted(fields)
+
+    ShotgunORM.LoggerField.debug(
+      'applied field query profiles to template "%(template)s": %(fields)s',
+      {
+        'template': sgQueryTemplate,
+        'fields': result
+      }
+    )
+
+    return result
+
+  def detections(self):
+    '''
+    Returns a list of the N+1 query patterns that have been detected.
+
+    Each item is a dict containing the keys "url", "entity_type", "fields",
+    "filename", "line", "count" and "stack".
+    '''
+
+    with self.__lock:
+      return [dict(x) for x in self._detections.values()]
+
+  def load(self, filename, merge=True):
+    '''
+    Loads the field profiles saved by save().
+
+    Args:
+      * (str) filename:
+        Profile file.
+
+      * (bool) merge:
+        When True the counts of the file are added to the current profiles
+        otherwise they replace them.
+    '''
+
+    with open(filename, 'r') as fh:
+      data = json.load(fh)
+
+    if not isinstance(data, dict):
+      raise ValueError('invalid field query profile file "%s"' % filename)
+
+    with self.__lock:
+      if not merge:
+        self._fieldProfiles = {}
+
+      for url, entityTypes in data.items():
+        urlProfiles = self._fieldProfiles.setdefault(str(url).lower(), {})
+
+        for entityType, fields in entityTypes.items():
+          typeProfiles = urlProfiles.setdefault(str(entityType), {})
+
+          for field, count in fields.items():
+            field = str(field)
+
+            typeProfiles[field] = typeProfiles.get(field, 0) + int(count)
+
   def profile(self, sgField):
     if not ShotgunORM.config.ENABLE_FIELD_QUERY_PROFILING:
       return
@@ -69,25 +236,209 @@ class SgFieldQueryProfiler(object):
 
     field = sgField.name()
 
-    if not self._fieldProfiles.has_key(url):
-      data = {
-        entityType: {
+    with self.__lock:
+      if not self._fieldProfiles.has_key(url):
+        data = {
+          entityType: {
+            field: 1
+          }
+        }
+
+        self._fieldProfiles[url] = data
+      elif not self._fieldProfiles[url].has_key(entityType):
+        self._fieldProfiles[url][entityType] = {
           field: 1
         }
+      elif not self._fieldProfiles[url][entityType].has_key(field):
+        self._fieldProfiles[url][entityType][field] = 1
+      else:
+        self._fieldProfiles[url][entityType][field] += 1
+
+  def profiles(self):
+    '''
+    Returns a copy of the recorded field profiles.
+
+    The dict is keyed by url, Entity type and field name with the number of
+    times the field was accessed as the value.
+    '''
+
+    with self.__lock:
+      result = {}
+
+      for url, entityTypes in self._fieldProfiles.items():
+        result[url] = {}
+
+        for entityType, fields in entityTypes.items():
+          result[url][entityType] = dict(fields)
+
+      return result
+
+  def profilePull(self, sgEntity, sgFields):
+    '''
+    Called by SgEntity.valuesSg() before it queries Shotgun for the fields of
+    a single Entity.
+
+    Args:
+      * (SgEntity) sgEntity:
+        Entity pulling its fields.
+
+      * (list) sgFields:
+        Names of the fields being pulled.
+    '''
+
+    config = ShotgunORM.config
+
+    if not config.ENABLE_N_PLUS_ONE_DETECTION:
+      return
+
+    now = time.time()
+
+    url = sgEntity.connection().url().lower()
+    fields = tuple(sorted(sgFields))
+
+    key = (url, sgEntity.type, fields)
+
+    with self.__lock:
+      try:
+        pulls = self._pulls[key]
+      except KeyError:
+        pulls = collections.deque()
+
+        self._pulls[key] = pulls
+
+      pulls.append(now)
+
+      windowStart = now - config.N_PLUS_ONE_WINDOW
+
+      while pulls[0] < windowStart:
+        pulls.popleft()
+
+      if len(pulls) < config.N_PLUS_ONE_THRESHOLD:
+        return
+
+      count = len(pulls)
+
+      pulls.clear()
+
+    stack = self._callSite()
+
+    filename, line = stack[-1][:2]
+
+    detectionKey = key + (filename, line)
+
+    with self.__lock:
+      detection = self._detections.get(detectionKey, None)
+
+      if detection != None:
+        detection['count'] += count
+
+        return
+
+      self._detections[detectionKey] = {
+        'url': url,
+        'entity_type': sgEntity.type,
+        'fields': list(fields),
+        'filename': filename,
+        'line': line,
+        'count': count,
+        'stack': stack
       }
 
-      self._fieldProfiles[url] = data
-    elif not self._fieldProfiles[url].has_key(entityType):
-      self._fieldProfiles[url][entityType] = {
-        field: 1
+    ShotgunORM.LoggerField.warn(
+      'possible N+1 query: %(count)d single Entity pulls of %(entityType)s '
+      'fields %(fields)s within %(window)ss at %(filename)s:%(line)d, prefetch '
+      'the fields with connection.find("%(entityType)s", filters, fields=%(fields)s) '
+      'or entity.sync(%(fields)s) before the loop.\n%(stack)s' % {
+        'count': count,
+        'entityType': sgEntity.type,
+        'fields': list(fields),
+        'window': config.N_PLUS_ONE_WINDOW,
+        'filename': filename,
+        'line': line,
+        'stack': ''.join(traceback.format_list(stack)).rstrip()
       }
-    elif not self._fieldProfiles[url][entityType].has_key(field):
-      self._fieldProfiles[url][entityType][field] = 1
-    else:
-      self._fieldProfiles[url][entityType][field] += 1
+    )
 
   def reset(self):
-    self._fieldProfiles = {}
+    with self.__lock:
+      self._fieldProfiles = {}
+      self._pulls = {}
+      self._detections = {}
+
+  def save(self, filename):
+    '''
+    Saves the field profiles to filename as JSON.
+
+    The file is replaced atomically.
+
+    Args:
+      * (str) filename:
+        Profile file.
+    '''
+
+    filename = os.path.abspath(filename)
+
+    data = json.dumps(self.profiles(), indent=2, sort_keys=True)
+
+    fd, tmpName = tempfile.mkstemp(
+      prefix='.%s.' % os.path.basename(filename),
+      dir=os.path.dirname(filename)
+    )
+
+    try:
+      with os.fdopen(fd, 'w') as fh:
+        fh.write(data)
+
+      os.chmod(tmpName, 0644)
+
+      os.rename(tmpName, filename)
+    except:
+      try:
+        os.remove(tmpName)
+      except OSError:
+        pass
+
+      raise
+
+  def suggestedQueryFields(self, url=None, minCount=None):
+    '''
+    Returns a dict of Entity type keys and the sorted list of fields that were
+    accessed at least minCount times.
+
+    Args:
+      * (str) url:
+        Only use the profiles of the specified url, by default the profiles of
+        all urls are combined.
+
+      * (int) minCount:
+        Minimum access count of a field, defaults to
+        config.FIELD_QUERY_PROFILE_MIN_COUNT.
+    '''
+
+    if minCount == None:
+      minCount = ShotgunORM.config.FIELD_QUERY_PROFILE_MIN_COUNT
+
+    counts = {}
+
+    for profileUrl, entityTypes in self.profiles().items():
+      if url != None and profileUrl != url.lower():
+        continue
+
+      for entityType, fields in entityTypes.items():
+        typeCounts = counts.setdefault(entityType, {})
+
+        for field, count in fields.items():
+          typeCounts[field] = typeCounts.get(field, 0) + count
+
+    result = {}
+
+    for entityType, fields in counts.items():
+      fields = sorted([x for x, c in fields.items() if c >= minCount])
+
+      if len(fields) >= 1:
+        result[entityType] = fields
+
+    return result
 
 class SgFieldSchemaInfo(object):
   '''
@@ -663,6 +1014,8 @@ class SgField(object):
     self.__isCommitting = False
     self.__isUpdatingEvent = threading.Event(verbose=True)
 
+    self.__undoValue = None
+
     self.__isUpdatingEvent.set()
 
     self._value = None
@@ -846,7 +1199,7 @@ class SgField(object):
 
   def eventLogs(self, sgEventType=None, sgFields=None, sgRecordLimit=0):
     '''
-    Returns the event log Entities for the field.
+    Returns the event logs for the field as read-only SgEventLogEntry objects.
 
     When the field has no parent or the parent Entity does not yet exist in
     Shotgun an empty list is returned.
@@ -883,8 +1236,7 @@ class SgField(object):
         ]
       )
 
-    result = self.parentEntity().connection().find(
-      'EventLogEntry',
+    result = self.parentEntity().connection().findEventLogEntries(
       filters,
       sgFields,
       order=order,
@@ -934,6 +1286,8 @@ class SgField(object):
       if not ShotgunORM.config.DISABLE_FIELD_VALIDATE_ON_SET_VALUE:
         self.validate(forReal=True)
 
+      self._storeUndoValue()
+
       result = self._fromFieldData(sgData, None)
 
       if not result:
@@ -976,6 +1330,16 @@ class SgField(object):
 
     return self.__hasSyncUpdate
 
+  def hasUndoValue(self):
+    '''
+    Returns True if the field stored its value before it was modified.
+
+    Undo values are only stored while the field has a pending commit and the
+    connection has undo enabled.
+    '''
+
+    return self.__undoValue != None
+
   def _invalidate(self):
     '''
     Subclass portion of SgField.invalidate().
@@ -1116,7 +1480,7 @@ class SgField(object):
 
   def lastEventLog(self, sgEventType=None, sgFields=None):
     '''
-    Returns the last event log Entity for this field.
+    Returns the last event log for this field as a SgEventLogEntry.
 
     If no event log exists or the Entity contains no parent or the parent does
     not yet exist in Shotgun None is returned.
@@ -1218,13 +1582,21 @@ class SgField(object):
 
   def modifiedEvents(self, sgFields=None, limit=0):
     '''
+    Returns the change events of the field as read-only SgEventLogEntry
+    objects, newest first.
+
+    Args:
+      * (list) sgFields:
+        List of fields to populate the results with.
 
+      * (int) limit:
+        Limits the amount of returned events.
     '''
 
     parent = self.parentEntity()
 
     if not parent.exists():
-      return None
+      return []
 
     eventType = 'Shotgun_%(type)s_Change' % parent
 
@@ -1381,6 +1753,9 @@ class SgField(object):
 
     self.__hasCommit = bool(valid)
 
+    if not self.__hasCommit:
+      self.__undoValue = None
+
   def setHasSyncUpdate(self, valid):
     '''
     Sets the update state of the field to "valid".
@@ -1395,6 +1770,30 @@ class SgField(object):
 
     self.__hasSyncUpdate = bool(valid)
 
+  def _storeUndoValue(self):
+    '''
+    Internal function!
+
+    Stores the current value of the field as its undo value when the field has
+    no pending commit and the connection has undo enabled.
+    '''
+
+    if self.hasCommit() or not self.isCommittable():
+      return
+
+    parent = self.parentEntity()
+
+    if parent == None:
+      return
+
+    connection = parent.connection()
+
+    if connection == None or not connection.undo().isEnabled():
+      return
+
+    # Wrapped so a previous value of None can be told apart from no value.
+    self.__undoValue = (self.toFieldData(), )
+
   def setIsCommitting(self, valid):
     '''
     Sets the commit state of the field to "valid".
@@ -1483,6 +1882,8 @@ class SgField(object):
       if sgData == None:
         sgData = self.defaultValue()
 
+      self._storeUndoValue()
+
       updateResult = self._setValue(sgData)
 
       if not updateResult:
@@ -1562,6 +1963,18 @@ class SgField(object):
 
     widget.update()
 
+  def undoValue(self):
+    '''
+    Returns the Shotgun formatted value the field had before it was modified.
+
+    Returns None if hasUndoValue() is False.
+    '''
+
+    if self.__undoValue == None:
+      return None
+
+    return self.__undoValue[0]
+
   def _validate(self, forReal=False):
     '''
     Subclass portion of SgField.validate().
@@ -1636,12 +2049,13 @@ class SgField(object):
 
         return False
 
-      ShotgunORM.LoggerField.debug('%(sgField)s.validate(curState=%(state)s, forReal=%(forReal)s, force=%(force)s)', {
-        'sgField': self,
-        'state': self.isValid(),
-        'forReal': forReal,
-        'force': force
-      })
+      if ShotgunORM.LoggerField.isDebugging():
+        ShotgunORM.LoggerField.debug('%(sgField)s.validate(curState=%(state)s, forReal=%(forReal)s, force=%(force)s)', {
+          'sgField': self,
+          'state': self.isValid(),
+          'forReal': forReal,
+          'force': force
+        })
 
       self.__isUpdatingEvent.wait()
 
@@ -51,7 +51,6 @@ import os
 import re
 import threading
 import time
-import urllib2
 import webbrowser
 
 # This module imports
@@ -1083,70 +1082,60 @@ class SgFieldEntityMulti(ShotgunORM.SgField):
     connection = parent.connection()
     schema = connection.schema()
 
-    tmp = []
+    # Resolve the fields to sync once per Entity type.
+    typeSyncFields = {}
 
-    qEng = connection.queryEngine()
+    for t in set([x['type'] for x in result]):
+      iSyncFields = None
 
-    qEng.block()
+      if sgSyncFields != None:
+        if sgSyncFields.has_key(t):
+          iFields = sgSyncFields[t]
 
-    try:
-      for i in result:
-        t = i['type']
-
-        iSyncFields = None
-
-        if sgSyncFields != None:
-          if sgSyncFields.has_key(t):
-            iFields = sgSyncFields[t]
+          if iFields == None:
+            iSyncFields = connection.defaultEntityQueryFields(t)
 
-            if iFields == None:
-              iSyncFields = connection.defaultEntityQueryFields(t)
+            if len(iSyncFields) <= 0:
+              iSyncFields = None
+          else:
+            pullFields = []
 
-              if len(iSyncFields) <= 0:
-                iSyncFields = None
+            if isinstance(iFields, str):
+              pullFields = set([iFields])
             else:
-              pullFields = []
+              pullFields = set(iFields)
 
-              if isinstance(iFields, str):
-                pullFields = set([iFields])
-              else:
-                pullFields = set(iFields)
+            extraFields = []
 
-              extraFields = []
+            if 'all' in pullFields:
+              pullFields.remove('all')
 
-              if 'all' in pullFields:
-                pullFields.remove('all')
+              extraFields = schema.entityInfo(t).fieldNames()
 
-                extraFields = schema.entityInfo(t).fieldNames()
-
-                if 'default' in pullFields:
-                  pullFields.remove('default')
-              elif 'default' in pullFields:
+              if 'default' in pullFields:
                 pullFields.remove('default')
+            elif 'default' in pullFields:
+              pullFields.remove('default')
 
-                extraFields = connection.defaultEntityQueryFields(t)
+              extraFields = connection.defaultEntityQueryFields(t)
 
-              pullFields.update(extraFields)
+            pullFields.update(extraFields)
 
-              if len(pullFields) >= 1:
-                iSyncFields = list(pullFields)
-              else:
-                iSyncFields = None
-          else:
-            iSyncFields = connection.defaultEntityQueryFields(t)
-
-            if len(iSyncFields) <= 0:
+            if len(pullFields) >= 1:
+              iSyncFields = list(pullFields)
+            else:
               iSyncFields = None
         else:
           iSyncFields = connection.defaultEntityQueryFields(t)
 
-        entity = connection._createEntity(t, i, sgSyncFields=iSyncFields)
+          if len(iSyncFields) <= 0:
+            iSyncFields = None
+      else:
+        iSyncFields = connection.defaultEntityQueryFields(t)
 
-        tmp.append(entity)
-    finally:
-      qEng.unblock()
+      typeSyncFields[t] = iSyncFields
 
-    return tmp
+    return connection._createEntities(None, result, typeSyncFields)
 
 class SgFieldFloat(ShotgunORM.SgField):
   '''
@@ -1651,11 +1640,8 @@ class SgFieldSummary(ShotgunORM.SgField):
     #
     ############################################################################
     elif self._summaryType == 'record_count':
-      # Dont use the orm for this search, waste to build the classes when all
-      # we are doing is getting a len on the search result.
-      sgSearch = connection._sg_find(self.entityType(), searchExp)
-
-      result = len(sgSearch)
+      # Let Shotgun do the counting instead of pulling every row.
+      result = connection.count(self.entityType(), searchExp)
     elif self._summaryType == 'count':
       searchExp = {
         'conditions': [
@@ -1670,11 +1656,8 @@ class SgFieldSummary(ShotgunORM.SgField):
         'logical_operator': 'and'
       }
 
-      # Dont use the orm for this search, waste to build the classes when all
-      # we are doing is getting a len on the search result.
-      sgSearch = connection._sg_find(self.entityType(), searchExp, fields=[])
-
-      result = len(sgSearch)
+      # Let Shotgun do the counting instead of pulling every row.
+      result = connection.count(self.entityType(), searchExp)
 
     ############################################################################
     #
@@ -2011,6 +1994,9 @@ class SgFieldImage(SgFieldText):
     if os.path.exists(path) and os.path.isdir(path):
       raise OSError('output path "%s" is a directory' % path)
 
+    # Imported here as urllib2 is slow to import and rarely needed.
+    import urllib2
+
     try:
       data = urllib2.urlopen(url)
 
@@ -36,7 +36,9 @@ __all__ = [
   'LoggerORM',
   'LoggerQueryEngine',
   'LoggerSchema',
-  'LoggerScriptEngine'
+  'LoggerScriptEngine',
+  'isHotPathDebugging',
+  'setHotPathDebugging'
 ]
 
 # Python imports
@@ -55,6 +57,30 @@ LoggerQueryEngine = None
 LoggerSchema = None
 LoggerScriptEngine = None
 
+HOT_PATH_DEBUGGING = True
+
+def isHotPathDebugging():
+  '''
+  Returns True if debug logging is enabled for hot code paths.
+  '''
+
+  return HOT_PATH_DEBUGGING
+
+def setHotPathDebugging(enable):
+  '''
+  Enables or disables debug logging of hot code paths such as Entity creation,
+  find() and field validation.
+
+  When disabled SgLogger.isDebugging() always returns False so those code paths
+  skip building their debug messages regardless of the loggers level.
+
+  See config.ENABLE_HOT_PATH_DEBUG_LOGGING.
+  '''
+
+  global HOT_PATH_DEBUGGING
+
+  HOT_PATH_DEBUGGING = bool(enable)
+
 class SgLogger(logging.Logger):
   '''
   Custom logging.Logger used by the ShotgunORM library.
@@ -98,6 +124,17 @@ class SgLogger(logging.Logger):
 
     self.addHandler(self._logStreamHandler)
 
+  def isDebugging(self):
+    '''
+    Returns True if debug messages of the logger are enabled and hot path debug
+    logging has not been disabled.
+
+    Hot code paths call this once and only build their debug message args when
+    it returns True.
+    '''
+
+    return HOT_PATH_DEBUGGING and self.isEnabledFor(logging.DEBUG)
+
 LoggerAsyncSearchEngine = SgLogger('SgAsyncSearchEngine')
 LoggerCallback = SgLogger('SgCallback')
 LoggerConnection = SgLogger('SgConnection')
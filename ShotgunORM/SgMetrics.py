@@ -0,0 +1,500 @@
+# Copyright (c) 2013, Nathan Dunsworth - NFXPlugins
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the NFXPlugins nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL NFXPLUGINS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+__all__ = [
+  'SgConnectionMetrics',
+  'exportPrometheusMetrics',
+  'prometheusMetrics'
+]
+
+# Python imports
+import os
+import tempfile
+import threading
+import time
+
+# This module imports
+import ShotgunORM
+
+# Upper bounds in seconds of the latency histogram buckets, the last bucket is
+# +Inf.
+LATENCY_BUCKETS = (
+  0.005,
+  0.01,
+  0.025,
+  0.05,
+  0.1,
+  0.25,
+  0.5,
+  1.0,
+  2.5,
+  5.0,
+  10.0,
+  30.0
+)
+
+def _rowCount(result):
+  '''
+  Internal function!
+
+  Returns the number of rows contained in a Shotgun API result.
+  '''
+
+  if result == None:
+    return 0
+  elif isinstance(result, (list, tuple)):
+    return len(result)
+  elif isinstance(result, dict):
+    if result.has_key('matches'):
+      return len(result['matches'])
+    elif result.has_key('groups'):
+      return len(result['groups'])
+    elif result.has_key('type') and result.has_key('id'):
+      return 1
+
+    return len(result)
+
+  return 1
+
+class SgCallMetrics(object):
+  '''
+  Internal!
+
+  Metrics of a single Shotgun API call type.
+  '''
+
+  __slots__ = [
+    'buckets',
+    'count',
+    'errors',
+    'latencyMax',
+    'latencySum',
+    'lockWaitSum',
+    'payloadBytes',
+    'rows'
+  ]
+
+  def __init__(self):
+    self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+    self.count = 0
+    self.errors = 0
+    self.latencyMax = 0.0
+    self.latencySum = 0.0
+    self.lockWaitSum = 0.0
+    self.payloadBytes = 0
+    self.rows = 0
+
+  def toDict(self):
+    cumulative = []
+
+    total = 0
+
+    for le, count in zip(LATENCY_BUCKETS + (float('inf'), ), self.buckets):
+      total += count
+
+      cumulative.append((le, total))
+
+    return {
+      'count': self.count,
+      'errors': self.errors,
+      'latency_buckets': cumulative,
+      'latency_max': self.latencyMax,
+      'latency_sum': self.latencySum,
+      'lock_wait_sum': self.lockWaitSum,
+      'payload_bytes': self.payloadBytes,
+      'rows': self.rows
+    }
+
+class SgConnectionMetrics(object):
+  '''
+  Call count, latency histogram, rows returned, payload size, lock wait time
+  and error metrics for the Shotgun API calls made by a connection.
+
+  Metrics are keyed by the Shotgun API function name, "find", "batch",
+  "schema_read" etc.
+  '''
+
+  def __enter__(self):
+    self.__lock.acquire()
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.__lock.release()
+
+    return False
+
+  def __repr__(self):
+    return '<SgConnectionMetrics(url:"%(url)s", script:"%(script)s")>' % {
+      'url': self.__url,
+      'script': self.__scriptName
+    }
+
+  def __init__(self, url, scriptName, enabled=None, payloadSize=None):
+    if enabled == None:
+      enabled = ShotgunORM.config.ENABLE_CONNECTION_METRICS
+
+    if payloadSize == None:
+      payloadSize = ShotgunORM.config.CONNECTION_METRICS_PAYLOAD_SIZE
+
+    self.__lock = threading.Lock()
+
+    self.__url = url
+    self.__scriptName = scriptName
+
+    self.__enabled = bool(enabled)
+    self.__payloadSize = bool(payloadSize)
+
+    self.__calls = {}
+    self.__startTime = time.time()
+
+  def isEnabled(self):
+    '''
+    Returns True if metrics are being recorded.
+    '''
+
+    return self.__enabled
+
+  def isRecordingPayloadSize(self):
+    '''
+    Returns True if the JSON size of each call's arguments is recorded.
+    '''
+
+    return self.__payloadSize
+
+  def payloadSize(self, args):
+    '''
+    Returns the estimated JSON size of the call arguments or 0 when payload
+    sizes are not recorded.
+    '''
+
+    if not self.__payloadSize:
+      return 0
+
+    try:
+      return len(ShotgunORM.toJson(args))
+    except Exception:
+      return 0
+
+  def record(
+    self,
+    callName,
+    latency,
+    lockWait=0.0,
+    result=None,
+    payloadBytes=0,
+    error=None
+  ):
+    '''
+    Records a Shotgun API call.
+
+    Args:
+      * (str) callName:
+        Shotgun API function name.
+
+      * (float) latency:
+        Seconds the call took, excluding lock wait.
+
+      * (float) lockWait:
+        Seconds spent waiting on the Shotgun API lock.
+
+      * (object) result:
+        Result returned by the call, used to count rows.
+
+      * (int) payloadBytes:
+        Estimated size of the request payload.
+
+      * (Exception) error:
+        Exception raised by the call.
+    '''
+
+    if error == None:
+      rows = _rowCount(result)
+    else:
+      rows = 0
+
+    bucket = len(LATENCY_BUCKETS)
+
+    for i in xrange(len(LATENCY_BUCKETS)):
+      if latency <= LATENCY_BUCKETS[i]:
+        bucket = i
+
+        break
+
+    with self:
+      try:
+        metrics = self.__calls[callName]
+      except KeyError:
+        metrics = SgCallMetrics()
+
+        self.__calls[callName] = metrics
+
+      metrics.count += 1
+      metrics.buckets[bucket] += 1
+      metrics.latencySum += latency
+      metrics.lockWaitSum += lockWait
+      metrics.payloadBytes += payloadBytes
+      metrics.rows += rows
+
+      if latency > metrics.latencyMax:
+        metrics.latencyMax = latency
+
+      if error != None:
+        metrics.errors += 1
+
+  def reset(self):
+    '''
+    Clears all recorded metrics.
+    '''
+
+    with self:
+      self.__calls = {}
+      self.__startTime = time.time()
+
+  def scriptName(self):
+    '''
+    Returns the script name of the connection the metrics belong to.
+    '''
+
+    return self.__scriptName
+
+  def setEnabled(self, enabled):
+    '''
+    Enables or disables recording of metrics.
+    '''
+
+    self.__enabled = bool(enabled)
+
+  def setRecordPayloadSize(self, enabled):
+    '''
+    Enables or disables recording the JSON size of each call's arguments.
+    '''
+
+    self.__payloadSize = bool(enabled)
+
+  def snapshot(self):
+    '''
+    Returns a dict of the current metrics keyed by Shotgun API function name.
+
+    Each value is a dict containing the keys "count", "errors",
+    "latency_buckets", "latency_max", "latency_sum", "lock_wait_sum",
+    "payload_bytes" and "rows".  "latency_buckets" is a list of cumulative
+    (upper bound seconds, count) tuples.
+    '''
+
+    with self:
+      result = {}
+
+      for callName, metrics in self.__calls.items():
+        result[callName] = metrics.toDict()
+
+      return result
+
+  def startTime(self):
+    '''
+    Returns the time metrics started recording, reset() restarts it.
+    '''
+
+    return self.__startTime
+
+  def toPrometheus(self):
+    '''
+    Returns the metrics in Prometheus text exposition format.
+    '''
+
+    return prometheusMetrics([self])
+
+  def exportPrometheus(self, filename):
+    '''
+    Writes the metrics in Prometheus text exposition format to filename.
+    '''
+
+    exportPrometheusMetrics(filename, [self])
+
+  def url(self):
+    '''
+    Returns the URL of the connection the metrics belong to.
+    '''
+
+    return self.__url
+
+def _prometheusLabel(value):
+  '''
+  Internal function!
+
+  Returns the value escaped for use as a Prometheus label value.
+  '''
+
+  return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _prometheusFloat(value):
+  '''
+  Internal function!
+  '''
+
+  if value == float('inf'):
+    return '+Inf'
+
+  return repr(float(value))
+
+def prometheusMetrics(sgMetrics):
+  '''
+  Returns the metrics of several connections in Prometheus text exposition
+  format.
+
+  Args:
+    * (list) sgMetrics:
+      List of SgConnectionMetrics, SgConnection objects are also accepted.
+  '''
+
+  families = [
+    (
+      'sgorm_api_calls_total',
+      'counter',
+      'Number of Shotgun API calls.',
+      'count'
+    ),
+    (
+      'sgorm_api_errors_total',
+      'counter',
+      'Number of Shotgun API calls that raised an exception.',
+      'errors'
+    ),
+    (
+      'sgorm_api_rows_total',
+      'counter',
+      'Number of rows returned by Shotgun API calls.',
+      'rows'
+    ),
+    (
+      'sgorm_api_payload_bytes_total',
+      'counter',
+      'Estimated JSON bytes sent by Shotgun API calls.',
+      'payload_bytes'
+    ),
+    (
+      'sgorm_api_lock_wait_seconds_total',
+      'counter',
+      'Seconds spent waiting on the Shotgun API lock.',
+      'lock_wait_sum'
+    ),
+    (
+      'sgorm_api_call_duration_seconds_max',
+      'gauge',
+      'Slowest Shotgun API call in seconds.',
+      'latency_max'
+    )
+  ]
+
+  snapshots = []
+
+  for metrics in sgMetrics:
+    if isinstance(metrics, ShotgunORM.SgConnection):
+      metrics = metrics.metrics()
+
+    labels = 'url="%s",script="%s"' % (
+      _prometheusLabel(metrics.url()),
+      _prometheusLabel(metrics.scriptName())
+    )
+
+    snapshots.append((labels, sorted(metrics.snapshot().items())))
+
+  lines = []
+
+  for name, metricType, doc, key in families:
+    lines.append('# HELP %s %s' % (name, doc))
+    lines.append('# TYPE %s %s' % (name, metricType))
+
+    for labels, calls in snapshots:
+      for callName, data in calls:
+        value = data[key]
+
+        if isinstance(value, float):
+          value = _prometheusFloat(value)
+
+        lines.append(
+          '%s{%s,call="%s"} %s' % (name, labels, _prometheusLabel(callName), value)
+        )
+
+  name = 'sgorm_api_call_duration_seconds'
+
+  lines.append('# HELP %s Shotgun API call latency in seconds.' % name)
+  lines.append('# TYPE %s histogram' % name)
+
+  for labels, calls in snapshots:
+    for callName, data in calls:
+      callLabels = '%s,call="%s"' % (labels, _prometheusLabel(callName))
+
+      for le, count in data['latency_buckets']:
+        lines.append(
+          '%s_bucket{%s,le="%s"} %d' % (name, callLabels, _prometheusFloat(le), count)
+        )
+
+      lines.append(
+        '%s_sum{%s} %s' % (name, callLabels, _prometheusFloat(data['latency_sum']))
+      )
+
+      lines.append('%s_count{%s} %d' % (name, callLabels, data['count']))
+
+  return '\n'.join(lines) + '\n'
+
+def exportPrometheusMetrics(filename, sgMetrics):
+  '''
+  Writes the metrics of several connections in Prometheus text exposition
+  format to filename.
+
+  The file is replaced atomically so it can be read by the node_exporter
+  textfile collector while being updated.
+
+  Args:
+    * (str) filename:
+      Output file.
+
+    * (list) sgMetrics:
+      List of SgConnectionMetrics, SgConnection objects are also accepted.
+  '''
+
+  filename = os.path.abspath(filename)
+
+  data = prometheusMetrics(sgMetrics)
+
+  fd, tmpName = tempfile.mkstemp(
+    prefix='.%s.' % os.path.basename(filename),
+    dir=os.path.dirname(filename)
+  )
+
+  try:
+    with os.fdopen(fd, 'w') as fh:
+      fh.write(data)
+
+    os.chmod(tmpName, 0644)
+
+    os.rename(tmpName, filename)
+  except:
+    try:
+      os.remove(tmpName)
+    except OSError:
+      pass
+
+    raise
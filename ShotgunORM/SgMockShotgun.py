@@ -0,0 +1,1323 @@
+# Copyright (c) 2013, Nathan Dunsworth - NFXPlugins
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the NFXPlugins nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL NFXPLUGINS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+__all__ = [
+  'SgMockConnection',
+  'SgMockDatabase',
+  'SgMockShotgun',
+  'SgMockShotgunConfig'
+]
+
+# Python imports
+import copy
+import datetime
+import random
+import threading
+import time
+
+# This module imports
+import ShotgunORM
+
+################################################################################
+#
+# Synthetic schema served by SgMockDatabase.
+#
+# Entity type -> list of (field name, data type, valid types or values).
+#
+################################################################################
+
+_ENTITY_LABELS = {
+  'Asset': 'Asset',
+  'HumanUser': 'Person',
+  'Project': 'Project',
+  'Sequence': 'Sequence',
+  'Shot': 'Shot',
+  'Task': 'Task',
+  'Version': 'Version'
+}
+
+_TRACKING_FIELDS = [
+  ('created_at', 'date_time', None),
+  ('created_by', 'entity', ['HumanUser']),
+  ('updated_at', 'date_time', None),
+  ('updated_by', 'entity', ['HumanUser'])
+]
+
+_STATUS_VALUES = ['wtg', 'rdy', 'ip', 'rev', 'fin']
+
+# Task colors are plain RGB values as the mock has no pipeline Steps to link to.
+_TASK_COLORS = ['200,80,80', '80,200,80', '80,80,200']
+
+MOCK_SCHEMA = {
+  'Asset': [
+    ('code', 'text', None),
+    ('description', 'text', None),
+    ('project', 'entity', ['Project']),
+    ('sg_asset_type', 'list', ['Character', 'Environment', 'Prop', 'Vehicle']),
+    ('sg_status_list', 'status_list', _STATUS_VALUES),
+    ('tasks', 'multi_entity', ['Task'])
+  ] + _TRACKING_FIELDS,
+  'HumanUser': [
+    ('email', 'text', None),
+    ('login', 'text', None),
+    ('name', 'text', None),
+    ('sg_status_list', 'status_list', ['act', 'dis'])
+  ] + _TRACKING_FIELDS,
+  'Project': [
+    ('name', 'text', None),
+    ('sg_description', 'text', None),
+    ('sg_status', 'list', ['Active', 'Bidding', 'Complete'])
+  ] + _TRACKING_FIELDS,
+  'Sequence': [
+    ('code', 'text', None),
+    ('description', 'text', None),
+    ('project', 'entity', ['Project']),
+    ('sg_status_list', 'status_list', _STATUS_VALUES),
+    ('shots', 'multi_entity', ['Shot'])
+  ] + _TRACKING_FIELDS,
+  'Shot': [
+    ('code', 'text', None),
+    ('description', 'text', None),
+    ('project', 'entity', ['Project']),
+    ('sg_cut_in', 'number', None),
+    ('sg_cut_out', 'number', None),
+    ('sg_sequence', 'entity', ['Sequence']),
+    ('sg_status_list', 'status_list', _STATUS_VALUES),
+    ('tasks', 'multi_entity', ['Task'])
+  ] + _TRACKING_FIELDS,
+  'Task': [
+    ('color', 'color', None),
+    ('content', 'text', None),
+    ('due_date', 'date', None),
+    ('entity', 'entity', ['Asset', 'Shot']),
+    ('est_in_mins', 'duration', None),
+    ('project', 'entity', ['Project']),
+    ('sg_status_list', 'status_list', _STATUS_VALUES),
+    ('task_assignees', 'multi_entity', ['HumanUser'])
+  ] + _TRACKING_FIELDS,
+  'Version': [
+    ('code', 'text', None),
+    ('description', 'text', None),
+    ('entity', 'entity', ['Asset', 'Shot']),
+    ('project', 'entity', ['Project']),
+    ('sg_first_frame', 'number', None),
+    ('sg_last_frame', 'number', None),
+    ('sg_path_to_frames', 'text', None),
+    ('sg_status_list', 'status_list', _STATUS_VALUES),
+    ('sg_task', 'entity', ['Task']),
+    ('user', 'entity', ['HumanUser'])
+  ] + _TRACKING_FIELDS
+}
+
+# Field used as the display name of linked Entities.
+_NAME_FIELDS = {
+  'HumanUser': 'name',
+  'Project': 'name',
+  'Task': 'content'
+}
+
+def _entityKey(value):
+  '''
+  Internal function!
+
+  Returns the (type, id) tuple of an Entity dict, any other value is returned
+  unchanged.
+  '''
+
+  if isinstance(value, dict) and value.has_key('type') and value.has_key('id'):
+    return (value['type'], value['id'])
+
+  return value
+
+class SgMockDatabase(object):
+  '''
+  In memory stand-in for a Shotgun site.
+
+  Serves a synthetic schema and a deterministic dataset to SgMockShotgun
+  objects.  All SgMockShotgun objects of a database share its data, latency and
+  request counts.
+
+  The size of the dataset is driven by the number of Shots, the other Entity
+  types scale with it unless specified in entityCounts.
+  '''
+
+  def __enter__(self):
+    self.__lock.acquire()
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.__lock.release()
+
+    return False
+
+  def __repr__(self):
+    return '<%s(entities:%d, latency:%s)>' % (
+      type(self).__name__,
+      self.size(),
+      self.latency()
+    )
+
+  def __init__(self, size=100, seed=0, latency=0.0, entityCounts=None):
+    '''
+    Args:
+      * (int) size:
+        Number of Shots.
+
+      * (int) seed:
+        Seed used to generate the dataset.
+
+      * (float) latency:
+        Seconds each request sleeps for.
+
+      * (dict) entityCounts:
+        Dict of Entity type keys and the number of Entities to create for them.
+    '''
+
+    self.__lock = threading.RLock()
+
+    self.__latency = float(latency)
+    self.__requestCounts = {}
+
+    self._tables = {}
+    self._retired = {}
+    self._nextIds = {}
+
+    counts = {
+      'Project': max(1, size / 500),
+      'HumanUser': max(1, size / 20),
+      'Sequence': max(1, size / 25),
+      'Shot': size,
+      'Asset': max(1, size / 2),
+      'Version': size * 2
+    }
+
+    if entityCounts != None:
+      counts.update(entityCounts)
+
+    for entityType in MOCK_SCHEMA.keys():
+      self._tables[entityType] = {}
+      self._retired[entityType] = {}
+      self._nextIds[entityType] = 1
+
+    self._generate(random.Random(seed), counts)
+
+  def _generate(self, rand, counts):
+    '''
+    Internal function!
+
+    Fills the tables with synthetic Entities.
+    '''
+
+    baseTime = datetime.datetime(2013, 1, 1, 9, 0, 0)
+
+    def link(entityType, entityId):
+      return {'type': entityType, 'id': entityId}
+
+    def pick(entityType):
+      if self._nextIds[entityType] <= 1:
+        return None
+
+      return link(entityType, rand.randint(1, self._nextIds[entityType] - 1))
+
+    def tracking(record, users):
+      created = baseTime + datetime.timedelta(minutes=rand.randint(0, 525600))
+
+      record['created_at'] = created
+      record['updated_at'] = created + datetime.timedelta(
+        minutes=rand.randint(0, 43200)
+      )
+
+      if users:
+        record['created_by'] = pick('HumanUser')
+        record['updated_by'] = pick('HumanUser')
+
+      return record
+
+    for i in xrange(counts.get('HumanUser', 0)):
+      self._insert('HumanUser', tracking({
+        'email': 'user%d@mock.shotgunstudio.com' % (i + 1),
+        'login': 'user%d' % (i + 1),
+        'name': 'User %d' % (i + 1),
+        'sg_status_list': 'act'
+      }, False))
+
+    users = counts.get('HumanUser', 0) >= 1
+
+    for i in xrange(counts.get('Project', 0)):
+      self._insert('Project', tracking({
+        'name': 'Project %d' % (i + 1),
+        'sg_description': 'Mock project %d' % (i + 1),
+        'sg_status': 'Active'
+      }, users))
+
+    for i in xrange(counts.get('Sequence', 0)):
+      self._insert('Sequence', tracking({
+        'code': 'SEQ%03d' % (i + 1),
+        'description': 'Sequence %d' % (i + 1),
+        'project': pick('Project'),
+        'sg_status_list': rand.choice(_STATUS_VALUES),
+        'shots': []
+      }, users))
+
+    for i in xrange(counts.get('Shot', 0)):
+      cutIn = rand.randint(1, 100)
+
+      shotId = self._insert('Shot', tracking({
+        'code': 'SH%05d' % (i + 1),
+        'description': 'Shot %d' % (i + 1),
+        'project': pick('Project'),
+        'sg_cut_in': cutIn,
+        'sg_cut_out': cutIn + rand.randint(24, 240),
+        'sg_sequence': pick('Sequence'),
+        'sg_status_list': rand.choice(_STATUS_VALUES),
+        'tasks': []
+      }, users))
+
+      seq = self._tables['Shot'][shotId]['sg_sequence']
+
+      if seq != None:
+        self._tables['Sequence'][seq['id']]['shots'].append(link('Shot', shotId))
+
+    for i in xrange(counts.get('Asset', 0)):
+      self._insert('Asset', tracking({
+        'code': 'asset%05d' % (i + 1),
+        'description': 'Asset %d' % (i + 1),
+        'project': pick('Project'),
+        'sg_asset_type': rand.choice(['Character', 'Environment', 'Prop', 'Vehicle']),
+        'sg_status_list': rand.choice(_STATUS_VALUES),
+        'tasks': []
+      }, users))
+
+    # One Task per Shot and Asset unless specified.
+    taskParents = []
+
+    for entityType in ['Shot', 'Asset']:
+      for entityId in sorted(self._tables[entityType].keys()):
+        taskParents.append((entityType, entityId))
+
+    taskCount = counts.get('Task', len(taskParents))
+
+    for i in xrange(taskCount):
+      if len(taskParents) >= 1:
+        parentType, parentId = taskParents[i % len(taskParents)]
+      else:
+        parentType, parentId = (None, None)
+
+      record = {
+        'color': _TASK_COLORS[i % len(_TASK_COLORS)],
+        'content': rand.choice(['Anim', 'Comp', 'Layout', 'Light', 'Model']),
+        'due_date': (
+          baseTime + datetime.timedelta(days=rand.randint(0, 365))
+        ).strftime('%Y-%m-%d'),
+        'est_in_mins': rand.randint(1, 40) * 60,
+        'project': pick('Project'),
+        'sg_status_list': rand.choice(_STATUS_VALUES),
+        'task_assignees': []
+      }
+
+      if users:
+        record['task_assignees'].append(pick('HumanUser'))
+
+      if parentType != None:
+        record['entity'] = link(parentType, parentId)
+        record['project'] = copy.copy(self._tables[parentType][parentId]['project'])
+
+      taskId = self._insert('Task', tracking(record, users))
+
+      if parentType != None:
+        self._tables[parentType][parentId]['tasks'].append(link('Task', taskId))
+
+    for i in xrange(counts.get('Version', 0)):
+      record = {
+        'code': 'v%06d' % (i + 1),
+        'description': 'Version %d' % (i + 1),
+        'sg_first_frame': 1001,
+        'sg_last_frame': 1001 + rand.randint(24, 240),
+        'sg_path_to_frames': '/mock/renders/v%06d.####.exr' % (i + 1),
+        'sg_status_list': rand.choice(_STATUS_VALUES)
+      }
+
+      if self._nextIds['Task'] > 1:
+        task = self._tables['Task'][rand.randint(1, self._nextIds['Task'] - 1)]
+
+        record['sg_task'] = link('Task', task['id'])
+        record['project'] = copy.copy(task['project'])
+        record['entity'] = copy.copy(task['entity'])
+      else:
+        record['project'] = pick('Project')
+
+      if users:
+        record['user'] = pick('HumanUser')
+
+      self._insert('Version', tracking(record, users))
+
+  def _insert(self, entityType, data):
+    '''
+    Internal function!
+
+    Inserts a new record and returns its id.
+    '''
+
+    try:
+      table = self._tables[entityType]
+    except KeyError:
+      raise ValueError('unknown Entity type "%s"' % entityType)
+
+    entityId = self._nextIds[entityType]
+
+    self._nextIds[entityType] += 1
+
+    record = {}
+
+    for fieldName, dataType, validValues in MOCK_SCHEMA[entityType]:
+      if dataType == 'multi_entity':
+        record[fieldName] = []
+      else:
+        record[fieldName] = None
+
+    for fieldName, value in data.items():
+      self._checkField(entityType, fieldName)
+
+      record[fieldName] = value
+
+    record['id'] = entityId
+    record['type'] = entityType
+
+    table[entityId] = record
+
+    return entityId
+
+  def _checkField(self, entityType, fieldName):
+    '''
+    Internal function!
+
+    Raises a ValueError when the Entity type does not have the field.
+    '''
+
+    for i in MOCK_SCHEMA[entityType]:
+      if i[0] == fieldName:
+        return
+
+    raise ValueError(
+      'Entity type "%s" does not have a field "%s"' % (entityType, fieldName)
+    )
+
+  def _recordRequest(self, name):
+    '''
+    Internal function!
+
+    Counts the request and sleeps for the latency of the database.
+    '''
+
+    with self:
+      self.__requestCounts[name] = self.__requestCounts.get(name, 0) + 1
+
+      latency = self.__latency
+
+    if latency > 0:
+      time.sleep(latency)
+
+  def entityCount(self, sgEntityType):
+    '''
+    Returns the number of active Entities of the specified type.
+    '''
+
+    with self:
+      return len(self._tables[sgEntityType])
+
+  def latency(self):
+    '''
+    Returns the number of seconds each request sleeps for.
+    '''
+
+    return self.__latency
+
+  def requestCounts(self):
+    '''
+    Returns a dict of API function name keys and the number of requests made
+    to them.
+    '''
+
+    with self:
+      return dict(self.__requestCounts)
+
+  def resetRequestCounts(self):
+    '''
+    Resets the request counts.
+    '''
+
+    with self:
+      self.__requestCounts = {}
+
+  def schemaEntityRead(self):
+    '''
+    Returns the schema_entity_read() result of the database.
+    '''
+
+    result = {}
+
+    for entityType in MOCK_SCHEMA.keys():
+      result[entityType] = {
+        'name': {
+          'editable': False,
+          'value': _ENTITY_LABELS[entityType]
+        },
+        'visible': {
+          'editable': False,
+          'value': True
+        }
+      }
+
+    return result
+
+  def schemaFieldRead(self, sgEntityType):
+    '''
+    Returns the schema_field_read() result of the Entity type.
+    '''
+
+    if not MOCK_SCHEMA.has_key(sgEntityType):
+      raise ValueError('unknown Entity type "%s"' % sgEntityType)
+
+    fields = [('id', 'number', None)] + MOCK_SCHEMA[sgEntityType]
+
+    result = {}
+
+    for fieldName, dataType, validValues in fields:
+      properties = {
+        'default_value': {
+          'editable': False,
+          'value': None
+        }
+      }
+
+      if dataType in ['entity', 'multi_entity']:
+        properties['valid_types'] = {
+          'editable': True,
+          'value': list(validValues)
+        }
+      elif validValues != None:
+        properties['valid_values'] = {
+          'editable': True,
+          'value': list(validValues)
+        }
+
+      result[fieldName] = {
+        'data_type': {
+          'editable': False,
+          'value': dataType
+        },
+        'editable': {
+          'editable': False,
+          'value': fieldName not in ['id', 'created_at', 'updated_at']
+        },
+        'entity_type': {
+          'editable': False,
+          'value': sgEntityType
+        },
+        'mandatory': {
+          'editable': False,
+          'value': False
+        },
+        'name': {
+          'editable': True,
+          'value': fieldName.replace('sg_', '').replace('_', ' ').title()
+        },
+        'properties': properties,
+        'visible': {
+          'editable': False,
+          'value': True
+        }
+      }
+
+    return result
+
+  def setLatency(self, secs):
+    '''
+    Sets the number of seconds each request sleeps for.
+    '''
+
+    with self:
+      self.__latency = float(secs)
+
+  def size(self):
+    '''
+    Returns the total number of active Entities.
+    '''
+
+    with self:
+      return sum([len(x) for x in self._tables.values()])
+
+class SgMockShotgunConfig(object):
+  '''
+  Stand-in for the shotgun_api3 connection config.
+  '''
+
+  def __init__(self):
+    self.timeout_secs = None
+
+class SgMockShotgun(object):
+  '''
+  In-process stand-in for a shotgun_api3.Shotgun connection.
+
+  Implements the subset of the Shotgun Python API used by the ORM against a
+  SgMockDatabase so the query engine, async engine, caches and batch paths can
+  be exercised without a Shotgun site.
+  '''
+
+  def __repr__(self):
+    return '<%s(%s)>' % (type(self).__name__, self.__database)
+
+  def __init__(self, sgDatabase, **kwargs):
+    '''
+    Args:
+      * (SgMockDatabase) sgDatabase:
+        Database requests are served from.
+
+    Any additional keyword args, the args of shotgun_api3.Shotgun, are ignored.
+    '''
+
+    self.__database = sgDatabase
+
+    self.base_url = kwargs.get('base_url', None)
+    self.config = SgMockShotgunConfig()
+
+    self._connection = None
+
+  def _compare(self, value, relation, args):
+    '''
+    Internal function!
+
+    Returns True if value satisfies the filter relation.
+    '''
+
+    if relation in ['is', 'is_not']:
+      result = _entityKey(value) == _entityKey(args[0])
+
+      if relation == 'is':
+        return result
+
+      return not result
+    elif relation in ['in', 'not_in']:
+      if len(args) == 1 and isinstance(args[0], (list, tuple)):
+        args = args[0]
+
+      keys = [_entityKey(x) for x in args]
+
+      if isinstance(value, list):
+        result = len([x for x in value if _entityKey(x) in keys]) >= 1
+      else:
+        result = _entityKey(value) in keys
+
+      if relation == 'in':
+        return result
+
+      return not result
+    elif relation == 'less_than':
+      return value != None and value < args[0]
+    elif relation == 'greater_than':
+      return value != None and value > args[0]
+    elif relation in ['between', 'not_between']:
+      if len(args) == 1:
+        args = args[0]
+
+      result = value != None and args[0] <= value <= args[1]
+
+      if relation == 'between':
+        return result
+
+      return not result
+    elif relation in ['contains', 'not_contains']:
+      if isinstance(value, list):
+        result = _entityKey(args[0]) in [_entityKey(x) for x in value]
+      elif value == None:
+        result = False
+      else:
+        result = str(args[0]).lower() in str(value).lower()
+
+      if relation == 'contains':
+        return result
+
+      return not result
+    elif relation == 'starts_with':
+      return value != None and str(value).lower().startswith(str(args[0]).lower())
+    elif relation == 'ends_with':
+      return value != None and str(value).lower().endswith(str(args[0]).lower())
+    elif relation in ['type_is', 'type_is_not']:
+      result = isinstance(value, dict) and value.get('type', None) == args[0]
+
+      if relation == 'type_is':
+        return result
+
+      return not result
+
+    raise ValueError('unsupported filter relation "%s"' % relation)
+
+  def _entityValue(self, value):
+    '''
+    Internal function!
+
+    Returns a copy of the Entity link with its name.
+    '''
+
+    linkType = value['type']
+
+    result = {
+      'type': linkType,
+      'id': value['id'],
+      'name': None
+    }
+
+    try:
+      record = self.__database._tables[linkType][value['id']]
+
+      result['name'] = record.get(_NAME_FIELDS.get(linkType, 'code'), None)
+    except KeyError:
+      pass
+
+    return result
+
+  def _fieldValue(self, record, path):
+    '''
+    Internal function!
+
+    Returns the value of the field path, deep links in the form of
+    "field.EntityType.field" are followed.
+    '''
+
+    if record == None:
+      return None
+
+    parts = path.split('.', 2)
+
+    if len(parts) == 1:
+      value = record.get(path, None)
+
+      if isinstance(value, dict) and value.has_key('type'):
+        return self._entityValue(value)
+      elif isinstance(value, list):
+        return [
+          self._entityValue(x) if isinstance(x, dict) else x for x in value
+        ]
+
+      return value
+
+    link = record.get(parts[0], None)
+
+    if not isinstance(link, dict) or len(parts) < 3 or link['type'] != parts[1]:
+      return None
+
+    linked = self.__database._tables[parts[1]].get(link['id'], None)
+
+    return self._fieldValue(linked, parts[2])
+
+  def _matches(self, record, filters, filterOperator):
+    '''
+    Internal function!
+
+    Returns True if the record matches the filters.
+    '''
+
+    if isinstance(filters, dict):
+      filterOperator = filters.get(
+        'filter_operator',
+        filters.get('logical_operator', filterOperator)
+      )
+      filters = filters.get('filters', filters.get('conditions', []))
+
+    matchAny = filterOperator in ['any', 'or']
+
+    for f in filters:
+      if isinstance(f, dict):
+        if f.has_key('path'):
+          result = self._compare(
+            self._fieldValue(record, f['path']),
+            f['relation'],
+            f['values']
+          )
+        else:
+          result = self._matches(record, f, 'all')
+      else:
+        result = self._compare(self._fieldValue(record, f[0]), f[1], f[2:])
+
+      if matchAny and result:
+        return True
+      elif not matchAny and not result:
+        return False
+
+    return not matchAny or len(filters) <= 0
+
+  def _records(self, entity_type, filters, filter_operator=None, retired_only=False):
+    '''
+    Internal function!
+
+    Returns the records of the Entity type that match the filters.
+    '''
+
+    db = self.__database
+
+    try:
+      if retired_only:
+        table = db._retired[entity_type]
+      else:
+        table = db._tables[entity_type]
+    except KeyError:
+      raise ValueError('unknown Entity type "%s"' % entity_type)
+
+    return [
+      table[x] for x in sorted(table.keys())
+        if self._matches(table[x], filters, filter_operator)
+    ]
+
+  def _result(self, record, fields):
+    '''
+    Internal function!
+
+    Returns the find() result dict for the record.
+    '''
+
+    result = {
+      'type': record['type'],
+      'id': record['id']
+    }
+
+    for field in fields or []:
+      if field in ['type', 'id']:
+        continue
+
+      result[field] = self._fieldValue(record, field)
+
+    return result
+
+  def _setValues(self, record, data, modes=None):
+    '''
+    Internal function!
+
+    Sets the values of the record from data.
+    '''
+
+    db = self.__database
+
+    modes = modes or {}
+
+    for field, value in data.items():
+      db._checkField(record['type'], field)
+
+      if isinstance(value, dict) and value.has_key('type'):
+        value = {'type': value['type'], 'id': value['id']}
+      elif isinstance(value, list):
+        value = [
+          {'type': x['type'], 'id': x['id']} for x in value
+            if isinstance(x, dict)
+        ] or list(value)
+
+        mode = modes.get(field, 'set')
+
+        if mode == 'add':
+          current = record.get(field, None) or []
+          keys = [_entityKey(x) for x in current]
+
+          value = current + [x for x in value if _entityKey(x) not in keys]
+        elif mode == 'remove':
+          keys = [_entityKey(x) for x in value]
+
+          value = [
+            x for x in record.get(field, None) or []
+              if _entityKey(x) not in keys
+          ]
+
+      record[field] = copy.deepcopy(value)
+
+    record['updated_at'] = datetime.datetime.now()
+
+  def batch(self, requests):
+    '''
+    Performs a batch of create, update and delete requests.
+    '''
+
+    db = self.__database
+
+    db._recordRequest('batch')
+
+    result = []
+
+    with db:
+      for request in requests:
+        requestType = request['request_type']
+        entityType = request['entity_type']
+
+        if requestType == 'create':
+          result.append(
+            self._create(entityType, request['data'], request.get('return_fields', None))
+          )
+        elif requestType == 'update':
+          result.append(
+            self._update(
+              entityType,
+              request['entity_id'],
+              request['data'],
+              request.get('multi_entity_update_modes', None)
+            )
+          )
+        elif requestType == 'delete':
+          result.append(self._delete(entityType, request['entity_id']))
+        else:
+          raise ValueError('invalid request_type "%s"' % requestType)
+
+    return result
+
+  def close(self):
+    self._connection = None
+
+  def connect(self):
+    self._connection = self
+
+  def _create(self, entity_type, data, return_fields=None):
+    '''
+    Internal function!
+    '''
+
+    db = self.__database
+
+    with db:
+      data = dict(data)
+
+      entityId = db._insert(entity_type, {})
+
+      record = db._tables[entity_type][entityId]
+
+      record['created_at'] = datetime.datetime.now()
+
+      self._setValues(record, data)
+
+      fields = data.keys()
+
+      if return_fields != None:
+        fields.extend(return_fields)
+
+      return self._result(record, fields)
+
+  def create(self, entity_type, data, return_fields=None):
+    self.__database._recordRequest('create')
+
+    return self._create(entity_type, data, return_fields)
+
+  def database(self):
+    '''
+    Returns the SgMockDatabase requests are served from.
+    '''
+
+    return self.__database
+
+  def _delete(self, entity_type, entity_id):
+    '''
+    Internal function!
+    '''
+
+    db = self.__database
+
+    with db:
+      try:
+        record = db._tables[entity_type].pop(entity_id)
+      except KeyError:
+        return False
+
+      db._retired[entity_type][entity_id] = record
+
+      return True
+
+  def delete(self, entity_type, entity_id):
+    self.__database._recordRequest('delete')
+
+    return self._delete(entity_type, entity_id)
+
+  def _find(
+    self,
+    entity_type,
+    filters,
+    fields=None,
+    order=None,
+    filter_operator=None,
+    limit=0,
+    retired_only=False,
+    page=0
+  ):
+    '''
+    Internal function!
+    '''
+
+    with self.__database:
+      records = self._records(entity_type, filters, filter_operator, retired_only)
+
+      for i in reversed(order or []):
+        records.sort(
+          key=lambda x: self._fieldValue(x, i['field_name']),
+          reverse=i.get('direction', 'asc') == 'desc'
+        )
+
+      if limit > 0:
+        start = max(page - 1, 0) * limit
+
+        records = records[start:start + limit]
+
+      return [self._result(x, fields) for x in records]
+
+  def find(
+    self,
+    entity_type,
+    filters,
+    fields=None,
+    order=None,
+    filter_operator=None,
+    limit=0,
+    retired_only=False,
+    page=0,
+    include_archived_projects=True,
+    additional_filter_presets=None
+  ):
+    self.__database._recordRequest('find')
+
+    return self._find(
+      entity_type,
+      filters,
+      fields,
+      order,
+      filter_operator,
+      limit,
+      retired_only,
+      page
+    )
+
+  def find_one(
+    self,
+    entity_type,
+    filters,
+    fields=None,
+    order=None,
+    filter_operator=None,
+    retired_only=False,
+    include_archived_projects=True,
+    additional_filter_presets=None
+  ):
+    self.__database._recordRequest('find_one')
+
+    result = self._find(
+      entity_type,
+      filters,
+      fields,
+      order,
+      filter_operator,
+      1,
+      retired_only
+    )
+
+    if len(result) >= 1:
+      return result[0]
+
+    return None
+
+  def info(self):
+    self.__database._recordRequest('info')
+
+    return {
+      'version': [7, 0, 0],
+      'totango_site_id': None,
+      'totango_site_name': None,
+      's3_uploads_enabled': False
+    }
+
+  def note_thread_read(self, note_id, entity_fields=None):
+    self.__database._recordRequest('note_thread_read')
+
+    return []
+
+  def revive(self, entity_type, entity_id):
+    db = self.__database
+
+    db._recordRequest('revive')
+
+    with db:
+      try:
+        record = db._retired[entity_type].pop(entity_id)
+      except KeyError:
+        return False
+
+      db._tables[entity_type][entity_id] = record
+
+      return True
+
+  def schema_entity_read(self, project_entity=None):
+    self.__database._recordRequest('schema_entity_read')
+
+    return self.__database.schemaEntityRead()
+
+  def schema_field_read(self, entity_type, field_name=None, project_entity=None):
+    self.__database._recordRequest('schema_field_read')
+
+    result = self.__database.schemaFieldRead(entity_type)
+
+    if field_name != None:
+      return {field_name: result[field_name]}
+
+    return result
+
+  def schema_read(self, project_entity=None):
+    db = self.__database
+
+    db._recordRequest('schema_read')
+
+    result = {}
+
+    for entityType in MOCK_SCHEMA.keys():
+      result[entityType] = db.schemaFieldRead(entityType)
+
+    return result
+
+  def _summarize(self, records, summary_fields):
+    '''
+    Internal function!
+    '''
+
+    result = {}
+
+    for summary in summary_fields:
+      field = summary['field']
+      summaryType = summary['type']
+
+      values = [self._fieldValue(x, field) for x in records]
+      values = [x for x in values if x not in [None, []]]
+
+      if summaryType == 'record_count':
+        result[field] = len(records)
+      elif summaryType == 'count':
+        result[field] = len(values)
+      elif summaryType == 'sum':
+        result[field] = sum(values)
+      elif summaryType == 'average':
+        if len(values) >= 1:
+          result[field] = sum(values) / float(len(values))
+        else:
+          result[field] = 0
+      elif summaryType in ['maximum', 'latest']:
+        result[field] = max(values) if len(values) >= 1 else None
+      elif summaryType in ['minimum', 'earliest']:
+        result[field] = min(values) if len(values) >= 1 else None
+      else:
+        raise ValueError('unsupported summary type "%s"' % summaryType)
+
+    return result
+
+  def _summarizeGroups(self, records, summary_fields, grouping):
+    '''
+    Internal function!
+    '''
+
+    group = grouping[0]
+
+    groups = {}
+
+    for record in records:
+      value = self._fieldValue(record, group['field'])
+
+      if isinstance(value, dict):
+        key = _entityKey(value)
+      else:
+        key = value
+
+      groups.setdefault(key, (value, []))[1].append(record)
+
+    result = []
+
+    for key in sorted(groups.keys(), reverse=group.get('direction', 'asc') == 'desc'):
+      value, groupRecords = groups[key]
+
+      if isinstance(value, dict):
+        name = value['name']
+      else:
+        name = value
+
+      data = {
+        'group_name': name,
+        'group_value': value,
+        'summaries': self._summarize(groupRecords, summary_fields)
+      }
+
+      if len(grouping) >= 2:
+        data['groups'] = self._summarizeGroups(groupRecords, summary_fields, grouping[1:])
+
+      result.append(data)
+
+    return result
+
+  def summarize(
+    self,
+    entity_type,
+    filters,
+    summary_fields,
+    filter_operator=None,
+    grouping=None,
+    include_archived_projects=True
+  ):
+    self.__database._recordRequest('summarize')
+
+    with self.__database:
+      records = self._records(entity_type, filters, filter_operator)
+
+      result = {
+        'summaries': self._summarize(records, summary_fields)
+      }
+
+      if grouping:
+        result['groups'] = self._summarizeGroups(records, summary_fields, grouping)
+
+      return result
+
+  def text_search(self, text, entity_types, project_ids=None, limit=None):
+    self.__database._recordRequest('text_search')
+
+    matches = []
+
+    with self.__database:
+      for entityType, filters in entity_types.items():
+        nameField = _NAME_FIELDS.get(entityType, 'code')
+
+        for record in self._records(entityType, filters):
+          name = record.get(nameField, None)
+
+          if name == None or text.lower() not in name.lower():
+            continue
+
+          if project_ids and (
+            record.get('project', None) == None or
+            record['project']['id'] not in project_ids
+          ):
+            continue
+
+          project = record.get('project', None)
+
+          if entityType == 'Project':
+            project = record
+
+          matches.append({
+            'type': entityType,
+            'id': record['id'],
+            'name': name,
+            'image': record.get('image', None),
+            'links': [],
+            'project_id': project and project['id'],
+            'status': record.get('sg_status_list', None)
+          })
+
+    if limit:
+      matches = matches[:limit]
+
+    return {
+      'matches': matches,
+      'terms': [text]
+    }
+
+  def _update(self, entity_type, entity_id, data, multi_entity_update_modes=None):
+    '''
+    Internal function!
+    '''
+
+    db = self.__database
+
+    with db:
+      try:
+        record = db._tables[entity_type][entity_id]
+      except KeyError:
+        raise ValueError('%s %s does not exist' % (entity_type, entity_id))
+
+      self._setValues(record, data, multi_entity_update_modes)
+
+      return self._result(record, data.keys())
+
+  def update(self, entity_type, entity_id, data, multi_entity_update_modes=None):
+    self.__database._recordRequest('update')
+
+    return self._update(entity_type, entity_id, data, multi_entity_update_modes)
+
+class SgMockConnection(ShotgunORM.SgConnection):
+  '''
+  SgConnection whose Shotgun API connections are SgMockShotgun objects serving
+  a SgMockDatabase.
+
+  Used to benchmark and load-test the ORM offline.
+
+  Example:
+
+  db = ShotgunORM.SgMockDatabase(size=10000, latency=0.05)
+
+  sg = ShotgunORM.SgMockConnection(
+    'https://mock.shotgunstudio.com',
+    'mock',
+    'mock',
+    sgDatabase=db
+  )
+
+  shots = sg.find('Shot', [['sg_status_list', 'is', 'ip']])
+  '''
+
+  def __init__(self, url, scriptName, scriptKey, sgDatabase=None, **kwargs):
+    '''
+    Args:
+      * (str) url:
+        Url of the mock site, used to key the connection and its schema.
+
+      * (str) scriptName:
+        Script name.
+
+      * (str) scriptKey:
+        Script key.
+
+      * (SgMockDatabase) sgDatabase:
+        Database served to the connection, by default a SgMockDatabase with
+        its default size is created.
+
+    Any additional keyword args are passed to SgConnection.
+    '''
+
+    if sgDatabase == None:
+      sgDatabase = SgMockDatabase()
+
+    self.__database = sgDatabase
+
+    super(SgMockConnection, self).__init__(url, scriptName, scriptKey, **kwargs)
+
+  def _createApiConnection(self):
+    '''
+    Internal function!
+
+    Returns a new SgMockShotgun object serving the connections database.
+    '''
+
+    return SgMockShotgun(self.__database, **self._apiConnectionArgs)
+
+  def database(self):
+    '''
+    Returns the SgMockDatabase the connection is served from.
+    '''
+
+    return self.__database
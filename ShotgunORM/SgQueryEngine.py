@@ -190,9 +190,10 @@ class SgQueryEngine(object):
       if len(pullFields) <= 0:
         return
 
-      ShotgunORM.LoggerQueryEngine.debug('%(qEng)s.addQueue(...)', {'qEng': self})
-      ShotgunORM.LoggerQueryEngine.debug('    * sgEntity: %(sgEntity)s', {'sgEntity': sgEntity})
-      ShotgunORM.LoggerQueryEngine.debug('    * sgFields: %(sgFields)s', {'sgFields': pullFields})
+      if ShotgunORM.LoggerQueryEngine.isDebugging():
+        ShotgunORM.LoggerQueryEngine.debug('%(qEng)s.addQueue(...)', {'qEng': self})
+        ShotgunORM.LoggerQueryEngine.debug('    * sgEntity: %(sgEntity)s', {'sgEntity': sgEntity})
+        ShotgunORM.LoggerQueryEngine.debug('    * sgFields: %(sgFields)s', {'sgFields': pullFields})
 
       with self:
         pullFields = set(pullFields)
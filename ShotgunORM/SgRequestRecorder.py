@@ -0,0 +1,467 @@
+# Copyright (c) 2013, Nathan Dunsworth - NFXPlugins
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the NFXPlugins nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL NFXPLUGINS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+__all__ = [
+  'SgReplayConnection',
+  'SgReplayShotgun',
+  'SgRequestRecorder',
+  'SgRequestReplay',
+  'normalizeRequest'
+]
+
+# Python imports
+import collections
+import copy
+import threading
+import time
+
+# This module imports
+import ShotgunORM
+
+def _normalize(value):
+  '''
+  Internal function!
+
+  Returns a copy of value with unicode converted to str, tuples to lists and
+  sets to sorted lists.
+  '''
+
+  if isinstance(value, unicode):
+    return value.encode('utf-8')
+  elif isinstance(value, dict):
+    result = {}
+
+    for k, v in value.items():
+      result[_normalize(k)] = _normalize(v)
+
+    return result
+  elif isinstance(value, (list, tuple)):
+    return [_normalize(x) for x in value]
+  elif isinstance(value, (set, frozenset)):
+    return sorted([_normalize(x) for x in value])
+
+  return value
+
+def normalizeRequest(callName, args):
+  '''
+  Returns the key a Shotgun API request is recorded and replayed by.
+
+  Dict keys are sorted and the order of the fields requested by find() and
+  find_one() is ignored so the same request made by different runs produces
+  the same key.
+
+  Args:
+    * (str) callName:
+      Shotgun API function name.
+
+    * (tuple) args:
+      Args passed to the function.
+  '''
+
+  args = _normalize(args)
+
+  if callName in ['find', 'find_one'] and len(args) >= 3 and args[2] != None:
+    args[2] = sorted(args[2])
+
+  return ShotgunORM.toJson([callName, args], sortKeys=True)
+
+class SgRequestRecorder(object):
+  '''
+  Records the Shotgun API requests of a SgConnection.
+
+  Each request is written as a single JSON line containing the API function
+  name, its args, the seconds it took and its result or error.  The file may
+  be gzip or bzip2 compressed, see ShotgunORM.openFile(), and is replayed with
+  a SgRequestReplay.
+
+  See SgConnection.startRecording().
+  '''
+
+  def __repr__(self):
+    return '<%s(filename="%s", recorded:%d)>' % (
+      type(self).__name__,
+      self.__filename,
+      self.__recorded
+    )
+
+  def __init__(self, filename, mode='wb', compression=None):
+    '''
+    Args:
+      * (str) filename:
+        Recording file.
+
+      * (str) mode:
+        Mode the file is opened with.
+
+      * (str) compression:
+        Compression to use, "gzip", "bz2" or "none".
+    '''
+
+    self.__lock = threading.Lock()
+    self.__filename = filename
+    self.__file = ShotgunORM.openFile(filename, mode, compression)
+    self.__recorded = 0
+
+  def close(self):
+    '''
+    Closes the recording.
+    '''
+
+    with self.__lock:
+      if self.__file != None:
+        self.__file.close()
+
+        self.__file = None
+
+  def filename(self):
+    '''
+    Returns the recording filename.
+    '''
+
+    return self.__filename
+
+  def isClosed(self):
+    '''
+    Returns True if the recording has been closed.
+    '''
+
+    return self.__file == None
+
+  def record(self, callName, args, seconds, result=None, error=None):
+    '''
+    Records a Shotgun API request.
+
+    Args:
+      * (str) callName:
+        Shotgun API function name.
+
+      * (tuple) args:
+        Args passed to the function.
+
+      * (float) seconds:
+        Seconds the request took.
+
+      * (object) result:
+        Result returned by the request.
+
+      * (Exception) error:
+        Exception raised by the request.
+    '''
+
+    data = {
+      'call': callName,
+      'args': args,
+      'seconds': round(seconds, 6),
+      'result': result
+    }
+
+    if error != None:
+      data['error'] = '%s: %s' % (type(error).__name__, error)
+
+    try:
+      line = ShotgunORM.toJson(data)
+    except TypeError, e:
+      ShotgunORM.LoggerConnection.warn(
+        'unable to record %s request, %s' % (callName, e)
+      )
+
+      return
+
+    with self.__lock:
+      if self.__file == None:
+        return
+
+      self.__file.write(line)
+      self.__file.write('\n')
+
+      self.__recorded += 1
+
+  def recorded(self):
+    '''
+    Returns the number of requests recorded.
+    '''
+
+    return self.__recorded
+
+class SgRequestReplay(object):
+  '''
+  Serves the responses of a SgRequestRecorder recording.
+
+  Responses are keyed by normalizeRequest(), identical requests are answered
+  in the order they were recorded and once exhausted the last response is
+  repeated.
+
+  The recorded time of each request is slept for multiplied by latencyScale,
+  0.0 replays at zero latency leaving only the ORM side CPU cost and 1.0 at
+  the original latency.
+  '''
+
+  def __repr__(self):
+    return '<%s(filename="%s", requests:%d)>' % (
+      type(self).__name__,
+      self.__filename,
+      self.__size
+    )
+
+  def __init__(self, filename, latencyScale=0.0, compression=None):
+    '''
+    Args:
+      * (str) filename:
+        Recording file.
+
+      * (float) latencyScale:
+        Multiplier of the recorded request times.
+
+      * (str) compression:
+        Compression of the file, "gzip", "bz2" or "none".
+    '''
+
+    self.__lock = threading.Lock()
+    self.__filename = filename
+    self.__latencyScale = float(latencyScale)
+    self.__responses = {}
+    self.__size = 0
+    self.__served = 0
+    self.__missed = 0
+
+    with ShotgunORM.openFile(filename, 'rb', compression) as fh:
+      for line in fh:
+        line = line.strip()
+
+        if not line:
+          continue
+
+        data = _normalize(ShotgunORM.fromJson(line))
+
+        key = normalizeRequest(data['call'], data['args'])
+
+        try:
+          responses = self.__responses[key]
+        except KeyError:
+          responses = collections.deque()
+
+          self.__responses[key] = responses
+
+        responses.append(
+          (data['seconds'], data['result'], data.get('error', None))
+        )
+
+        self.__size += 1
+
+  def filename(self):
+    '''
+    Returns the recording filename.
+    '''
+
+    return self.__filename
+
+  def latencyScale(self):
+    '''
+    Returns the multiplier of the recorded request times.
+    '''
+
+    return self.__latencyScale
+
+  def response(self, callName, args):
+    '''
+    Returns the recorded result of the request.
+
+    Raises a RuntimeError if the request was not recorded or if it raised an
+    error when recorded.
+
+    Args:
+      * (str) callName:
+        Shotgun API function name.
+
+      * (tuple) args:
+        Args passed to the function.
+    '''
+
+    key = normalizeRequest(callName, args)
+
+    with self.__lock:
+      try:
+        responses = self.__responses[key]
+      except KeyError:
+        self.__missed += 1
+
+        raise RuntimeError('no recorded response for request %s' % key)
+
+      if len(responses) >= 2:
+        seconds, result, error = responses.popleft()
+      else:
+        seconds, result, error = responses[0]
+
+      self.__served += 1
+
+    if self.__latencyScale > 0:
+      time.sleep(seconds * self.__latencyScale)
+
+    if error != None:
+      raise RuntimeError('replayed %s error, %s' % (callName, error))
+
+    # Results are modified by the ORM so each request gets its own copy.
+    return copy.deepcopy(result)
+
+  def setLatencyScale(self, latencyScale):
+    '''
+    Sets the multiplier of the recorded request times.
+    '''
+
+    self.__latencyScale = float(latencyScale)
+
+  def size(self):
+    '''
+    Returns the number of recorded requests.
+    '''
+
+    return self.__size
+
+  def stats(self):
+    '''
+    Returns a dict containing the number of requests "served" and "missed".
+    '''
+
+    with self.__lock:
+      return {
+        'served': self.__served,
+        'missed': self.__missed
+      }
+
+class SgReplayShotgun(object):
+  '''
+  Stand-in for a shotgun_api3.Shotgun connection that answers every API
+  function from a SgRequestReplay.
+  '''
+
+  def __repr__(self):
+    return '<%s(%s)>' % (type(self).__name__, self.__replay)
+
+  def __getattr__(self, item):
+    if item.startswith('_'):
+      raise AttributeError(item)
+
+    replay = self.__replay
+
+    def apiCall(*args):
+      return replay.response(item, args)
+
+    apiCall.__name__ = item
+
+    return apiCall
+
+  def __init__(self, sgReplay, **kwargs):
+    '''
+    Args:
+      * (SgRequestReplay) sgReplay:
+        Replay requests are answered from.
+
+    Any additional keyword args, the args of shotgun_api3.Shotgun, are ignored.
+    '''
+
+    self.__replay = sgReplay
+
+    self.base_url = kwargs.get('base_url', None)
+    self.config = ShotgunORM.SgMockShotgunConfig()
+
+    self._connection = None
+
+  def close(self):
+    self._connection = None
+
+  def connect(self):
+    self._connection = self
+
+  def replay(self):
+    '''
+    Returns the SgRequestReplay requests are answered from.
+    '''
+
+    return self.__replay
+
+class SgReplayConnection(ShotgunORM.SgConnection):
+  '''
+  SgConnection whose Shotgun API connections are SgReplayShotgun objects
+  answering from a recording.
+
+  The recording must contain the schema requests, see
+  SgConnection.startRecording(), unless a schema cache exists for the url.
+
+  Example:
+
+  sg = ShotgunORM.SgConnection(url, script, key)
+
+  sg.startRecording('/tmp/tool.sgrec.gz')
+
+  runTool(sg)
+
+  sg.stopRecording()
+
+  replay = ShotgunORM.SgRequestReplay('/tmp/tool.sgrec.gz')
+
+  sg = ShotgunORM.SgReplayConnection(url, script, key, replay)
+
+  runTool(sg)
+  '''
+
+  def __init__(self, url, scriptName, scriptKey, sgReplay, **kwargs):
+    '''
+    Args:
+      * (str) url:
+        Url of the recorded site.
+
+      * (str) scriptName:
+        Script name.
+
+      * (str) scriptKey:
+        Script key.
+
+      * (SgRequestReplay) sgReplay:
+        Replay requests are answered from.
+
+    Any additional keyword args are passed to SgConnection.
+    '''
+
+    self.__replay = sgReplay
+
+    super(SgReplayConnection, self).__init__(url, scriptName, scriptKey, **kwargs)
+
+  def _createApiConnection(self):
+    '''
+    Internal function!
+
+    Returns a new SgReplayShotgun object answering from the connections
+    replay.
+    '''
+
+    return SgReplayShotgun(self.__replay, **self._apiConnectionArgs)
+
+  def replay(self):
+    '''
+    Returns the SgRequestReplay the connection answers from.
+    '''
+
+    return self.__replay
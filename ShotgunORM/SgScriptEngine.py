@@ -27,8 +27,8 @@
 __all__ = [
   'convertToLogicalOp',
   'convertToLogicalOpCond',
-  'parseLogicalOp',
-  'parseSearchExp',
+  'parseFromLogicalOp',
+  'parseToLogicalOp',
   'SgLogicalOp',
   'SgLogicalOpCondition'
 ]
@@ -74,7 +74,8 @@ class SgSearchFilterBasic(SgSearchFilter):
   def flattenFilters(cls, sgFilters):
     '''
     Internal function used to flatten Shotgun filter lists.  This will convert
-    SgEntity objects into their equivalent Shotgun search pattern.
+    SgEntity and SgEntityView objects into their equivalent Shotgun search
+    pattern.
 
     Example:
     myProj = myConnection.findOne('Project', [['id', 'is', 65]])
@@ -87,7 +88,7 @@ class SgSearchFilterBasic(SgSearchFilter):
       result = {}
 
       for key, value in obj.items():
-        if isinstance(value, ShotgunORM.SgEntity):
+        if isinstance(value, (ShotgunORM.SgEntity, ShotgunORM.SgEntityView)):
           result[key] = value.toEntityFieldData()
         elif isinstance(value, ShotgunORM.SgField):
           result[key] = value.toFieldData()
@@ -104,7 +105,7 @@ class SgSearchFilterBasic(SgSearchFilter):
       result = []
 
       for i in obj:
-        if isinstance(i, ShotgunORM.SgEntity):
+        if isinstance(i, (ShotgunORM.SgEntity, ShotgunORM.SgEntityView)):
           result.append(i.toEntityFieldData())
         elif isinstance(i, ShotgunORM.SgField):
           result.append(i.toFieldData())
@@ -531,7 +532,7 @@ class SgEntitySearchFilters(SgSearchFilters):
 
   def __eq__(self, item):
     if isinstance(item, (SgSearchFilters, SgEntitySearchFilters)):
-      return self._filters == item._filter
+      return self._filters == item._filters
 
     return False
 
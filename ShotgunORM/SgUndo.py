@@ -9,32 +9,124 @@ __all__ = [
   'SgUndoStack'
 ]
 
-import copy
+# Python imports
+import cPickle
+import os
+import tempfile
 import weakref
 
+# This module imports
+import ShotgunORM
+
 class SgUndoError(Exception):
   pass
 
 class SgUndoAction(object):
   '''
+  Undoable Shotgun batch commit.
+
+  Only the minimal inverse operations are stored, the Entity type and id of
+  each request plus the previous and new values of updated fields.  The batch
+  requests and results of the commit are not kept.
 
+  Each operation is a tuple of:
+    (request_type, entity_type, entity_id, undo_data, redo_data, modes)
   '''
 
   UNDO = 0
   REDO = 1
 
-  def __init__(self, sgActions=[], sgResults=[]):
-    self.__state = self.UNDO
+  def __getstate__(self):
+    return (self.__state, self.__operations)
 
-    self.__actions = copy.deepcopy(sgActions)
-    self.__results = copy.deepcopy(sgResults)
+  def __setstate__(self, state):
+    self.__state, self.__operations = state
+    self.__size = None
 
-  def actions(self):
+  def __init__(self, sgOperations=[]):
+    self.__state = self.UNDO
+    self.__operations = tuple(sgOperations)
+    self.__size = None
+
+  @classmethod
+  def fromBatch(cls, sgBatchData, sgResults, sgUndoValues=None):
     '''
-    Returns a list of the actions performed.
+    Returns a new SgUndoAction for the committed batch.
+
+    Update requests can only be undone for fields that have an entry in
+    sgUndoValues or were committed with an add/remove multi-entity mode, other
+    fields are skipped.
+
+    Args:
+      * (list) sgBatchData:
+        Batch requests that were committed.
+
+      * (list) sgResults:
+        Results returned by the batch.
+
+      * (dict) sgUndoValues:
+        Previous field values keyed by (entity_type, entity_id).
     '''
 
-    return copy.deepcopy(self.__actions)
+    if sgUndoValues == None:
+      sgUndoValues = {}
+
+    operations = []
+
+    for request, result in zip(sgBatchData, sgResults):
+      requestType = request['request_type']
+      entityType = request['entity_type']
+
+      if requestType == 'create':
+        operations.append(
+          ('create', entityType, result['id'], None, None, None)
+        )
+      elif requestType == 'delete' or requestType == 'revive':
+        operations.append(
+          (requestType, entityType, request['entity_id'], None, None, None)
+        )
+      elif requestType == 'update':
+        entityId = request['entity_id']
+
+        updateModes = request.get('multi_entity_update_modes', None) or {}
+        prevValues = sgUndoValues.get((entityType, entityId), {})
+
+        undoData = {}
+        redoData = {}
+        modes = {}
+
+        for name, value in request['data'].items():
+          mode = updateModes.get(name, 'set')
+
+          if mode == 'add' or mode == 'remove':
+            undoData[name] = value
+            modes[name] = mode
+          elif prevValues.has_key(name):
+            undoData[name] = prevValues[name]
+          else:
+            ShotgunORM.LoggerORM.debug(
+              'SgUndoAction: no undo value for %(type)s %(id)s field "%(field)s"' % {
+                'type': entityType,
+                'id': entityId,
+                'field': name
+              }
+            )
+
+            continue
+
+          redoData[name] = value
+
+        if len(undoData) <= 0:
+          continue
+
+        if len(modes) <= 0:
+          modes = None
+
+        operations.append(
+          ('update', entityType, entityId, undoData, redoData, modes)
+        )
+
+    return cls(operations)
 
   def isRedoable(self):
     '''
@@ -54,6 +146,13 @@ class SgUndoAction(object):
 
     return self.__state == self.UNDO
 
+  def operations(self):
+    '''
+    Returns the tuple of inverse operations stored by the action.
+    '''
+
+    return self.__operations
+
   def redo(self, sgConnection):
     '''
     Performs the Shotgun actions again.
@@ -66,41 +165,53 @@ class SgUndoAction(object):
         'can not redo an action that has not been undone'
       )
 
-    actions = self.__actions
-    result = self.__results
-
-    new_actions = []
-
-    for action, result in zip(actions, results):
-      action_type = action['request_type']
+    requests = []
 
-      if action_type == 'delete':
-        new_actions.append(
+    for requestType, entityType, entityId, undoData, redoData, modes in self.__operations:
+      if requestType == 'create' or requestType == 'revive':
+        requests.append(
           {
             'request_type': 'revive',
-            'entity_type': action['entity_type'],
-            'entity_id': action['entity_id']
+            'entity_type': entityType,
+            'entity_id': entityId
           }
         )
-      elif action_type == 'update':
-        pass
-        # new_actions.append(
-          # {
-            # 'request_type': 'update',
-            # 'entity_type': action['entity_type'],
-            # 'entity_id': action['entity_id'],
-            # 'data': action['data']
-          # }
-        # )
-      else:
-        pass
+      elif requestType == 'delete':
+        requests.append(
+          {
+            'request_type': 'delete',
+            'entity_type': entityType,
+            'entity_id': entityId
+          }
+        )
+      elif requestType == 'update':
+        request = {
+          'request_type': 'update',
+          'entity_type': entityType,
+          'entity_id': entityId,
+          'data': redoData
+        }
 
-    self.__actions = new_actions
+        if modes != None:
+          request['multi_entity_update_modes'] = modes
 
-    self.__results = sgConnection._sg_batch(new_actions)
+        requests.append(request)
+
+    if len(requests) > 0:
+      sgConnection._sg_batch(requests)
 
     self.__state = self.UNDO
 
+  def size(self):
+    '''
+    Returns the estimated number of bytes used by the action.
+    '''
+
+    if self.__size == None:
+      self.__size = len(cPickle.dumps(self.__operations, cPickle.HIGHEST_PROTOCOL))
+
+    return self.__size
+
   def undo(self, sgConnection):
     '''
     Reverts the Shotgun actions.
@@ -113,30 +224,48 @@ class SgUndoAction(object):
         'can not undo an action that has already been undone'
       )
 
-    actions = self.__actions
-    result = self.__results
-
-    new_actions = []
+    requests = []
 
-    for action, result in zip(actions, results):
-      action_type = action['request_type']
-
-      if action_type == 'create' or action_type == 'revive':
-        new_actions.append(
+    for requestType, entityType, entityId, undoData, redoData, modes in reversed(self.__operations):
+      if requestType == 'create' or requestType == 'revive':
+        requests.append(
           {
             'request_type': 'delete',
-            'entity_type': action['entity_type'],
-            'entity_id': action['entity_id']
+            'entity_type': entityType,
+            'entity_id': entityId
           }
         )
-      elif action_type == 'update':
-        pass
-      else:
-        pass
+      elif requestType == 'delete':
+        requests.append(
+          {
+            'request_type': 'revive',
+            'entity_type': entityType,
+            'entity_id': entityId
+          }
+        )
+      elif requestType == 'update':
+        request = {
+          'request_type': 'update',
+          'entity_type': entityType,
+          'entity_id': entityId,
+          'data': undoData
+        }
 
-    self.__actions = new_actions
+        if modes != None:
+          inverseModes = {}
 
-    self.__results = sgConnection._sg_batch(new_actions)
+          for name, mode in modes.items():
+            if mode == 'add':
+              inverseModes[name] = 'remove'
+            else:
+              inverseModes[name] = 'add'
+
+          request['multi_entity_update_modes'] = inverseModes
+
+        requests.append(request)
+
+    if len(requests) > 0:
+      sgConnection._sg_batch(requests)
 
     self.__state = self.REDO
 
@@ -149,57 +278,180 @@ class SgUndoAction(object):
 
 class SgUndoStack(object):
   '''
+  Stack of undoable actions.
 
+  The stack holds at most maxUndo actions.  When maxBytes is greater than zero
+  the oldest actions are evicted once the actions held in memory exceed it,
+  if spillDir is set evicted actions are written to a temporary file in that
+  directory and read back when undone instead of being discarded.  Evicted
+  undo groups are always discarded.
   '''
 
-  def __init__(self, parent=None):
+  def __init__(self, parent=None, maxUndo=None, maxBytes=None, spillDir=None):
+    if maxUndo == None:
+      maxUndo = ShotgunORM.config.UNDO_MAX_ACTIONS
+
+    if maxBytes == None:
+      maxBytes = ShotgunORM.config.UNDO_MAX_BYTES
+
+    if spillDir == None:
+      spillDir = ShotgunORM.config.UNDO_SPILL_DIR
+
     self.__undo = []
     self.__redo = []
     self.__parent = parent
 
-  def clearRedo(self):
+    self.__maxUndo = max(0, int(maxUndo))
+    self.__maxBytes = max(0, int(maxBytes))
+    self.__bytes = 0
+
+    self.__spillDir = spillDir
+    self.__spillFile = None
+
+    # List of (offset, size) tuples, the last item is the newest spilled action.
+    self.__spilled = []
+
+  def __clearSpill(self):
+    self.__spilled = []
+
+    if self.__spillFile != None:
+      self.__spillFile.close()
+
+      self.__spillFile = None
+
+  def _evict(self):
     '''
+    Internal function!
 
+    Enforces the maxUndo and maxBytes limits.
     '''
 
+    while self.__maxUndo > 0 and self.undoSize() > self.__maxUndo:
+      if len(self.__spilled) > 0:
+        self.__spilled.pop(0)
+
+        if len(self.__spilled) <= 0:
+          self.__clearSpill()
+      else:
+        self.__bytes -= self.__actionSize(self.__undo.pop(-1))
+
+    while (
+      self.__maxBytes > 0 and
+      self.__bytes > self.__maxBytes and
+      len(self.__undo) > 0
+    ):
+      action = self.__undo.pop(-1)
+
+      self.__bytes -= self.__actionSize(action)
+
+      if self.__spillDir and isinstance(action, SgUndoAction):
+        self.__spill(action)
+
+  def __actionSize(self, action):
+    # Groups keep growing after being pushed so they are not counted.
+    if isinstance(action, SgUndoStack):
+      return 0
+
+    return action.size()
+
+  def __spill(self, action):
+    if self.__spillFile == None:
+      self.__spillFile = tempfile.TemporaryFile(
+        prefix='sgorm_undo_',
+        dir=self.__spillDir
+      )
+
+    data = cPickle.dumps(action, cPickle.HIGHEST_PROTOCOL)
+
+    self.__spillFile.seek(0, os.SEEK_END)
+
+    offset = self.__spillFile.tell()
+
+    self.__spillFile.write(data)
+
+    self.__spilled.append((offset, len(data)))
+
+  def __unspill(self):
+    offset, size = self.__spilled.pop(-1)
+
+    self.__spillFile.seek(offset)
+
+    action = cPickle.loads(self.__spillFile.read(size))
+
+    if len(self.__spilled) <= 0:
+      self.__clearSpill()
+    else:
+      self.__spillFile.truncate(offset)
+
+    return action
+
+  def clearRedo(self):
+    '''
+    Clears the redo actions.
+    '''
+
+    for action in self.__redo:
+      self.__bytes -= self.__actionSize(action)
+
     self.__redo = []
 
   def clearUndo(self):
     '''
-
+    Clears the undo actions.
     '''
 
+    for action in self.__undo:
+      self.__bytes -= self.__actionSize(action)
+
     self.__undo = []
 
+    self.__clearSpill()
+
+  def maxBytes(self):
+    '''
+    Returns the max number of bytes of actions held in memory, 0 is unlimited.
+    '''
+
+    return self.__maxBytes
+
   def maxUndo(self):
     '''
+    Returns the max number of undo actions, 0 is unlimited.
+    '''
+
+    return self.__maxUndo
 
+  def memorySize(self):
+    '''
+    Returns the estimated number of bytes used by the actions held in memory,
+    undo groups are not included.
     '''
 
-    return 100
+    return self.__bytes
 
   def parent(self):
     '''
-
+    Returns the parent stack.
     '''
 
     return self.__parent
 
   def push(self, sgUndoAction):
     '''
-
+    Pushes the action onto the undo stack and clears the redo stack.
     '''
 
-    if len(self.__undo) > self.maxUndo():
-      self.__undo.pop(-1)
+    self.clearRedo()
 
     self.__undo.insert(0, sgUndoAction)
 
-    self.__redo = []
+    self.__bytes += self.__actionSize(sgUndoAction)
+
+    self._evict()
 
   def redo(self, sgConnection):
     '''
-
+    Redo the last undone action.
     '''
 
     if len(self.__redo) <= 0:
@@ -215,45 +467,87 @@ class SgUndoStack(object):
 
   def redoSize(self):
     '''
-
+    Returns the number of redo actions.
     '''
 
     return len(self.__redo)
 
-  def undo(self, sgConnection):
+  def setMaxBytes(self, maxBytes):
+    '''
+    Sets the max number of bytes of actions held in memory, 0 is unlimited.
     '''
 
+    self.__maxBytes = max(0, int(maxBytes))
+
+    self._evict()
+
+  def setMaxUndo(self, maxUndo):
+    '''
+    Sets the max number of undo actions, 0 is unlimited.
+    '''
+
+    self.__maxUndo = max(0, int(maxUndo))
+
+    self._evict()
+
+  def spillDir(self):
+    '''
+    Returns the directory evicted actions are spilled to, None when evicted
+    actions are discarded.
+    '''
+
+    return self.__spillDir
+
+  def spilledSize(self):
+    '''
+    Returns the number of undo actions spilled to disk.
+    '''
+
+    return len(self.__spilled)
+
+  def undo(self, sgConnection):
+    '''
+    Undo the last action.
     '''
 
     if len(self.__undo) <= 0:
-      return False
+      if len(self.__spilled) <= 0:
+        return False
+
+      action = self.__unspill()
+    else:
+      action = self.__undo.pop(0)
 
-    action = self.__undo.pop(0)
+      self.__bytes -= self.__actionSize(action)
 
     action.undo(sgConnection)
 
     self.__redo.insert(0, action)
 
+    self.__bytes += self.__actionSize(action)
+
+    self._evict()
+
     return True
 
   def undoSize(self):
     '''
-
+    Returns the number of undo actions.
     '''
 
-    return len(self.__undo)
+    return len(self.__undo) + len(self.__spilled)
 
 class SgUndoGroup(SgUndoStack):
   '''
-
+  Group of actions that are undone and redone together.
   '''
 
   def __init__(self, parent=None):
-    super(SgUndoGroup, self).__init__(parent)
+    super(SgUndoGroup, self).__init__(parent, maxUndo=0, maxBytes=0)
 
   def redo(self, sgConnection):
     '''
-
+    Redo all actions in the group.
     '''
 
     if self.redoSize() <= 0:
@@ -266,7 +560,7 @@ class SgUndoGroup(SgUndoStack):
 
   def redoSize(self):
     '''
-
+    Returns 1 if the group can be redone otherwise 0.
     '''
 
     if super(SgUndoGroup, self).redoSize() <= 0:
@@ -276,7 +570,7 @@ class SgUndoGroup(SgUndoStack):
 
   def undo(self, sgConnection):
     '''
-
+    Undo all actions in the group.
     '''
 
     if self.undoSize() <= 0:
@@ -287,9 +581,9 @@ class SgUndoGroup(SgUndoStack):
 
     return True
 
-  def undoSize(self, sgConnection):
+  def undoSize(self):
     '''
-
+    Returns 1 if the group can be undone otherwise 0.
     '''
 
     if super(SgUndoGroup, self).undoSize() <= 0:
@@ -299,7 +593,7 @@ class SgUndoGroup(SgUndoStack):
 
 class SgUndoStackNull(SgUndoStack):
   '''
-
+  Undo stack used when undo is disabled, all actions are discarded.
   '''
 
   def __init__(self):
@@ -307,14 +601,14 @@ class SgUndoStackNull(SgUndoStack):
 
   def push(self, sgUndoAction):
     '''
-
+    Discards the action.
     '''
 
     return False
 
   def redo(self, sgConnection):
     '''
-
+    Always returns False.
     '''
 
     return False
@@ -322,22 +616,22 @@ class SgUndoStackNull(SgUndoStack):
 
   def undo(self, sgConnection):
     '''
-
+    Always returns False.
     '''
 
     return False
 
 class SgUndoStackRoot(SgUndoStack):
   '''
-
+  Root undo stack of a connection.
   '''
 
-  def __init__(self):
-    super(SgUndoStackRoot, self).__init__(self)
+  def __init__(self, maxUndo=None, maxBytes=None, spillDir=None):
+    super(SgUndoStackRoot, self).__init__(self, maxUndo, maxBytes, spillDir)
 
 class SgUndo(object):
   '''
-
+  Undo manager of a connection.
   '''
 
   def __init__(self, sgConnection, rootStack=None):
@@ -352,89 +646,107 @@ class SgUndo(object):
 
   def clearRedo(self):
     '''
-
+    Clears the redo actions of the current stack.
     '''
 
     self.__stack.clearRedo()
 
   def clearUndo(self):
     '''
-
+    Clears the undo actions of the current stack.
     '''
 
     self.__stack.clearUndo()
 
   def connection(self):
     '''
-
+    Returns the connection the undo manager belongs to.
     '''
 
     return self.__connection()
 
   def hasRedo(self):
     '''
-
+    Returns True if there are actions to redo.
     '''
 
     return self.redoSize() > 0
 
   def hasUndo(self):
     '''
-
+    Returns True if there are actions to undo.
     '''
 
     return self.undoSize() > 0
 
-  def popGroup(self):
+  def isEnabled(self):
+    '''
+    Returns True if undo is enabled.
     '''
 
+    return not isinstance(self.__root, SgUndoStackNull)
+
+  def popGroup(self):
+    '''
+    Closes the current undo group.
     '''
 
-    self.__stack == self.__stack.parent()
+    if self.__stack != self.__root:
+      self.__stack = self.__stack.parent()
 
   def push(self, sgUndoAction):
     '''
-
+    Pushes the action onto the current stack.
     '''
 
     self.__stack.push(sgUndoAction)
 
   def pushGroup(self):
     '''
-
+    Opens a new undo group, actions pushed until popGroup() is called are
+    undone and redone together.
     '''
 
-    self.__stack.push(SgUndoGroup(self.__stack))
+    if not self.isEnabled():
+      return
+
+    group = SgUndoGroup(self.__stack)
+
+    self.__stack.push(group)
 
     self.__stack = group
 
   def redo(self):
     '''
-
+    Redo the last undone action.
     '''
 
-    return self.__stack.redo()
+    return self.__stack.redo(self.connection())
 
   def redoSize(self):
     '''
-
+    Returns the number of redo actions of the current stack.
     '''
 
     return self.__stack.redoSize()
 
-  def undo(self):
+  def root(self):
     '''
+    Returns the root stack.
+    '''
+
+    return self.__root
 
+  def undo(self):
+    '''
+    Undo the last action.
     '''
 
-    if self.__stack.undo() == False:
-      self.__stack = self.__stack.parent()
-    else:
-      return True
+    return self.__stack.undo(self.connection())
 
   def undoSize(self):
     '''
-
+    Returns the number of undo actions of the current stack.
     '''
 
     return self.__stack.undoSize()
@@ -38,17 +38,31 @@ __all__ = [
   'SgAsyncEntitySearchResult',
   'SgAsyncTextSearchResult',
   'SgBufferedSearchIterator',
+  'SgBulkCreateError',
+  'SgColumnarResult',
+  'SgCommitQueue',
   'SgConnection',
   'SgConnectionMeta',
+  'SgConnectionMetrics',
   'SgEntity',
   'SgEntityClassFactory',
+  'SgEntityView',
   'SgEntitySchemaInfo',
   'SgEntitySearchFilters',
+  'SgEventLogEntry',
   'SgField',
   'SgFieldSchemaInfo',
   'SgLocialOp',
   'SgLocialOpCondition',
+  'SgMockConnection',
+  'SgMockDatabase',
+  'SgMockShotgun',
+  'SgMockShotgunConfig',
   'SgQueryEngine',
+  'SgReplayConnection',
+  'SgReplayShotgun',
+  'SgRequestRecorder',
+  'SgRequestReplay',
   'SgSchema',
   'SgScriptCredentials',
   'SgScriptField',
@@ -62,6 +76,10 @@ __all__ = [
   'SgTextSearchParameters',
   'parseFromLogicalOp',
   'parseToLogicalOp',
+  'decodeRawResults',
+  'rawFieldDecoders',
+  'exportPrometheusMetrics',
+  'prometheusMetrics',
   'config'
 ]
 
@@ -121,7 +139,8 @@ from SgApiInfo import SgApiInfo
 from SgSite import SgSite
 from SgServerInfo import SgServerInfo
 from SgScriptCredentials import SgScriptCredentials
-from SgConnection import SgConnection, SgConnectionMeta
+from SgMetrics import SgConnectionMetrics, exportPrometheusMetrics, prometheusMetrics
+from SgConnection import SgBulkCreateError, SgConnection, SgConnectionMeta
 from SgEntityClassFactory import SgEntityClassFactory
 from SgAsyncSearchEngine import SgAsyncSearchEngine, SgAsyncResult, SgAsyncEntitySearchResult, SgAsyncTextSearchResult
 from SgQueryEngine import SgQueryEngine
@@ -136,12 +155,6 @@ from SgSearchParameters import (
   SgTextSearchParameters
 )
 
-from SgSearchIterator import (
-  SgAbstractSearchIterator,
-  SgBufferedSearchIterator,
-  SgSearchIterator
-)
-
 import SgUndo
 
 __all__.extend(SgUndo.__all__)
@@ -157,6 +170,7 @@ from .SgUndo import *
 ########################################################################
 
 from SgEntity import SgEntity, SgEntitySchemaInfo
+from SgEventLogEntry import SgEventLogEntry
 from SgField import SgField, SgFieldSchemaInfo
 
 # Fields
@@ -170,80 +184,415 @@ from SgFields import *
 
 ########################################################################
 #
-# Import scripting engine and script fields
+# Lazily imported modules
+#
+# Optional subsystems such as the event watchers, script fields, callbacks
+# and the mock Shotgun backend are not imported until one of their
+# attributes is first accessed from the package.  The Shotgun Python API is
+# imported the first time SHOTGUN_API is accessed.
+#
+# Each entry is the module name, the attributes it provides and whether the
+# attributes are added to __all__.  When modules provide the same attribute
+# the later module wins.
+#
+# Set config.LAZY_IMPORT to False to import everything with the package.
 #
 ########################################################################
 
-from SgScriptField import SgScriptField
+_LAZY_MODULES = [
+  (
+    'SgCommitQueue',
+    ['SgCommitQueue'],
+    False
+  ),
+  (
+    'SgMockShotgun',
+    [
+      'SgMockConnection',
+      'SgMockDatabase',
+      'SgMockShotgun',
+      'SgMockShotgunConfig'
+    ],
+    False
+  ),
+  (
+    'SgRequestRecorder',
+    [
+      'SgReplayConnection',
+      'SgReplayShotgun',
+      'SgRequestRecorder',
+      'SgRequestReplay',
+      'normalizeRequest'
+    ],
+    False
+  ),
+  (
+    'SgSearchIterator',
+    [
+      'SgAbstractSearchIterator',
+      'SgBufferedSearchIterator',
+      'SgSearchIterator'
+    ],
+    False
+  ),
+  (
+    'SgEntityView',
+    ['SgEntityView'],
+    False
+  ),
+  (
+    'SgColumnarResult',
+    [
+      'SgColumnarResult',
+      'decodeRawResults',
+      'rawFieldDecoders'
+    ],
+    False
+  ),
+  (
+    'SgScriptField',
+    ['SgScriptField'],
+    False
+  ),
+  (
+    'SgScriptFields',
+    [
+      'SgScriptFieldCheckbox',
+      'SgScriptFieldColor',
+      'SgScriptFieldColor2',
+      'SgScriptFieldDate',
+      'SgScriptFieldDateTime',
+      'SgScriptFieldEntity',
+      'SgScriptFieldEntityMulti',
+      'SgScriptFieldFloat',
+      'SgScriptFieldInt',
+      'SgScriptFieldSelectionList',
+      'SgScriptFieldTagList',
+      'SgScriptFieldText'
+    ],
+    True
+  ),
+  (
+    'SgScriptEngine',
+    [
+      'SgLogicalOp',
+      'SgLogicalOpCondition',
+      'convertToLogicalOp',
+      'convertToLogicalOpCond',
+      'parseFromLogicalOp',
+      'parseToLogicalOp'
+    ],
+    False
+  ),
+  (
+    'SgEventWatcher',
+    [
+      'SgEvent',
+      'SgEventFilter',
+      'SgEventFilterer',
+      'SgEventHandler',
+      'SgEventWatcher',
+      'SgEventWatcherFetch'
+    ],
+    True
+  ),
+  (
+    'SgEventSource',
+    [
+      'SgEventRecorder',
+      'SgEventReplaySource',
+      'SgEventSource',
+      'SgShotgunEventSource'
+    ],
+    True
+  ),
+  (
+    'SgEventWatchers',
+    [
+      'SgEntryTypeFilter',
+      'SgEntryTypeEventHandler',
+      'SgFileEventHandler',
+      'SgProjectFilter',
+      'SgStreamEventHandler',
+      'SgUDPBroadcastEventHandler'
+    ],
+    True
+  ),
+  (
+    'SgEventWatcherHub',
+    ['SgEventWatcherHub'],
+    True
+  ),
+  (
+    'SgEventFilters',
+    [
+      'SgAssetCreatedFilter',
+      'SgHumanUserCreatedFilter',
+      'SgPlaylistCreatedFilter',
+      'SgProjectCreatedFilter',
+      'SgProjectFilter',
+      'SgPublishedFileCreatedFilter',
+      'SgSequenceCreatedFilter',
+      'SgShotCreatedFilter',
+      'SgTaskCreatedFilter',
+      'SgVersionCreatedFilter'
+    ],
+    True
+  ),
+  (
+    'SgEventHandlers',
+    [
+      'SgAssetCreatedHandler',
+      'SgHumanUserCreatedHandler',
+      'SgPlaylistCreatedHandler',
+      'SgProjectCreatedHandler',
+      'SgProjectAssetCreatedHandler',
+      'SgProjectPlaylistCreatedHandler',
+      'SgProjectPublishedFileCreatedHandler',
+      'SgProjectSequenceCreatedHandler',
+      'SgProjectShotCreatedHandler',
+      'SgProjectTaskCreatedHandler',
+      'SgProjectVersionCreatedHandler',
+      'SgPublishedFileCreatedHandler',
+      'SgSequenceCreatedHandler',
+      'SgShotCreatedHandler',
+      'SgTaskCreatedHandler',
+      'SgVersionCreatedHandler'
+    ],
+    True
+  ),
+  (
+    'callbacks',
+    [
+      'AFTER_ENTITY_COMMIT_CBS',
+      'BEFORE_ENTITY_COMMIT_CBS',
+      'BEFORE_ENTITY_CREATE_CBS',
+      'ON_ENTITY_CREATE_CBS',
+      'ON_ENTITY_SCHEMA_INFO_CREATE_CBS',
+      'ON_FIELD_CHANGED_CBS',
+      'ON_SCHEMA_CHANGED_CBS',
+      'ON_SEARCH_RESULT_CBS',
+      'addAfterEntityCommit',
+      'addBeforeEntityCommit',
+      'addOnEntityCreate',
+      'addOnEntitySchemaInfoCreate',
+      'addOnFieldChanged',
+      'addOnSchemaChanged',
+      'addOnSearchResult',
+      'appendAfterEntityCommit',
+      'appendBeforeEntityCommit',
+      'appendOnEntityCreate',
+      'appendOnEntitySchemaInfoCreate',
+      'appendOnFieldChanged',
+      'appendOnSchemaChanged',
+      'appendOnSearchResult',
+      'afterEntityCommit',
+      'beforeEntityCommit',
+      'beforeEntityCreate',
+      'callbackExecutor',
+      'callbackProfile',
+      'compileCallbacks',
+      'isCallbackProfiling',
+      'onEntityCreate',
+      'onEntitySchemaInfoCreate',
+      'onFieldChanged',
+      'onSchemaChanged',
+      'onSearchResult',
+      'resetCallbackProfile',
+      'setCallbackProfiling',
+      'waitForDeferredCallbacks',
+      'SgCallbackExecutor'
+    ],
+    True
+  )
+]
 
-import SgScriptFields
+# Attribute name -> module name.
+_LAZY_ATTRIBUTES = {}
 
-__all__.extend(SgScriptFields.__all__)
+for _moduleName, _moduleAttrs, _moduleAll in _LAZY_MODULES:
+  for _attr in _moduleAttrs:
+    _LAZY_ATTRIBUTES[_attr] = _moduleName
 
-del SgScriptFields
+  if _moduleAll:
+    __all__.extend(_moduleAttrs)
 
-from SgScriptFields import *
+del _moduleName, _moduleAttrs, _moduleAll, _attr
 
-from SgScriptEngine import (
-  SgLogicalOp,
-  SgLogicalOpCondition,
-  convertToLogicalOp,
-  convertToLogicalOpCond,
-  parseFromLogicalOp,
-  parseToLogicalOp
-)
+import types
 
-########################################################################
-#
-# Import event monitor
-#
-########################################################################
+class SgLazyAttribute(object):
+  '''
+  Internal!
 
-import SgEventWatcher
+  Descriptor of a lazily imported attribute that has the same name as a lazily
+  imported module, such as the SgEventWatcher class of the SgEventWatcher
+  module.
 
-__all__.extend(SgEventWatcher.__all__)
+  Importing a sub-module directly, import ShotgunORM.SgEventWatcher, binds the
+  sub-module to the package bypassing SgLazyModule.__setattr__.  As a data
+  descriptor takes precedence over the package dict the attribute is still
+  returned, once its module is imported the descriptor is removed.
+  '''
 
-del SgEventWatcher
+  def __init__(self, name):
+    self.name = name
 
-from SgEventWatcher import *
+  def __get__(self, instance, owner):
+    if instance is None:
+      return self
 
-import SgEventWatchers
+    instance._importLazyModule(_LAZY_ATTRIBUTES[self.name])
 
-__all__.extend(SgEventWatchers.__all__)
+    return instance.__dict__[self.name]
 
-del SgEventWatchers
+  def __set__(self, instance, value):
+    instance.__dict__[self.name] = value
 
-from SgEventWatchers import *
+class SgLazyModule(types.ModuleType):
+  '''
+  Module type of the ShotgunORM package.
 
-from . import SgEventFilters
+  Imports lazily loaded modules the first time one of their attributes is
+  accessed.
+  '''
 
-__all__.extend(SgEventFilters.__all__)
+  def __dir__(self):
+    return sorted(
+      set(self.__dict__.keys() + _LAZY_ATTRIBUTES.keys() + ['SHOTGUN_API'])
+    )
 
-from .SgEventFilters import *
+  def __getattr__(self, item):
+    # Only called for attributes that have not been loaded yet.
+    if item == 'SHOTGUN_API':
+      return self._importShotgunApi()
 
-del SgEventFilters
+    moduleName = _LAZY_ATTRIBUTES.get(item, None)
 
-from . import SgEventHandlers
+    if moduleName == None:
+      raise AttributeError(
+        '\'module\' object has no attribute \'%s\'' % item
+      )
 
-__all__.extend(SgEventHandlers.__all__)
+    self._importLazyModule(moduleName)
 
-from .SgEventHandlers import *
+    return self.__dict__[item]
 
-del SgEventHandlers
+  def _importAll(self):
+    '''
+    Internal function!
 
-########################################################################
-#
-# Import callbacks
-#
-########################################################################
+    Imports all the lazily loaded modules and the Shotgun Python API.
+    '''
+
+    for moduleName, moduleAttrs, moduleAll in _LAZY_MODULES:
+      self._importLazyModule(moduleName)
+
+    self._importShotgunApi()
+
+  def _importLazyModule(self, moduleName):
+    '''
+    Internal function!
+
+    Imports the module and sets the attributes it provides on the package.
+    '''
+
+    import importlib
+
+    module = importlib.import_module('%s.%s' % (self.__name__, moduleName))
+
+    # Importing a sub-module binds it to the package, modules whose attributes
+    # are part of __all__ were never left bound.
+    for name, moduleAttrs, moduleAll in _LAZY_MODULES:
+      if name == moduleName and moduleAll:
+        self.__dict__.pop(moduleName, None)
+
+    cls = type(self)
+
+    for attr, attrModule in _LAZY_ATTRIBUTES.items():
+      if attrModule != moduleName:
+        continue
+
+      setattr(self, attr, getattr(module, attr))
+
+      if isinstance(cls.__dict__.get(attr, None), SgLazyAttribute):
+        try:
+          delattr(cls, attr)
+        except AttributeError:
+          # Removed by another thread importing the same module.
+          pass
+
+  def _importShotgunApi(self):
+    '''
+    Internal function!
+
+    Imports the Shotgun Python API named by config.SHOTGUNAPI_NAME.
+    '''
+
+    with SHOTGUN_API_LOCK:
+      if self.__dict__.has_key('SHOTGUN_API'):
+        return self.__dict__['SHOTGUN_API']
+
+      try:
+        api = __import__(config.SHOTGUNAPI_NAME)
+      except Exception, e:
+        if e.message == 'No module named %s' % config.SHOTGUNAPI_NAME:
+          raise ImportError('ShotgunORM unable to find Shotgun Python API module "%s", check "./ShotgunORM/__init__.SHOTGUNAPI_NAME" or sys.path' % config.SHOTGUNAPI_NAME)
+        else:
+          raise e
+
+      self.SHOTGUN_API = api
+
+      return api
+
+# Attributes named after a lazily imported module, see SgLazyAttribute.
+for _moduleName, _moduleAttrs, _moduleAll in _LAZY_MODULES:
+  if _LAZY_ATTRIBUTES.has_key(_moduleName):
+    setattr(SgLazyModule, _moduleName, SgLazyAttribute(_moduleName))
+
+del _moduleName, _moduleAttrs, _moduleAll
+
+del types
+
+def _installLazyModule():
+  '''
+  Internal function!
+
+  Replaces the package in sys.modules with a SgLazyModule.
+
+  The sub-modules imported above bound the original package module, they are
+  pointed at the SgLazyModule so lazily loaded attributes resolve for them.
+  '''
+
+  import sys
+
+  module = sys.modules[__name__]
+
+  lazyModule = SgLazyModule(__name__, __doc__)
+
+  lazyModule.__dict__.update(module.__dict__)
+
+  del lazyModule._installLazyModule
+
+  # The original module must be kept alive as the functions defined in this
+  # file use its globals.
+  lazyModule._PACKAGE_MODULE = module
+
+  sys.modules[__name__] = lazyModule
 
-import callbacks
+  for name, subModule in sys.modules.items():
+    if (
+      subModule == None or
+      not name.startswith(__name__ + '.') or
+      getattr(subModule, 'ShotgunORM', None) is not module
+    ):
+      continue
 
-__all__.extend(callbacks.__all__)
+    subModule.ShotgunORM = lazyModule
 
-del callbacks
+_installLazyModule()
 
-from callbacks import *
+del _installLazyModule
 
 ########################################################################
 #
@@ -251,14 +600,11 @@ from callbacks import *
 #
 ########################################################################
 
+# Names bound from here on are only visible to the functions of this file, the
+# package attributes live on the SgLazyModule.
 import config
 
-SHOTGUN_API = None
+if not config.LAZY_IMPORT:
+  import sys
 
-try:
-  SHOTGUN_API = __import__(config.SHOTGUNAPI_NAME)
-except Exception, e:
-  if e.message == 'No module named %s' % config.SHOTGUNAPI_NAME:
-    raise ImportError('ShotgunORM unable to find Shotgun Python API module "%s", check "./ShotgunORM/__init__.SHOTGUNAPI_NAME" or sys.path' % config.SHOTGUNAPI_NAME)
-  else:
-    raise e
+  sys.modules[__name__]._importAll()
@@ -50,16 +50,28 @@ __all__ = [
   'afterEntityCommit',
   'beforeEntityCommit',
   'beforeEntityCreate',
+  'callbackExecutor',
+  'callbackProfile',
+  'compileCallbacks',
+  'isCallbackProfiling',
   'onEntityCreate',
   'onEntitySchemaInfoCreate',
   'onFieldChanged',
   'onSchemaChanged',
-  'onSearchResult'
+  'onSearchResult',
+  'resetCallbackProfile',
+  'setCallbackProfiling',
+  'waitForDeferredCallbacks',
+  'SgCallbackExecutor'
 ]
 
 # Python imports
+import logging
 import os
+import Queue
 import socket
+import threading
+import time
 
 # This module imports
 import ShotgunORM
@@ -107,6 +119,10 @@ def _defaultOnEntitySchemaInfoCreate(sgEntitySchemaInfo):
 def _defaultOnEntitySchemaInfoCreatePhaseTask(sgEntitySchemaInfo):
   colorField = sgEntitySchemaInfo.fieldInfo('color')
 
+  # The field may be ignored or missing from the schema.
+  if colorField == None:
+    return
+
   colorField._returnType = ShotgunORM.SgField.RETURN_TYPE_COLOR2
 
 def _defaultOnFieldChanged(sgField):
@@ -226,7 +242,503 @@ ON_SEARCH_RESULT_CBS = {
   ]
 }
 
-def addAfterEntityCommit(cb, filterName='*', description=''):
+################################################################################
+#
+# Callback dispatch
+#
+# Each callback table is compiled into tuples of callables per filter lookup
+# the first time it is dispatched.  The tuples are rebuilt whenever callbacks
+# are registered through the add/append functions, call compileCallbacks() after
+# modifying one of the *_CBS dicts directly.
+#
+################################################################################
+
+# Default callbacks that only log debug messages, skipped during dispatch unless
+# the callback logger has debug enabled.  The level is checked on each dispatch
+# and the tuples are rebuilt when it changes.
+_NOOP_CALLBACKS = set(
+  [
+    _defaultAfterEntityCommit,
+    _defaultBeforeEntityCommit,
+    _defaultOnEntityCreate,
+    _defaultOnFieldChanged,
+    _defaultOnSearchResult
+  ]
+)
+
+_PROFILE_LOCK = threading.Lock()
+_PROFILE = {}
+_PROFILING = None
+
+_EXECUTOR_LOCK = threading.Lock()
+_EXECUTOR = None
+
+class SgCallbackExecutor(object):
+  '''
+  Runs deferred callbacks on background threads.
+
+  Each call is routed to a worker by its ordering key, callbacks dispatched for
+  the same Entity always run on the same worker in the order they were
+  dispatched.  Worker queues are bounded, when a queue is full the dispatching
+  thread blocks until there is room.  Deferred callbacks dispatched from a
+  worker thread run immediately when the target queue is full.
+
+  Exceptions raised by deferred callbacks are logged and their return values
+  are ignored.
+  '''
+
+  def __repr__(self):
+    return '<SgCallbackExecutor(workers:%d, maxQueueSize:%d)>' % (
+      len(self.__queues),
+      self.__maxQueueSize
+    )
+
+  def __init__(self, workers=None, maxQueueSize=None):
+    if workers == None:
+      workers = ShotgunORM.config.CALLBACK_EXECUTOR_WORKERS
+
+    if maxQueueSize == None:
+      maxQueueSize = ShotgunORM.config.CALLBACK_EXECUTOR_QUEUE_SIZE
+
+    self.__maxQueueSize = max(0, int(maxQueueSize))
+    self.__queues = []
+    self.__threads = set()
+
+    for i in xrange(max(1, int(workers))):
+      q = Queue.Queue(self.__maxQueueSize)
+
+      thread = threading.Thread(
+        name='SgCallbackExecutor.worker%d' % i,
+        target=SgCallbackExecutorWorker,
+        args=[q]
+      )
+
+      thread.setDaemon(True)
+
+      self.__queues.append(q)
+
+      thread.start()
+
+      self.__threads.add(thread.ident)
+
+  def isWorkerThread(self):
+    '''
+    Returns True if called from one of the executors worker threads.
+    '''
+
+    return threading.current_thread().ident in self.__threads
+
+  def join(self):
+    '''
+    Blocks until all queued callbacks have run.
+    '''
+
+    for q in self.__queues:
+      q.join()
+
+  def maxQueueSize(self):
+    '''
+    Returns the max number of queued callbacks per worker, 0 is unbounded.
+    '''
+
+    return self.__maxQueueSize
+
+  def pending(self):
+    '''
+    Returns the number of queued callbacks.
+    '''
+
+    return sum([q.qsize() for q in self.__queues])
+
+  def submit(self, key, cb, args):
+    '''
+    Queues the callback to run with args on the worker for key.
+
+    Args:
+      * (object) key:
+        Hashable ordering key, callbacks with the same key run in order.
+
+      * (function) cb:
+        Callback to run.
+
+      * (tuple) args:
+        Callback args.
+    '''
+
+    q = self.__queues[hash(key) % len(self.__queues)]
+
+    if self.isWorkerThread():
+      try:
+        q.put_nowait((cb, args))
+      except Queue.Full:
+        _runDeferred(cb, args)
+    else:
+      q.put((cb, args))
+
+  def workers(self):
+    '''
+    Returns the number of worker threads.
+    '''
+
+    return len(self.__queues)
+
+def _runDeferred(cb, args):
+  '''
+  Internal function!
+
+  Runs a deferred callback logging any exception.
+  '''
+
+  try:
+    cb(*args)
+  except Exception, e:
+    ShotgunORM.LoggerCallback.error(
+      'deferred callback %s raised: %s' % (cb, e)
+    )
+
+def SgCallbackExecutorWorker(q):
+  '''
+  Internal function!
+
+  Worker thread of a SgCallbackExecutor.
+  '''
+
+  while True:
+    try:
+      cb, args = q.get()
+    except:
+      # Daemon threads can wake up while the interpreter is shutting down.
+      return
+
+    try:
+      _runDeferred(cb, args)
+    finally:
+      del cb
+      del args
+
+      q.task_done()
+
+def _deferredCallback(cb, deferKey):
+  '''
+  Internal function!
+
+  Returns a wrapper that submits the callback to the callback executor.
+  '''
+
+  def deferred(*args):
+    callbackExecutor().submit(deferKey(args), cb, args)
+
+  return deferred
+
+def callbackExecutor():
+  '''
+  Returns the SgCallbackExecutor that runs deferred callbacks.
+
+  The executor is created the first time a deferred callback is dispatched
+  using config.CALLBACK_EXECUTOR_WORKERS and config.CALLBACK_EXECUTOR_QUEUE_SIZE.
+  '''
+
+  global _EXECUTOR
+
+  if _EXECUTOR == None:
+    with _EXECUTOR_LOCK:
+      if _EXECUTOR == None:
+        _EXECUTOR = SgCallbackExecutor()
+
+  return _EXECUTOR
+
+def waitForDeferredCallbacks():
+  '''
+  Blocks until all queued deferred callbacks have run.
+  '''
+
+  if _EXECUTOR != None:
+    _EXECUTOR.join()
+
+class SgCallbackDispatch(object):
+  '''
+  Internal!
+
+  Precompiled dispatch tuples for a callback table.
+  '''
+
+  def __init__(self, name, cbTable, filterNames=None, deferKey=None):
+    self.name = name
+    self.table = cbTable
+    self.filterNames = filterNames
+    self.deferKey = deferKey
+
+    self.reset()
+
+  def callbacks(self, key):
+    '''
+    Returns the tuple of callables to run for the key followed by the callables
+    registered for "*".
+    '''
+
+    try:
+      return self.cache[key]
+    except KeyError:
+      pass
+
+    if self.filterNames == None:
+      filterNames = (key, '*')
+    else:
+      filterNames = tuple(self.filterNames(key)) + ('*', )
+
+    skipNoop = self.checkDebugLevel()
+    profiling = isCallbackProfiling()
+
+    result = []
+
+    for filterName in filterNames:
+      if filterName == None:
+        continue
+
+      for i in self.table.get(filterName, []):
+        cb = i['cb']
+
+        if skipNoop and cb in _NOOP_CALLBACKS:
+          continue
+
+        if profiling:
+          cb = _profiledCallback(self.name, filterName, i)
+
+        if i.get('deferred', False) and self.deferKey != None:
+          cb = _deferredCallback(cb, self.deferKey)
+
+        result.append(cb)
+
+    result = tuple(result)
+
+    self.cache[key] = result
+
+    return result
+
+  def checkDebugLevel(self):
+    '''
+    Returns True when the default no-op callbacks are skipped, which is when
+    the callback logger is not at the DEBUG level.
+
+    Clears the compiled dispatch tuples if the loggers level has changed since
+    they were compiled.
+    '''
+
+    skipNoop = not ShotgunORM.LoggerCallback.isEnabledFor(logging.DEBUG)
+
+    if skipNoop != self.skipNoop:
+      self.reset()
+
+      self.skipNoop = skipNoop
+
+    return skipNoop
+
+  def isActive(self):
+    '''
+    Returns False when no callbacks other then the default no-op callbacks are
+    registered.
+    '''
+
+    skipNoop = self.checkDebugLevel()
+
+    if self.active == None:
+      active = False
+
+      for cbs in self.table.values():
+        for i in cbs:
+          if not (skipNoop and i['cb'] in _NOOP_CALLBACKS):
+            active = True
+
+            break
+
+      self.active = active
+
+    return self.active
+
+  def reset(self):
+    '''
+    Clears the compiled dispatch tuples.
+    '''
+
+    self.cache = {}
+    self.active = None
+    self.skipNoop = None
+
+def _profiledCallback(cbType, filterName, cbData):
+  '''
+  Internal function!
+
+  Returns a wrapper around the callback that records its run time.
+  '''
+
+  cb = cbData['cb']
+
+  key = (cbType, filterName, cbData.get('description', ''), cb)
+
+  def profiled(*args):
+    start = time.time()
+
+    try:
+      return cb(*args)
+    finally:
+      ellapsed = time.time() - start
+
+      with _PROFILE_LOCK:
+        try:
+          stats = _PROFILE[key]
+        except KeyError:
+          stats = [0, 0.0, 0.0]
+
+          _PROFILE[key] = stats
+
+        stats[0] += 1
+        stats[1] += ellapsed
+
+        if ellapsed > stats[2]:
+          stats[2] = ellapsed
+
+  return profiled
+
+def callbackProfile():
+  '''
+  Returns a list of timing stats for each callback that ran while callback
+  profiling was enabled, sorted slowest total time first.
+
+  Each item is a dict containing the keys "callback", "filter", "description",
+  "cb", "calls", "total" and "max".
+  '''
+
+  with _PROFILE_LOCK:
+    items = _PROFILE.items()
+
+  result = []
+
+  for key, stats in items:
+    result.append(
+      {
+        'callback': key[0],
+        'filter': key[1],
+        'description': key[2],
+        'cb': key[3],
+        'calls': stats[0],
+        'total': stats[1],
+        'max': stats[2]
+      }
+    )
+
+  result.sort(key=lambda x: x['total'], reverse=True)
+
+  return result
+
+def compileCallbacks():
+  '''
+  Rebuilds the callback dispatch tuples.
+
+  Called automatically when callbacks are added, call it manually after
+  modifying one of the *_CBS dicts directly.
+  '''
+
+  for dispatch in _DISPATCHERS:
+    dispatch.reset()
+
+def isCallbackProfiling():
+  '''
+  Returns True if callback profiling is enabled.
+  '''
+
+  if _PROFILING != None:
+    return _PROFILING
+
+  config = getattr(ShotgunORM, 'config', None)
+
+  return getattr(config, 'ENABLE_CALLBACK_PROFILING', False)
+
+def resetCallbackProfile():
+  '''
+  Clears the callback timing stats.
+  '''
+
+  with _PROFILE_LOCK:
+    _PROFILE.clear()
+
+def setCallbackProfiling(enabled):
+  '''
+  Enables or disables timing of each callback, see callbackProfile().
+
+  Pass None to use config.ENABLE_CALLBACK_PROFILING.
+  '''
+
+  global _PROFILING
+
+  if enabled != None:
+    enabled = bool(enabled)
+
+  _PROFILING = enabled
+
+  compileCallbacks()
+
+_AFTER_ENTITY_COMMIT_DISPATCH = SgCallbackDispatch(
+  'afterEntityCommit',
+  AFTER_ENTITY_COMMIT_CBS,
+  deferKey=lambda args: id(args[0])
+)
+
+_BEFORE_ENTITY_COMMIT_DISPATCH = SgCallbackDispatch(
+  'beforeEntityCommit',
+  BEFORE_ENTITY_COMMIT_CBS
+)
+
+_BEFORE_ENTITY_CREATE_DISPATCH = SgCallbackDispatch(
+  'beforeEntityCreate',
+  BEFORE_ENTITY_CREATE_CBS
+)
+
+# Keyed by (Entity type, label) where label is None for non-custom Entities.
+_ON_ENTITY_CREATE_DISPATCH = SgCallbackDispatch(
+  'onEntityCreate',
+  ON_ENTITY_CREATE_CBS,
+  lambda key: key,
+  lambda args: id(args[0])
+)
+
+_ON_ENTITY_SCHEMA_INFO_CREATE_DISPATCH = SgCallbackDispatch(
+  'onEntitySchemaInfoCreate',
+  ON_ENTITY_SCHEMA_INFO_CREATE_CBS,
+  lambda key: key
+)
+
+# Keyed by (Entity type, field name).
+_ON_FIELD_CHANGED_DISPATCH = SgCallbackDispatch(
+  'onFieldChanged',
+  ON_FIELD_CHANGED_CBS,
+  lambda key: (key[0] + '.' + key[1], key[1]),
+  lambda args: id(args[0].parentEntity())
+)
+
+_ON_SCHEMA_CHANGED_DISPATCH = SgCallbackDispatch(
+  'onSchemaChanged',
+  ON_SCHEMA_CHANGED_CBS,
+  deferKey=lambda args: args[0].url()
+)
+
+_ON_SEARCH_RESULT_DISPATCH = SgCallbackDispatch(
+  'onSearchResult',
+  ON_SEARCH_RESULT_CBS,
+  deferKey=lambda args: args[1]
+)
+
+_DISPATCHERS = [
+  _AFTER_ENTITY_COMMIT_DISPATCH,
+  _BEFORE_ENTITY_COMMIT_DISPATCH,
+  _BEFORE_ENTITY_CREATE_DISPATCH,
+  _ON_ENTITY_CREATE_DISPATCH,
+  _ON_ENTITY_SCHEMA_INFO_CREATE_DISPATCH,
+  _ON_FIELD_CHANGED_DISPATCH,
+  _ON_SCHEMA_CHANGED_DISPATCH,
+  _ON_SEARCH_RESULT_DISPATCH
+]
+
+def addAfterEntityCommit(cb, filterName='*', description='', deferred=False):
   '''
   Adds the callback and places it at the front of the afterEntityCommit
   callback list.
@@ -239,6 +751,10 @@ def addAfterEntityCommit(cb, filterName='*', description=''):
 
     def myCallback(sgEntity, sgBatchData, sgBatchResult, sgCommitData, sgDryRun, sgCommitError):
       ...
+
+  When deferred is True the callback runs on the callback executor instead of
+  the dispatching thread and its return value is ignored, see
+  callbackExecutor().
   '''
 
   if filterName in [None, '']:
@@ -246,7 +762,8 @@ def addAfterEntityCommit(cb, filterName='*', description=''):
 
   data = {
     'cb': cb,
-    'description': description
+    'description': description,
+    'deferred': bool(deferred)
   }
 
   try:
@@ -254,7 +771,9 @@ def addAfterEntityCommit(cb, filterName='*', description=''):
   except:
     AFTER_ENTITY_COMMIT_CBS[filterName] = [data]
 
-def appendAfterEntityCommit(cb, filterName='*', description=''):
+  compileCallbacks()
+
+def appendAfterEntityCommit(cb, filterName='*', description='', deferred=False):
   '''
   Adds the callback and places it at the end of the afterEntityCommit
   callback list.
@@ -267,6 +786,10 @@ def appendAfterEntityCommit(cb, filterName='*', description=''):
 
     def myCallback(sgEntity, sgBatchData, sgBatchResult, sgCommitData, sgDryRun, sgCommitError):
       ...
+
+  When deferred is True the callback runs on the callback executor instead of
+  the dispatching thread and its return value is ignored, see
+  callbackExecutor().
   '''
 
   if filterName in [None, '']:
@@ -274,7 +797,8 @@ def appendAfterEntityCommit(cb, filterName='*', description=''):
 
   data = {
     'cb': cb,
-    'description': description
+    'description': description,
+    'deferred': bool(deferred)
   }
 
   try:
@@ -282,6 +806,8 @@ def appendAfterEntityCommit(cb, filterName='*', description=''):
   except:
     AFTER_ENTITY_COMMIT_CBS[filterName] = [data]
 
+  compileCallbacks()
+
 def addBeforeEntityCommit(cb, filterName='*', description=''):
   '''
   Adds the callback and places it at the front of the beforeEntityCommit
@@ -310,6 +836,8 @@ def addBeforeEntityCommit(cb, filterName='*', description=''):
   except:
     BEFORE_ENTITY_COMMIT_CBS[filterName] = [data]
 
+  compileCallbacks()
+
 def appendBeforeEntityCommit(cb, filterName='*', description=''):
   '''
   Adds the callback and places it at the end of the beforeEntityCommit
@@ -338,6 +866,8 @@ def appendBeforeEntityCommit(cb, filterName='*', description=''):
   except:
     BEFORE_ENTITY_COMMIT_CBS[filterName] = [data]
 
+  compileCallbacks()
+
 def addBeforeEntityCreate(cb, filterName='*', description=''):
   '''
   Adds the callback and places it at the front of the beforeEntityCreate
@@ -359,6 +889,8 @@ def addBeforeEntityCreate(cb, filterName='*', description=''):
   except:
     BEFORE_ENTITY_CREATE_CBS[filterName] = [data]
 
+  compileCallbacks()
+
 def appendBeforeEntityCreate(cb, filterName='*', description=''):
   '''
   Adds the callback and places it at the end of the beforeEntityCreate
@@ -380,7 +912,9 @@ def appendBeforeEntityCreate(cb, filterName='*', description=''):
   except:
     BEFORE_ENTITY_CREATE_CBS[filterName] = [data]
 
-def addOnEntityCreate(cb, filterName='*', description=''):
+  compileCallbacks()
+
+def addOnEntityCreate(cb, filterName='*', description='', deferred=False):
   '''
   Adds the callback and places it at the front of the onEntityCreate callback
   list.
@@ -393,6 +927,10 @@ def addOnEntityCreate(cb, filterName='*', description=''):
 
     def myCallback(sgEntity):
       ...
+
+  When deferred is True the callback runs on the callback executor instead of
+  the dispatching thread and its return value is ignored, see
+  callbackExecutor().
   '''
 
   if filterName in [None, '']:
@@ -400,7 +938,8 @@ def addOnEntityCreate(cb, filterName='*', description=''):
 
   data = {
     'cb': cb,
-    'description': description
+    'description': description,
+    'deferred': bool(deferred)
   }
 
   try:
@@ -408,7 +947,9 @@ def addOnEntityCreate(cb, filterName='*', description=''):
   except:
     ON_ENTITY_CREATE_CBS[filterName] = [data]
 
-def appendOnEntityCreate(cb, filterName='*', description=''):
+  compileCallbacks()
+
+def appendOnEntityCreate(cb, filterName='*', description='', deferred=False):
   '''
   Adds the callback and places it at the end of the onEntityCreate callback
   list.
@@ -421,6 +962,10 @@ def appendOnEntityCreate(cb, filterName='*', description=''):
 
     def myCallback(sgEntity):
       ...
+
+  When deferred is True the callback runs on the callback executor instead of
+  the dispatching thread and its return value is ignored, see
+  callbackExecutor().
   '''
 
   if filterName in [None, '']:
@@ -428,7 +973,8 @@ def appendOnEntityCreate(cb, filterName='*', description=''):
 
   data = {
     'cb': cb,
-    'description': description
+    'description': description,
+    'deferred': bool(deferred)
   }
 
   try:
@@ -436,6 +982,8 @@ def appendOnEntityCreate(cb, filterName='*', description=''):
   except:
     ON_ENTITY_CREATE_CBS[filterName] = [data]
 
+  compileCallbacks()
+
 def addOnEntitySchemaInfoCreate(cb, filterName='*', description=''):
   '''
   Adds the callback and places it at the front of the onEntityInfoCreate
@@ -464,6 +1012,8 @@ def addOnEntitySchemaInfoCreate(cb, filterName='*', description=''):
   except:
     ON_ENTITY_SCHEMA_INFO_CREATE_CBS[filterName] = [data]
 
+  compileCallbacks()
+
 def appendOnEntitySchemaInfoCreate(cb, filterName='*', description=''):
   '''
   Adds the callback and places it at the end of the onEntityInfoCreate
@@ -492,7 +1042,9 @@ def appendOnEntitySchemaInfoCreate(cb, filterName='*', description=''):
   except:
     ON_ENTITY_SCHEMA_INFO_CREATE_CBS[filterName] = [data]
 
-def addOnFieldChanged(cb, filterName='*', description=''):
+  compileCallbacks()
+
+def addOnFieldChanged(cb, filterName='*', description='', deferred=False):
   '''
   Adds the callback and places it at the front of the onFieldChanged callback
   list.
@@ -505,6 +1057,10 @@ def addOnFieldChanged(cb, filterName='*', description=''):
 
     def myCallback(sgField):
       ...
+
+  When deferred is True the callback runs on the callback executor instead of
+  the dispatching thread and its return value is ignored, see
+  callbackExecutor().
   '''
 
   if filterName in [None, '']:
@@ -512,7 +1068,8 @@ def addOnFieldChanged(cb, filterName='*', description=''):
 
   data = {
     'cb': cb,
-    'description': description
+    'description': description,
+    'deferred': bool(deferred)
   }
 
   try:
@@ -520,7 +1077,9 @@ def addOnFieldChanged(cb, filterName='*', description=''):
   except:
     ON_FIELD_CHANGED_CBS[filterName] = [data]
 
-def appendOnFieldChanged(cb, filterName='*', description=''):
+  compileCallbacks()
+
+def appendOnFieldChanged(cb, filterName='*', description='', deferred=False):
   '''
   Adds the callback and places it at the end of the onFieldChanged callback
   list.
@@ -533,6 +1092,10 @@ def appendOnFieldChanged(cb, filterName='*', description=''):
 
     def myCallback(sgField):
       ...
+
+  When deferred is True the callback runs on the callback executor instead of
+  the dispatching thread and its return value is ignored, see
+  callbackExecutor().
   '''
 
   if filterName in [None, '']:
@@ -540,7 +1103,8 @@ def appendOnFieldChanged(cb, filterName='*', description=''):
 
   data = {
     'cb': cb,
-    'description': description
+    'description': description,
+    'deferred': bool(deferred)
   }
 
   try:
@@ -548,7 +1112,9 @@ def appendOnFieldChanged(cb, filterName='*', description=''):
   except:
     ON_FIELD_CHANGED_CBS[filterName] = [data]
 
-def addOnSchemaChanged(cb, filterName='*', description=''):
+  compileCallbacks()
+
+def addOnSchemaChanged(cb, filterName='*', description='', deferred=False):
   '''
   Adds the callback and places it at the front of the onSchemaChanged callback
   list.
@@ -561,6 +1127,10 @@ def addOnSchemaChanged(cb, filterName='*', description=''):
 
     def myCallback(sgSchema):
       ...
+
+  When deferred is True the callback runs on the callback executor instead of
+  the dispatching thread and its return value is ignored, see
+  callbackExecutor().
   '''
 
   if filterName in [None, '']:
@@ -568,7 +1138,8 @@ def addOnSchemaChanged(cb, filterName='*', description=''):
 
   data = {
     'cb': cb,
-    'description': description
+    'description': description,
+    'deferred': bool(deferred)
   }
 
   try:
@@ -576,7 +1147,9 @@ def addOnSchemaChanged(cb, filterName='*', description=''):
   except:
     ON_SCHEMA_CHANGED_CBS[filterName] = [data]
 
-def appendOnSchemaChanged(cb, filterName='*', description=''):
+  compileCallbacks()
+
+def appendOnSchemaChanged(cb, filterName='*', description='', deferred=False):
   '''
   Adds the callback and places it at the end of the onSchemaChanged callback
   list.
@@ -589,6 +1162,10 @@ def appendOnSchemaChanged(cb, filterName='*', description=''):
 
     def myCallback(sgSchema):
       ...
+
+  When deferred is True the callback runs on the callback executor instead of
+  the dispatching thread and its return value is ignored, see
+  callbackExecutor().
   '''
 
   if filterName in [None, '']:
@@ -596,7 +1173,8 @@ def appendOnSchemaChanged(cb, filterName='*', description=''):
 
   data = {
     'cb': cb,
-    'description': description
+    'description': description,
+    'deferred': bool(deferred)
   }
 
   try:
@@ -604,9 +1182,16 @@ def appendOnSchemaChanged(cb, filterName='*', description=''):
   except:
     ON_SCHEMA_CHANGED_CBS[filterName] = [data]
 
-def addOnSearchResult(cb, filterName='*', description=''):
+  compileCallbacks()
+
+def addOnSearchResult(cb, filterName='*', description='', deferred=False):
   '''
+  Adds the callback and places it at the front of the onSearchResult callback
+  list.
 
+  When deferred is True the callback runs on the callback executor instead of
+  the dispatching thread and its return value is ignored, see
+  callbackExecutor().
   '''
 
   if filterName in [None, '']:
@@ -614,7 +1199,8 @@ def addOnSearchResult(cb, filterName='*', description=''):
 
   data = {
     'cb': cb,
-    'description': description
+    'description': description,
+    'deferred': bool(deferred)
   }
 
   try:
@@ -622,9 +1208,16 @@ def addOnSearchResult(cb, filterName='*', description=''):
   except:
     ON_SEARCH_RESULT_CBS[filterName] = [data]
 
-def appendOnSearchResult(cb, filterName='*', description=''):
+  compileCallbacks()
+
+def appendOnSearchResult(cb, filterName='*', description='', deferred=False):
   '''
+  Adds the callback and places it at the end of the onSearchResult callback
+  list.
 
+  When deferred is True the callback runs on the callback executor instead of
+  the dispatching thread and its return value is ignored, see
+  callbackExecutor().
   '''
 
   if filterName in [None, '']:
@@ -632,7 +1225,8 @@ def appendOnSearchResult(cb, filterName='*', description=''):
 
   data = {
     'cb': cb,
-    'description': description
+    'description': description,
+    'deferred': bool(deferred)
   }
 
   try:
@@ -640,6 +1234,8 @@ def appendOnSearchResult(cb, filterName='*', description=''):
   except:
     ON_SEARCH_RESULT_CBS[filterName] = [data]
 
+  compileCallbacks()
+
 def afterEntityCommit(sgEntity, sgBatchData, sgBatchResult, sgCommitData, sgDryRun, sgCommitError):
   '''
   This function is called after an Entity has been committed to Shotgun.
@@ -652,7 +1248,8 @@ def afterEntityCommit(sgEntity, sgBatchData, sgBatchResult, sgCommitData, sgDryR
       List of Shotgun formatted batch commit data.
 
     * (list) sgBatchResult:
-      Result returned from Shotgun for the commit.
+      Result returned from Shotgun for the commit, shared with the batch result
+      and must not be modified.
 
     * (dict) sgCommitData:
       Dictionary used to pass user data between beforeCommit() and
@@ -667,18 +1264,13 @@ def afterEntityCommit(sgEntity, sgBatchData, sgBatchResult, sgCommitData, sgDryR
       perform cleanup operations because the commit failed.
   '''
 
-  entityType = sgEntity.type
+  dispatch = _AFTER_ENTITY_COMMIT_DISPATCH
 
-  if AFTER_ENTITY_COMMIT_CBS.has_key(entityType):
-    cbs = AFTER_ENTITY_COMMIT_CBS[entityType]
+  if not dispatch.isActive():
+    return
 
-    for i in cbs:
-      i['cb'](sgEntity, sgBatchData, sgBatchResult, sgCommitData, sgDryRun, sgCommitError)
-
-  cbs = AFTER_ENTITY_COMMIT_CBS['*']
-
-  for i in cbs:
-    i['cb'](sgEntity, sgBatchData, sgBatchResult, sgCommitData, sgDryRun, sgCommitError)
+  for cb in dispatch.callbacks(sgEntity.type):
+    cb(sgEntity, sgBatchData, sgBatchResult, sgCommitData, sgDryRun, sgCommitError)
 
 def beforeEntityCommit(sgEntity, sgBatchData, sgCommitData, sgDryRun):
   '''
@@ -700,18 +1292,13 @@ def beforeEntityCommit(sgEntity, sgBatchData, sgCommitData, sgDryRun):
       it is only in a test phase.
   '''
 
-  entityType = sgEntity.type
-
-  if BEFORE_ENTITY_COMMIT_CBS.has_key(entityType):
-    cbs = BEFORE_ENTITY_COMMIT_CBS[entityType]
-
-    for i in cbs:
-      i['cb'](sgEntity, sgCommitType, sgCommitData, sgDryRun)
+  dispatch = _BEFORE_ENTITY_COMMIT_DISPATCH
 
-  cbs = BEFORE_ENTITY_COMMIT_CBS['*']
+  if not dispatch.isActive():
+    return
 
-  for i in cbs:
-    i['cb'](sgEntity, sgBatchData, sgCommitData, sgDryRun)
+  for cb in dispatch.callbacks(sgEntity.type):
+    cb(sgEntity, sgBatchData, sgCommitData, sgDryRun)
 
 def beforeEntityCreate(sgConnection, sgEntityType, sgData):
   '''
@@ -721,24 +1308,16 @@ def beforeEntityCreate(sgConnection, sgEntityType, sgData):
   initialize the SgEntity are passed to each callback.
   '''
 
-  cbs = BEFORE_ENTITY_CREATE_CBS.get(sgEntityType, [])
-
-  for i in cbs:
-    try:
-      updated = i['cb'](sgConnection, sgEntityType, sgData)
-
-      if isinstance(updated, list):
-        sgData = updated
-    except Exception, e:
-      print e
+  dispatch = _BEFORE_ENTITY_CREATE_DISPATCH
 
-  cbs = BEFORE_ENTITY_CREATE_CBS['*']
+  if not dispatch.isActive():
+    return sgData
 
-  for i in cbs:
+  for cb in dispatch.callbacks(sgEntityType):
     try:
-      updated = i['cb'](sgConnection, sgEntityType, sgData)
+      updated = cb(sgConnection, sgEntityType, sgData)
 
-      if isinstance(updated, list):
+      if isinstance(updated, dict):
         sgData = updated
     except Exception, e:
       print e
@@ -751,32 +1330,19 @@ def onEntityCreate(sgEntity):
   confused with when an Entity is created in the Shotgun database.
   '''
 
-  entityType = sgEntity.type
-
-  if ON_ENTITY_CREATE_CBS.has_key(entityType):
-    cbs = ON_ENTITY_CREATE_CBS[entityType]
+  dispatch = _ON_ENTITY_CREATE_DISPATCH
 
-    for i in cbs:
-      try:
-        i['cb'](sgEntity)
-      except Exception, e:
-        print e
+  if not dispatch.isActive():
+    return
 
   if sgEntity.isCustom():
-    if ON_ENTITY_CREATE_CBS.has_key(sgEntity.label()):
-      cbs = ON_ENTITY_CREATE_CBS[sgEntity.label()]
-
-      for i in cbs:
-        try:
-          i['cb'](sgEntity)
-        except Exception, e:
-          print e
-
-  cbs = ON_ENTITY_CREATE_CBS['*']
+    key = (sgEntity.type, sgEntity.label())
+  else:
+    key = (sgEntity.type, None)
 
-  for i in cbs:
+  for cb in dispatch.callbacks(key):
     try:
-      i['cb'](sgEntity)
+      cb(sgEntity)
     except Exception, e:
       print e
 
@@ -785,32 +1351,19 @@ def onEntitySchemaInfoCreate(sgEntityInfo):
   This function is called anytime an Entity info object is created.
   '''
 
-  entityType = sgEntityInfo.name()
+  dispatch = _ON_ENTITY_SCHEMA_INFO_CREATE_DISPATCH
 
-  if ON_ENTITY_SCHEMA_INFO_CREATE_CBS.has_key(entityType):
-    cbs = ON_ENTITY_SCHEMA_INFO_CREATE_CBS[entityType]
-
-    for i in cbs:
-      try:
-        i['cb'](sgEntityInfo)
-      except Exception, e:
-        print e
+  if not dispatch.isActive():
+    return
 
   if sgEntityInfo.isCustom():
-    if ON_ENTITY_SCHEMA_INFO_CREATE_CBS.has_key(sgEntityInfo.label()):
-      cbs = ON_ENTITY_SCHEMA_INFO_CREATE_CBS[sgEntityInfo.label()]
+    key = (sgEntityInfo.name(), sgEntityInfo.label())
+  else:
+    key = (sgEntityInfo.name(), None)
 
-      for i in cbs:
-        try:
-          i['cb'](sgEntityInfo)
-        except Exception, e:
-          print e
-
-  cbs = ON_ENTITY_SCHEMA_INFO_CREATE_CBS['*']
-
-  for i in cbs:
+  for cb in dispatch.callbacks(key):
     try:
-      i['cb'](sgEntityInfo)
+      cb(sgEntityInfo)
     except Exception, e:
       print e
 
@@ -825,33 +1378,14 @@ def onFieldChanged(sgField):
     4: When a fields SgField.changed() function is called.
   '''
 
-  entityFieldName = sgField.parentEntity().type + '.' + sgField.name()
-
-  if ON_FIELD_CHANGED_CBS.has_key(entityFieldName):
-    cbs = ON_FIELD_CHANGED_CBS[entityFieldName]
+  dispatch = _ON_FIELD_CHANGED_DISPATCH
 
-    for i in cbs:
-      try:
-        i['cb'](sgField)
-      except Exception, e:
-        print e
-
-  entityFieldName = sgField.name()
+  if not dispatch.isActive():
+    return
 
-  if ON_FIELD_CHANGED_CBS.has_key(entityFieldName):
-    cbs = ON_FIELD_CHANGED_CBS[entityFieldName]
-
-    for i in cbs:
-      try:
-        i['cb'](sgField)
-      except Exception, e:
-        print e
-
-  cbs = ON_FIELD_CHANGED_CBS['*']
-
-  for i in cbs:
+  for cb in dispatch.callbacks((sgField.parentEntity().type, sgField.name())):
     try:
-      i['cb'](sgField)
+      cb(sgField)
     except Exception, e:
       print e
 
@@ -860,24 +1394,16 @@ def onSchemaChanged(sgSchema):
   Called whenever a SgSchema initializes or rebuilds.
   '''
 
-  url = sgSchema.url()
-
   _defaultOnSchemaChanged(sgSchema)
 
-  if ON_SCHEMA_CHANGED_CBS.has_key(url):
-    cbs = ON_SCHEMA_CHANGED_CBS[url]
+  dispatch = _ON_SCHEMA_CHANGED_DISPATCH
 
-    for i in cbs:
-      try:
-        i['cb'](sgSchema)
-      except Exception, e:
-        print e
-
-  cbs = ON_SCHEMA_CHANGED_CBS['*']
+  if not dispatch.isActive():
+    return
 
-  for i in cbs:
+  for cb in dispatch.callbacks(sgSchema.url()):
     try:
-      i['cb'](sgSchema)
+      cb(sgSchema)
     except Exception, e:
       print e
 
@@ -886,25 +1412,17 @@ def onSearchResult(sgConnection, sgEntityType, sgFields, sgResults):
   Called whenever a Shotgun search is performed.
   '''
 
-  cbs = ON_SEARCH_RESULT_CBS.get(sgEntityType, [])
+  dispatch = _ON_SEARCH_RESULT_DISPATCH
+
+  if not dispatch.isActive():
+    return sgResults
 
   if sgFields == None:
     sgFields = []
 
-  for i in cbs:
-    try:
-      updated = i['cb'](sgConnection, sgEntityType, list(sgFields), sgResults)
-
-      if isinstance(updated, list):
-        sgResults = updated
-    except Exception, e:
-      print e
-
-  cbs = ON_SEARCH_RESULT_CBS['*']
-
-  for i in cbs:
+  for cb in dispatch.callbacks(sgEntityType):
     try:
-      updated = i['cb'](sgConnection, sgEntityType, list(sgFields), sgResults)
+      updated = cb(sgConnection, sgEntityType, list(sgFields), sgResults)
 
       if isinstance(updated, list):
         sgResults = updated
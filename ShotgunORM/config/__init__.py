@@ -39,11 +39,34 @@
 ################################################################################
 
 __all__ = [
+  'BATCH_CHUNK_BYTES',
+  'BATCH_CHUNK_SIZE',
+  'BATCH_MAX_WORKERS',
+  'BULK_CREATE_CHUNK_SIZE',
+  'CALLBACK_EXECUTOR_QUEUE_SIZE',
+  'CALLBACK_EXECUTOR_WORKERS',
+  'CONNECTION_METRICS_PAYLOAD_SIZE',
   'DEFAULT_CONNECTION_CACHING',
   'DISABLE_FIELD_VALIDATE_ON_SET_VALUE',
+  'ENABLE_CALLBACK_PROFILING',
+  'ENABLE_CONNECTION_METRICS',
   'ENABLE_FIELD_QUERY_PROFILING',
+  'ENABLE_HOT_PATH_DEBUG_LOGGING',
+  'ENABLE_N_PLUS_ONE_DETECTION',
   'ENTITY_DIR_INCLUDE_FIELDS',
-  'SHOTGUNAPI_NAME'
+  'FIELD_QUERY_PROFILE_APPLY',
+  'FIELD_QUERY_PROFILE_FILE',
+  'FIELD_QUERY_PROFILE_MIN_COUNT',
+  'FIELD_QUERY_PROFILE_TEMPLATE',
+  'LAZY_IMPORT',
+  'N_PLUS_ONE_THRESHOLD',
+  'N_PLUS_ONE_WINDOW',
+  'SHOTGUNAPI_NAME',
+  'UNDO_MAX_ACTIONS',
+  'UNDO_MAX_BYTES',
+  'UNDO_SPILL_DIR',
+  'WRITE_BEHIND_MAX_DELAY',
+  'WRITE_BEHIND_MAX_SIZE'
 ]
 
 # Python imports
@@ -63,6 +86,81 @@ import ShotgunORM
 
 SHOTGUNAPI_NAME = os.getenv('PY_SHOTGUNAPI_NAME', 'shotgun_api3')
 
+################################################################################
+#
+# Default chunking of SgConnection.batch() calls.
+#
+# Committing thousands of Entities in a single batch call produces a payload
+# the server may reject or time out on.  When either limit is greater than zero
+# batches are split into chunks of at most BATCH_CHUNK_SIZE requests and/or
+# BATCH_CHUNK_BYTES of JSON payload, each chunk is its own transaction.
+#
+# BATCH_MAX_WORKERS controls how many chunks are submitted concurrently, each
+# worker uses its own Shotgun API connection.
+#
+################################################################################
+
+BATCH_CHUNK_BYTES = int(
+  os.getenv('PY_SGORM_BATCH_CHUNK_BYTES', 0)
+)
+
+BATCH_CHUNK_SIZE = int(
+  os.getenv('PY_SGORM_BATCH_CHUNK_SIZE', 0)
+)
+
+BATCH_MAX_WORKERS = int(
+  os.getenv('PY_SGORM_BATCH_MAX_WORKERS', 1)
+)
+
+################################################################################
+#
+# Number of rows sent per batch call by SgConnection.bulkCreate().
+#
+################################################################################
+
+BULK_CREATE_CHUNK_SIZE = int(
+  os.getenv('PY_SGORM_BULK_CREATE_CHUNK_SIZE', 500)
+)
+
+################################################################################
+#
+# Callback executor used by callbacks registered with deferred=True.
+#
+# Deferred callbacks run on CALLBACK_EXECUTOR_WORKERS background threads, each
+# worker queues at most CALLBACK_EXECUTOR_QUEUE_SIZE callbacks (0 is unbounded)
+# before the dispatching thread blocks.
+#
+################################################################################
+
+CALLBACK_EXECUTOR_QUEUE_SIZE = int(
+  os.getenv('PY_SGORM_CALLBACK_EXECUTOR_QUEUE_SIZE', 10000)
+)
+
+CALLBACK_EXECUTOR_WORKERS = int(
+  os.getenv('PY_SGORM_CALLBACK_EXECUTOR_WORKERS', 1)
+)
+
+################################################################################
+#
+# Shotgun API call metrics.
+#
+# Every connection records the count, latency, rows returned, lock wait and
+# errors of its Shotgun API calls, see SgConnection.metrics().  Set
+# ENABLE_CONNECTION_METRICS to False to disable recording for new connections.
+#
+# Recording the payload size serializes the arguments of every call to JSON so
+# it is disabled by default.
+#
+################################################################################
+
+CONNECTION_METRICS_PAYLOAD_SIZE = bool(
+  os.getenv('PY_SGORM_CONNECTION_METRICS_PAYLOAD_SIZE', False)
+)
+
+ENABLE_CONNECTION_METRICS = bool(
+  os.getenv('PY_SGORM_ENABLE_CONNECTION_METRICS', True)
+)
+
 ################################################################################
 #
 # Controls the default value that connections use for enabling/disabling Entity
@@ -96,6 +194,20 @@ DISABLE_FIELD_VALIDATE_ON_SET_VALUE = bool(
   os.getenv('PY_SGORM_DISABLE_FIELD_VALIDATE_ON_SET_VALUE', False)
 )
 
+################################################################################
+#
+# Enables callback profiling.
+#
+# When enabled the run time of every callback is recorded, use
+# ShotgunORM.callbackProfile() to find slow callbacks.  Profiling can also be
+# toggled at runtime with ShotgunORM.setCallbackProfiling().
+#
+################################################################################
+
+ENABLE_CALLBACK_PROFILING = bool(
+  os.getenv('PY_SGORM_ENABLE_CALLBACK_PROFILING', False)
+)
+
 ################################################################################
 #
 # Enables field query profiling.
@@ -110,6 +222,90 @@ ENABLE_FIELD_QUERY_PROFILING = bool(
   os.getenv('PY_SGORM_ENABLE_FIELD_QUERY_PROFILING', False)
 )
 
+################################################################################
+#
+# Enables debug logging of hot code paths.
+#
+# Entity creation, find(), field validation and the query engine log debug
+# messages on every call when their loggers are at the DEBUG level.  Setting
+# this to False removes those messages from the hot paths entirely.  It can
+# also be toggled at runtime with ShotgunORM.setHotPathDebugging().
+#
+################################################################################
+
+ENABLE_HOT_PATH_DEBUG_LOGGING = bool(
+  os.getenv('PY_SGORM_ENABLE_HOT_PATH_DEBUG_LOGGING', True)
+)
+
+################################################################################
+#
+# Profile-guided default query fields.
+#
+# When FIELD_QUERY_PROFILE_FILE is set the field profiles stored in it are
+# loaded at the end of this module and, if field query profiling is enabled,
+# saved back to it at exit so the profiles accumulate across runs.
+#
+# When FIELD_QUERY_PROFILE_APPLY is enabled the fields accessed at least
+# FIELD_QUERY_PROFILE_MIN_COUNT times are added to the query template
+# FIELD_QUERY_PROFILE_TEMPLATE, so find() with fields=None prefetches them.
+#
+################################################################################
+
+FIELD_QUERY_PROFILE_APPLY = bool(
+  os.getenv('PY_SGORM_FIELD_QUERY_PROFILE_APPLY', True)
+)
+
+FIELD_QUERY_PROFILE_FILE = os.getenv('PY_SGORM_FIELD_QUERY_PROFILE_FILE', None)
+
+FIELD_QUERY_PROFILE_MIN_COUNT = int(
+  os.getenv('PY_SGORM_FIELD_QUERY_PROFILE_MIN_COUNT', 2)
+)
+
+FIELD_QUERY_PROFILE_TEMPLATE = os.getenv(
+  'PY_SGORM_FIELD_QUERY_PROFILE_TEMPLATE',
+  'default'
+)
+
+################################################################################
+#
+# Lazy importing of the ShotgunORM sub-modules.
+#
+# When enabled optional sub-modules such as the event watchers, script fields,
+# callbacks and the Shotgun Python API are imported the first time they are
+# used instead of when the ShotgunORM package is imported.
+#
+################################################################################
+
+LAZY_IMPORT = bool(
+  os.getenv('PY_SGORM_LAZY_IMPORT', True)
+)
+
+################################################################################
+#
+# N+1 query detection.
+#
+# Accessing an Entity field that has not been pulled inside of a loop queries
+# Shotgun once per Entity.  When N_PLUS_ONE_THRESHOLD single Entity pulls of the
+# same Entity type and fields happen within N_PLUS_ONE_WINDOW seconds a warning
+# is logged once per call-site with its stack.
+#
+# Detected patterns can be inspected with
+# ShotgunORM.SgField.__profiler__.detections().
+#
+################################################################################
+
+ENABLE_N_PLUS_ONE_DETECTION = bool(
+  os.getenv('PY_SGORM_ENABLE_N_PLUS_ONE_DETECTION', True)
+)
+
+N_PLUS_ONE_THRESHOLD = int(
+  os.getenv('PY_SGORM_N_PLUS_ONE_THRESHOLD', 10)
+)
+
+N_PLUS_ONE_WINDOW = float(
+  os.getenv('PY_SGORM_N_PLUS_ONE_WINDOW', 1.0)
+)
+
 ################################################################################
 #
 # Enables field names to be included in the results of dir(SgEntity).
@@ -120,6 +316,45 @@ ENTITY_DIR_INCLUDE_FIELDS = bool(
   os.getenv('PY_SGORM_ENTITY_DIR_INCLUDE_FIELDS', True)
 )
 
+################################################################################
+#
+# Limits of connection undo stacks.
+#
+# Undo stacks keep at most UNDO_MAX_ACTIONS actions, once the actions held in
+# memory exceed UNDO_MAX_BYTES the oldest are evicted.  When UNDO_SPILL_DIR is
+# set evicted actions are written to a temporary file in that directory instead
+# of being discarded.  Setting a limit to 0 disables it.
+#
+################################################################################
+
+UNDO_MAX_ACTIONS = int(
+  os.getenv('PY_SGORM_UNDO_MAX_ACTIONS', 100)
+)
+
+UNDO_MAX_BYTES = int(
+  os.getenv('PY_SGORM_UNDO_MAX_BYTES', 8388608)
+)
+
+UNDO_SPILL_DIR = os.getenv('PY_SGORM_UNDO_SPILL_DIR', None)
+
+################################################################################
+#
+# Default triggers for write-behind commit queues.
+#
+# See SgConnection.enableWriteBehind().  A queue flushes once it holds
+# WRITE_BEHIND_MAX_SIZE Entities or the oldest queued Entity has waited
+# WRITE_BEHIND_MAX_DELAY seconds, setting either to 0 disables that trigger.
+#
+################################################################################
+
+WRITE_BEHIND_MAX_DELAY = float(
+  os.getenv('PY_SGORM_WRITE_BEHIND_MAX_DELAY', 5.0)
+)
+
+WRITE_BEHIND_MAX_SIZE = int(
+  os.getenv('PY_SGORM_WRITE_BEHIND_MAX_SIZE', 500)
+)
+
 ################################################################################
 #
 # IMPORTANT!
@@ -521,6 +756,33 @@ user_cfg = os.path.sep.join([os.path.dirname(__file__), 'user.py'])
 if os.path.exists(user_cfg):
   import user
 
+ShotgunORM.setHotPathDebugging(ENABLE_HOT_PATH_DEBUG_LOGGING)
+
+################################################################################
+#
+# Load and apply the saved field query profiles.
+#
+################################################################################
+
+if FIELD_QUERY_PROFILE_FILE != None and os.path.exists(FIELD_QUERY_PROFILE_FILE):
+  try:
+    ShotgunORM.SgField.__profiler__.load(FIELD_QUERY_PROFILE_FILE)
+
+    # ShotgunORM.config is not set until this module finishes importing so the
+    # config values are passed explicitly.
+    if FIELD_QUERY_PROFILE_APPLY:
+      ShotgunORM.SgField.__profiler__.applyQueryTemplates(
+        FIELD_QUERY_PROFILE_TEMPLATE,
+        minCount=FIELD_QUERY_PROFILE_MIN_COUNT
+      )
+  except Exception, e:
+    ShotgunORM.LoggerField.error(
+      'unable to load field query profiles from "%s", %s' % (
+        FIELD_QUERY_PROFILE_FILE,
+        e
+      )
+    )
+
 ################################################################################
 #
 # CLEANUP
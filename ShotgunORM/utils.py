@@ -27,15 +27,22 @@
 __all__ = [
   'facilityNameFromUrl',
   'formatSerializable',
+  'fromJson',
   'mkEntityString',
   'mkEntityFieldString',
+  'openFile',
   'printSerializable',
   'sgApiInfo',
+  'toJson',
   'webUrlSgApi',
   'webUrlSgORM'
 ]
 
 # Python imports
+import bz2
+import datetime
+import gzip
+import json
 import re
 import webbrowser
 
@@ -63,6 +70,76 @@ def facilityNameFromUrl(url):
   else:
     return match.group(2)
 
+class SgUtcOffset(datetime.tzinfo):
+  '''
+  Fixed offset tzinfo used when decoding datetimes with fromJson().
+  '''
+
+  def __init__(self, secs):
+    self.__offset = datetime.timedelta(seconds=secs)
+
+  def __repr__(self):
+    return '<SgUtcOffset(%s)>' % self.__offset
+
+  def dst(self, dt):
+    return datetime.timedelta(0)
+
+  def tzname(self, dt):
+    return None
+
+  def utcoffset(self, dt):
+    return self.__offset
+
+JSON_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+def _jsonDefault(obj):
+  '''
+  Internal!
+
+  JSON encoder fallback for types the json module does not support.
+  '''
+
+  if isinstance(obj, datetime.datetime):
+    offset = obj.utcoffset()
+
+    if offset != None:
+      offset = offset.days * 86400 + offset.seconds
+
+    return {
+      '__datetime__': obj.replace(tzinfo=None).strftime(JSON_DATETIME_FORMAT),
+      'utcoffset': offset
+    }
+  elif isinstance(obj, datetime.date):
+    return {'__date__': obj.isoformat()}
+  elif isinstance(obj, (set, frozenset, tuple)):
+    return list(obj)
+
+  raise TypeError('%s is not JSON serializable' % repr(obj))
+
+def _jsonObjectHook(obj):
+  '''
+  Internal!
+
+  JSON decoder hook that restores the objects encoded by _jsonDefault().
+  '''
+
+  if '__datetime__' in obj:
+    result = datetime.datetime.strptime(
+      obj['__datetime__'],
+      JSON_DATETIME_FORMAT
+    )
+
+    offset = obj.get('utcoffset', None)
+
+    if offset != None:
+      result = result.replace(tzinfo=SgUtcOffset(offset))
+
+    return result
+  elif '__date__' in obj:
+    return datetime.datetime.strptime(obj['__date__'], '%Y-%m-%d').date()
+
+  return obj
+
 def formatDict(obj, indent=0, indentSize=2, indentChar=' '):
   if len(obj) <= 0:
     return '%s{}' % mkIndent(indent, indentSize, indentChar)
@@ -230,6 +307,17 @@ def formatSerializable(obj, indent=0, indentSize=2, indentChar=' '):
 #
 #print formatSerializable(logicalOp)
 
+def fromJson(data):
+  '''
+  Returns the Python object for the JSON string created by toJson().
+
+  Args:
+    * (str) data:
+      JSON string.
+  '''
+
+  return json.loads(data, object_hook=_jsonObjectHook)
+
 def mkEntityString(sgEntity):
   '''
   Returns a string formatted for the Entity.
@@ -288,6 +376,48 @@ def mkIndent(indent, indentSize, indentChar):
 
   return (indentChar * indentSize) * indent
 
+def openFile(filename, mode='r', compression=None):
+  '''
+  Opens the file and returns the file object.
+
+  Gzip and bzip2 compressed files are supported, when compression is None it is
+  determined by the files extension (".gz" or ".bz2").
+
+  Bzip2 files can not be appended to, opening one in an append mode raises a
+  ValueError.
+
+  Args:
+    * (str) filename:
+      Path to the file.
+
+    * (str) mode:
+      Mode the file is opened with.
+
+    * (str) compression:
+      Compression to use, "gzip", "bz2" or "none".
+  '''
+
+  if compression == None:
+    if filename.endswith('.gz'):
+      compression = 'gzip'
+    elif filename.endswith('.bz2'):
+      compression = 'bz2'
+    else:
+      compression = 'none'
+
+  if compression == 'gzip':
+    return gzip.open(filename, mode)
+  elif compression == 'bz2':
+    # Python 2 BZ2File has no append mode and crashes when given one.
+    if 'a' in mode:
+      raise ValueError('bz2 file "%s" can not be opened for append' % filename)
+
+    return bz2.BZ2File(filename, mode)
+  elif compression == 'none':
+    return open(filename, mode)
+
+  raise ValueError('unknown compression "%s"' % compression)
+
 def printSerializable(obj, indent=0, indentSize=2, indentChar=' '):
   '''
   Prints the serializable list/dict as a user friendly string better than pretty
@@ -319,6 +449,28 @@ def sgApiInfo():
 
   return ShotgunORM.SgApiInfo()
 
+def toJson(obj, sortKeys=False):
+  '''
+  Returns a compact JSON string for the serializable object.
+
+  Unlike json.dumps() datetime and date objects are supported and are restored
+  by fromJson().
+
+  Args:
+    * (obj) obj:
+      Serializable Python object
+
+    * (bool) sortKeys:
+      Sort the keys of dicts.
+  '''
+
+  return json.dumps(
+    obj,
+    default=_jsonDefault,
+    separators=(',', ':'),
+    sort_keys=sortKeys
+  )
+
 def webUrlSgApi(openInBrowser=False):
   '''
     Returns the Shotgun API URL.
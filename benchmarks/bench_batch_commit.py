@@ -0,0 +1,154 @@
+# Copyright (c) 2013, Nathan Dunsworth - NFXPlugins
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the NFXPlugins nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL NFXPLUGINS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+################################################################################
+#
+# Benchmark for SgConnection._batch()
+#
+# Commits batches of update requests through SgConnection._batch() with a
+# stand-in for the Shotgun server so only the ORM side of a commit is measured.
+# The per request cost should stay flat as the batch size grows.
+#
+# Usage:
+#   python benchmarks/bench_batch_commit.py [--sizes 1000,10000,50000]
+#
+################################################################################
+
+# Python imports
+import optparse
+import os
+import sys
+import time
+
+sys.path.insert(
+  0,
+  os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+# This module imports
+import ShotgunORM
+
+class BenchConnection(object):
+  '''
+  Connection that runs the real SgConnection commit path and answers batch
+  requests locally.
+  '''
+
+  _batch = ShotgunORM.SgConnection._batch.im_func
+  _batchChunks = ShotgunORM.SgConnection._batchChunks.im_func
+  _sg_batch_chunks = ShotgunORM.SgConnection._sg_batch_chunks.im_func
+
+  def __init__(self):
+    # Undo is disabled the same as a default SgConnection.
+    self.__undo = ShotgunORM.SgUndo(self)
+
+  def _sg_batch(self, requests):
+    result = []
+
+    for request in requests:
+      data = {
+        'type': request['entity_type'],
+        'id': request['entity_id']
+      }
+
+      data.update(request['data'])
+
+      result.append(data)
+
+    return result
+
+  def undo(self):
+    return self.__undo
+
+class BenchEntity(object):
+  '''
+  Entity stand-in that records the result slice it is handed.
+  '''
+
+  __slots__ = ['batchData', 'result']
+
+  def __init__(self, entityId):
+    self.batchData = [
+      {
+        'request_type': 'update',
+        'entity_type': 'Shot',
+        'entity_id': entityId,
+        'data': {
+          'description': 'benchmark %d' % entityId
+        }
+      }
+    ]
+
+    self.result = None
+
+  def afterCommit(self, sgBatchData, sgBatchResult, sgCommitData, sgDryRun, sgCommitError=None):
+    self.result = sgBatchResult
+
+  def beforeCommit(self, sgBatchData, sgCommitData, sgDryRun):
+    pass
+
+def benchmark(size):
+  connection = BenchConnection()
+
+  entities = [BenchEntity(i) for i in xrange(size)]
+
+  requests = [{'entity': i, 'batch_data': i.batchData} for i in entities]
+
+  start = time.time()
+
+  result = connection._batch(requests, False)
+
+  elapsed = time.time() - start
+
+  if len(result) != size:
+    raise RuntimeError('expected %d results got %d' % (size, len(result)))
+
+  for entity in entities:
+    if entity.result[0]['id'] != entity.batchData[0]['entity_id']:
+      raise RuntimeError('result routed to the wrong Entity')
+
+  return elapsed
+
+def main():
+  parser = optparse.OptionParser()
+
+  parser.add_option(
+    '--sizes',
+    default='1000,10000,50000',
+    help='comma separated list of batch sizes'
+  )
+
+  options, args = parser.parse_args()
+
+  print '%10s %12s %16s' % ('requests', 'seconds', 'usec/request')
+
+  for size in [int(i) for i in options.sizes.split(',')]:
+    elapsed = benchmark(size)
+
+    print '%10d %12.4f %16.2f' % (size, elapsed, elapsed / size * 1000000.0)
+
+if __name__ == '__main__':
+  main()
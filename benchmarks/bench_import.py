@@ -0,0 +1,133 @@
+# Copyright (c) 2013, Nathan Dunsworth - NFXPlugins
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the NFXPlugins nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL NFXPLUGINS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+################################################################################
+#
+# Import time benchmark of the ShotgunORM package.
+#
+# Imports ShotgunORM in fresh interpreters with lazy importing enabled and
+# disabled (config.LAZY_IMPORT) and reports the import time and the number of
+# ShotgunORM sub-modules loaded.
+#
+# The eager mode imports the Shotgun Python API, if it is not installed only
+# the lazy mode is reported.
+#
+# Usage:
+#   python benchmarks/bench_import.py [--repeat 10]
+#
+################################################################################
+
+# Python imports
+import optparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Executed by each child interpreter, prints the import seconds and the number
+# of loaded ShotgunORM sub-modules.
+CHILD_SCRIPT = '''
+import sys
+import time
+
+sys.path.insert(0, %r)
+
+start = time.time()
+
+import ShotgunORM
+
+elapsed = time.time() - start
+
+print elapsed, len(
+  [x for x in sys.modules if x.startswith('ShotgunORM.') and sys.modules[x]]
+)
+''' % ROOT
+
+MODES = [
+  ('lazy', '1'),
+  ('eager', '')
+]
+
+def importOnce(lazyImport):
+  '''
+  Imports ShotgunORM in a new interpreter and returns the import seconds and
+  the number of sub-modules loaded.
+  '''
+
+  env = dict(os.environ)
+
+  env['PY_SGORM_LAZY_IMPORT'] = lazyImport
+
+  proc = subprocess.Popen(
+    [sys.executable, '-c', CHILD_SCRIPT],
+    env=env,
+    stdout=subprocess.PIPE,
+    stderr=subprocess.PIPE
+  )
+
+  out, err = proc.communicate()
+
+  if proc.returncode != 0:
+    raise RuntimeError(err.strip().splitlines()[-1])
+
+  seconds, modules = out.split()
+
+  return float(seconds), int(modules)
+
+def main():
+  parser = optparse.OptionParser()
+
+  parser.add_option(
+    '--repeat',
+    type='int',
+    default=10,
+    help='number of imports per mode'
+  )
+
+  options, args = parser.parse_args()
+
+  print '%-8s %12s %12s %10s' % ('mode', 'min ms', 'median ms', 'modules')
+
+  for name, lazyImport in MODES:
+    try:
+      runs = [importOnce(lazyImport) for i in xrange(options.repeat)]
+    except RuntimeError, e:
+      print '%-8s failed: %s' % (name, e)
+
+      continue
+
+    times = sorted([x[0] * 1000.0 for x in runs])
+
+    print '%-8s %12.2f %12.2f %10d' % (
+      name,
+      times[0],
+      times[len(times) / 2],
+      runs[-1][1]
+    )
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,606 @@
+# Copyright (c) 2013, Nathan Dunsworth - NFXPlugins
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the NFXPlugins nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL NFXPLUGINS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+################################################################################
+#
+# End-to-end benchmark suite for the ORM hot paths.
+#
+# Runs offline against ShotgunORM.SgMockConnection and reports the ops/sec,
+# memory per Entity and Shotgun API request counts of each benchmark.  Results
+# can be saved as a JSON baseline and later runs compared against it.
+#
+# Usage:
+#   python benchmarks/bench_orm.py [--size 1000] [--ops 1000] [--latency 0.0]
+#     [--only find,batch_commit] [--repeat 3] [--save baseline.json]
+#     [--compare baseline.json]
+#
+################################################################################
+
+# Python imports
+import datetime
+import gc
+import itertools
+import json
+import logging
+import optparse
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(
+  0,
+  os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+# This module imports
+import ShotgunORM
+
+BENCH_URL = 'https://bench.shotgunstudio.com'
+
+# Numbers each batch commit run so every run writes new values.
+BATCH_COMMIT_RUNS = itertools.count(1)
+
+def rss():
+  '''
+  Returns the resident memory of the process in bytes.
+  '''
+
+  try:
+    with open('/proc/self/statm', 'r') as fh:
+      return int(fh.read().split()[1]) * resource.getpagesize()
+  except (IOError, OSError):
+    # Peak usage is the best available without /proc.
+    maxRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    if sys.platform == 'darwin':
+      return maxRss
+
+    return maxRss * 1024
+
+class BenchEventHandler(ShotgunORM.SgEventHandler):
+  '''
+  Handler that counts the events it processes.
+  '''
+
+  def __init__(self):
+    super(BenchEventHandler, self).__init__()
+
+    self.count = 0
+
+  def processEvent(self, sgEvent):
+    self.count += 1
+
+def benchEntityCreate(connection, ops):
+  factory = connection.classFactory()
+
+  entities = []
+
+  gc.collect()
+
+  memStart = rss()
+  start = time.time()
+
+  for i in xrange(ops):
+    entities.append(
+      factory.createEntity(
+        'Shot',
+        {
+          'type': 'Shot',
+          'id': i + 1,
+          'code': 'SH%05d' % (i + 1),
+          'sg_status_list': 'ip'
+        }
+      )
+    )
+
+  elapsed = time.time() - start
+
+  return {
+    'ops': ops,
+    'seconds': elapsed,
+    'bytes_per_entity': (rss() - memStart) / float(ops)
+  }
+
+def benchEntityCreateLogging(connection, ops, hotPathDebugging):
+  '''
+  Creates Entities through SgConnection._createEntity() with the connection
+  logger at the DEBUG level and its output discarded.
+  '''
+
+  logger = ShotgunORM.LoggerConnection
+
+  level = logger.level
+  stream = logger._logStreamHandler.stream
+  debugging = ShotgunORM.isHotPathDebugging()
+
+  devnull = open(os.devnull, 'w')
+
+  logger.setLevel(logging.DEBUG)
+  logger._logStreamHandler.stream = devnull
+
+  ShotgunORM.setHotPathDebugging(hotPathDebugging)
+
+  try:
+    start = time.time()
+
+    for i in xrange(ops):
+      connection._createEntity(
+        'Shot',
+        {
+          'type': 'Shot',
+          'id': i + 1,
+          'code': 'SH%05d' % (i + 1),
+          'sg_status_list': 'ip'
+        }
+      )
+
+    elapsed = time.time() - start
+  finally:
+    ShotgunORM.setHotPathDebugging(debugging)
+
+    logger._logStreamHandler.stream = stream
+    logger.setLevel(level)
+
+    devnull.close()
+
+  return {
+    'ops': ops,
+    'seconds': elapsed
+  }
+
+def benchEntityCreateDebugOn(connection, ops):
+  return benchEntityCreateLogging(connection, ops, True)
+
+def benchEntityCreateDebugOff(connection, ops):
+  return benchEntityCreateLogging(connection, ops, False)
+
+def benchAttributeAccess(connection, ops):
+  entity = connection.classFactory().createEntity(
+    'Shot',
+    {
+      'type': 'Shot',
+      'id': 1,
+      'code': 'SH00001',
+      'sg_status_list': 'ip'
+    }
+  )
+
+  start = time.time()
+
+  for i in xrange(ops):
+    entity.code
+    entity.id
+    entity.sg_status_list
+    entity.connection()
+
+  return {
+    'ops': ops * 4,
+    'seconds': time.time() - start
+  }
+
+def benchFind(connection, ops):
+  start = time.time()
+
+  result = connection.find(
+    'Shot',
+    [],
+    ['code', 'sg_cut_in', 'sg_cut_out', 'sg_sequence', 'sg_status_list'],
+    limit=ops
+  )
+
+  return {
+    'ops': len(result),
+    'seconds': time.time() - start
+  }
+
+def benchQueryEngine(connection, ops):
+  entities = connection.find('Shot', [], ['code'], limit=ops)
+
+  fields = ['description', 'sg_cut_in', 'sg_cut_out']
+
+  qEngine = connection.queryEngine()
+
+  start = time.time()
+
+  qEngine.block()
+
+  try:
+    for entity in entities:
+      entity.sync(fields, backgroundPull=True)
+  finally:
+    qEngine.unblock()
+
+  # Reading the values blocks until the background pulls finish.
+  for entity in entities:
+    for field in fields:
+      entity[field]
+
+  return {
+    'ops': len(entities),
+    'seconds': time.time() - start
+  }
+
+def benchParseLogicalOp(connection, ops):
+  entityInfo = connection.schema().entityInfo('Shot')
+
+  # Only use field types the script engine has script fields for.
+  searchExp = (
+    'code.startswith("SH0") and sg_cut_in > 10 or '
+    'description.contains("Shot") and id in [1, 2, 3]'
+  )
+
+  start = time.time()
+
+  for i in xrange(ops):
+    ShotgunORM.parseToLogicalOp(entityInfo, searchExp)
+
+  return {
+    'ops': ops,
+    'seconds': time.time() - start
+  }
+
+def benchSchemaCache(connection, ops):
+  tmpDir = tempfile.mkdtemp(prefix='sgorm_bench_')
+
+  try:
+    path = os.path.join(tmpDir, 'schema.xml')
+
+    connection.schema().export(path)
+
+    loads = max(1, ops / 100)
+
+    start = time.time()
+
+    for i in xrange(loads):
+      ShotgunORM.SgSchema(BENCH_URL)._fromXML(path)
+
+    return {
+      'ops': loads,
+      'seconds': time.time() - start
+    }
+  finally:
+    shutil.rmtree(tmpDir, True)
+
+def benchBatchCommit(connection, ops):
+  entities = connection.find('Shot', [], ['description'], limit=ops)
+
+  # Writing the values of a previous run would leave nothing to commit.
+  runId = next(BATCH_COMMIT_RUNS)
+
+  for entity in entities:
+    entity['description'] = 'benchmark %d run %d' % (entity['id'], runId)
+
+  start = time.time()
+
+  connection.batch(entities)
+
+  seconds = time.time() - start
+
+  if not connection.database().requestCounts().get('batch', 0):
+    raise RuntimeError('batch commit did not send a batch request')
+
+  return {
+    'ops': len(entities),
+    'seconds': seconds
+  }
+
+def benchEventWatcher(connection, ops):
+  '''
+  Replays EventLogEntrys from a file through a running watcher so the event
+  source, the paging of fetched batches and the handlers are all measured.
+  '''
+
+  tmpDir = tempfile.mkdtemp(prefix='sgorm_bench_')
+
+  try:
+    path = os.path.join(tmpDir, 'events.jsonl')
+
+    createdAt = datetime.datetime.now()
+
+    with open(path, 'w') as fh:
+      for i in xrange(ops):
+        fh.write(
+          ShotgunORM.toJson(
+            {
+              'type': 'EventLogEntry',
+              'id': i + 1,
+              'attribute_name': 'sg_status_list',
+              'created_at': createdAt,
+              'entity': {'type': 'Shot', 'id': (i % 100) + 1},
+              'event_type': 'Shotgun_Shot_Change',
+              'meta': {
+                'attribute_name': 'sg_status_list',
+                'entity_id': (i % 100) + 1,
+                'entity_type': 'Shot',
+                'new_value': 'ip',
+                'old_value': 'wtg',
+                'type': 'attribute_change'
+              },
+              'project': {'type': 'Project', 'id': 1},
+              'user': {'type': 'HumanUser', 'id': 1}
+            }
+          ) + '\n'
+        )
+
+    watcher = ShotgunORM.SgEventWatcher(
+      connection,
+      ShotgunORM.SgEventWatcher.FIRST_EVENT,
+      sgEventSource=ShotgunORM.SgEventReplaySource(path, connection)
+    )
+
+    handler = BenchEventHandler()
+
+    watcher.addHandler(handler)
+
+    start = time.time()
+
+    # Replay sources are not live, the watcher stops once the file is drained.
+    watcher.start()
+    watcher.wait()
+
+    elapsed = time.time() - start
+
+    watcher.eventSource().close()
+  finally:
+    shutil.rmtree(tmpDir, True)
+
+  if handler.count != ops:
+    raise RuntimeError('expected %d handled events got %d' % (ops, handler.count))
+
+  return {
+    'ops': ops,
+    'seconds': elapsed
+  }
+
+BENCHMARKS = [
+  ('entity_create', benchEntityCreate),
+  ('entity_create_debug_on', benchEntityCreateDebugOn),
+  ('entity_create_debug_off', benchEntityCreateDebugOff),
+  ('attribute_access', benchAttributeAccess),
+  ('find', benchFind),
+  ('query_engine', benchQueryEngine),
+  ('parse_logical_op', benchParseLogicalOp),
+  ('schema_cache', benchSchemaCache),
+  ('batch_commit', benchBatchCommit),
+  ('event_watcher', benchEventWatcher)
+]
+
+def connect(database, url=BENCH_URL):
+  '''
+  Returns a SgMockConnection to the database once its schema and class factory
+  are built.
+
+  Connections are shared by url so each database needs its own url.
+  '''
+
+  connection = ShotgunORM.SgMockConnection(
+    url,
+    'bench',
+    'bench',
+    sgDatabase=database
+  )
+
+  timeout = time.time() + ShotgunORM.SgSchema.BUILD_EVENT_TIMEOUT
+
+  while not (
+    connection.schema().isInitialized() and
+    connection.classFactory().isInitialized()
+  ):
+    if time.time() > timeout:
+      raise RuntimeError('timed out waiting for the schema to build')
+
+    time.sleep(0.01)
+
+  # Caching would let repeated runs reuse Entities from the previous run.
+  connection.disableCaching()
+
+  return connection
+
+def run(connection, database, func, ops, repeat):
+  '''
+  Runs the benchmark repeat times and returns the result of the fastest run.
+  '''
+
+  best = None
+
+  for i in xrange(repeat):
+    gc.collect()
+
+    database.resetRequestCounts()
+
+    result = func(connection, ops)
+
+    result['requests'] = database.requestCounts()
+
+    if best == None or result['seconds'] < best['seconds']:
+      best = result
+
+  if best['seconds'] > 0:
+    best['ops_per_sec'] = best['ops'] / best['seconds']
+  else:
+    best['ops_per_sec'] = 0.0
+
+  return best
+
+def compare(results, baseline):
+  print
+  print '%-24s %14s %14s %9s' % ('benchmark', 'baseline/s', 'current/s', 'change')
+
+  for name, func in BENCHMARKS:
+    if not results.has_key(name) or not baseline['results'].has_key(name):
+      continue
+
+    old = baseline['results'][name]['ops_per_sec']
+    new = results[name]['ops_per_sec']
+
+    if old > 0:
+      change = '%+8.1f%%' % ((new - old) / old * 100.0)
+    else:
+      change = '%9s' % 'n/a'
+
+    print '%-24s %14.1f %14.1f %s' % (name, old, new, change)
+
+def main():
+  parser = optparse.OptionParser()
+
+  parser.add_option(
+    '--size',
+    type='int',
+    default=1000,
+    help='number of Shots in the mock database'
+  )
+
+  parser.add_option(
+    '--ops',
+    type='int',
+    default=1000,
+    help='number of operations per benchmark'
+  )
+
+  parser.add_option(
+    '--latency',
+    type='float',
+    default=0.0,
+    help='seconds each mock Shotgun request sleeps for'
+  )
+
+  parser.add_option(
+    '--seed',
+    type='int',
+    default=0,
+    help='seed used to generate the mock database'
+  )
+
+  parser.add_option(
+    '--repeat',
+    type='int',
+    default=3,
+    help='number of runs per benchmark, the fastest is reported'
+  )
+
+  parser.add_option(
+    '--only',
+    default=None,
+    help='comma separated list of benchmarks to run'
+  )
+
+  parser.add_option(
+    '--save',
+    default=None,
+    help='save the results as a JSON baseline'
+  )
+
+  parser.add_option(
+    '--compare',
+    default=None,
+    help='compare the results against a JSON baseline'
+  )
+
+  options, args = parser.parse_args()
+
+  names = [x[0] for x in BENCHMARKS]
+
+  if options.only != None:
+    names = [x.strip() for x in options.only.split(',')]
+
+    for name in names:
+      if name not in dict(BENCHMARKS):
+        parser.error('unknown benchmark "%s"' % name)
+
+  database = ShotgunORM.SgMockDatabase(
+    size=options.size,
+    seed=options.seed,
+    latency=options.latency
+  )
+
+  connection = connect(database)
+
+  results = {}
+
+  print '%-24s %10s %12s %14s %12s  %s' % (
+    'benchmark',
+    'ops',
+    'seconds',
+    'ops/sec',
+    'bytes/entity',
+    'requests'
+  )
+
+  for name, func in BENCHMARKS:
+    if name not in names:
+      continue
+
+    result = run(connection, database, func, options.ops, options.repeat)
+
+    results[name] = result
+
+    bytesPerEntity = result.get('bytes_per_entity', None)
+
+    if bytesPerEntity == None:
+      bytesPerEntity = '-'
+    else:
+      bytesPerEntity = '%.0f' % bytesPerEntity
+
+    print '%-24s %10d %12.4f %14.1f %12s  %s' % (
+      name,
+      result['ops'],
+      result['seconds'],
+      result['ops_per_sec'],
+      bytesPerEntity,
+      ', '.join(
+        ['%s=%d' % (k, v) for k, v in sorted(result['requests'].items())]
+      )
+    )
+
+  if options.compare != None:
+    with open(options.compare, 'r') as fh:
+      compare(results, json.load(fh))
+
+  if options.save != None:
+    baseline = {
+      'orm_version': ShotgunORM.__version__,
+      'python': platform.python_version(),
+      'platform': platform.platform(),
+      'timestamp': str(datetime.datetime.now()),
+      'options': {
+        'size': options.size,
+        'ops': options.ops,
+        'latency': options.latency,
+        'seed': options.seed,
+        'repeat': options.repeat
+      },
+      'results': results
+    }
+
+    with open(options.save, 'w') as fh:
+      json.dump(baseline, fh, indent=2, sort_keys=True)
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,382 @@
+# Copyright (c) 2013, Nathan Dunsworth - NFXPlugins
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#     * Redistributions of source code must retain the above copyright
+#       notice, this list of conditions and the following disclaimer.
+#     * Redistributions in binary form must reproduce the above copyright
+#       notice, this list of conditions and the following disclaimer in the
+#       documentation and/or other materials provided with the distribution.
+#     * Neither the name of the NFXPlugins nor the names of its contributors
+#       may be used to endorse or promote products derived from this software
+#       without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL NFXPLUGINS BE LIABLE FOR ANY
+# DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+# (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+# ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+# SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+################################################################################
+#
+# Offline correctness checks for the ORM.
+#
+# Runs against ShotgunORM.SgMockConnection and verifies behavior that is not
+# visible from the benchmarks alone, such as the state Entities are left in when
+# a batch chunk fails.  Exits with a non-zero status if any check fails.
+#
+# Usage:
+#   python benchmarks/check_orm.py [--only failed_batch_chunk]
+#
+################################################################################
+
+# Python imports
+import json
+import optparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, ROOT)
+
+# This module imports
+import ShotgunORM
+
+from bench_orm import connect
+
+def check(condition, msg):
+  if not condition:
+    raise AssertionError(msg)
+
+def runChild(script, env=None):
+  '''
+  Runs the script in a new interpreter with ShotgunORM importable and returns
+  its stdout.
+  '''
+
+  childEnv = dict(os.environ)
+
+  if env != None:
+    childEnv.update(env)
+
+  proc = subprocess.Popen(
+    [sys.executable, '-c', 'import sys\nsys.path.insert(0, %r)\n%s' % (ROOT, script)],
+    env=childEnv,
+    stdout=subprocess.PIPE,
+    stderr=subprocess.PIPE
+  )
+
+  out, err = proc.communicate()
+
+  if proc.returncode != 0:
+    raise RuntimeError(err.strip().splitlines()[-1])
+
+  return out
+
+def checkCommitQueueFailure(connection):
+  '''
+  An Entity that fails to build its commit when the write-behind queue flushes
+  keeps its modifications while the other queued Entities are committed.
+  '''
+
+  def raiseError(*args):
+    raise RuntimeError('check')
+
+  connection.enableWriteBehind(maxSize=0, maxDelay=0)
+
+  entities = connection.find('Shot', [], ['description'], limit=3)
+
+  for entity in entities:
+    entity['description'] = 'check %d' % entity['id']
+
+    entity.commit()
+
+  entities[0].toBatchData = raiseError
+  entities[2].beforeCommit = raiseError
+
+  try:
+    connection.commitQueue().flush()
+  except RuntimeError:
+    pass
+  else:
+    raise AssertionError('flush did not raise for the failed Entities')
+
+  check(len(connection.commitQueue()) == 0, 'queue was not emptied')
+
+  records = connection.database()._tables['Shot']
+
+  for entity in entities:
+    committed = records[entity['id']]['description'] == entity['description']
+
+    if entity is entities[1]:
+      check(committed, '%s was not committed' % entity)
+    else:
+      check(not committed, '%s was committed' % entity)
+      check(
+        entity.field('description').hasCommit(),
+        '%s lost its pending commit' % entity
+      )
+
+def checkFailedBatchChunk(connection):
+  '''
+  A failed batch chunk leaves its Entities with their pending commits intact
+  while the Entities of the successful chunks are committed.
+  '''
+
+  entities = connection.find('Shot', [], ['description'], limit=4)
+
+  check(len(entities) == 4, 'expected 4 Shots got %d' % len(entities))
+
+  for entity in entities:
+    entity['description'] = 'check %d' % entity['id']
+
+  # Remove one Shot from the database so its chunk fails.
+  failed = entities[2]
+
+  connection.database()._tables['Shot'].pop(failed['id'])
+
+  try:
+    connection.batch(entities, sgChunkSize=1, sgMaxWorkers=1)
+  except ValueError:
+    pass
+  else:
+    raise AssertionError('batch did not raise for the failed chunk')
+
+  for entity in entities:
+    field = entity.field('description')
+
+    check(not entity.isCommitting(), '%s is still committing' % entity)
+    check(not field.isCommitting(), '%s field is still committing' % entity)
+
+    if entity is failed:
+      check(field.hasCommit(), '%s lost its pending commit' % entity)
+    else:
+      check(not field.hasCommit(), '%s was not committed' % entity)
+
+def checkQueryProfileTemplates(connection):
+  '''
+  A saved field query profile is applied to the default query template when
+  the package is imported.
+  '''
+
+  tmpDir = tempfile.mkdtemp()
+
+  try:
+    filename = os.path.join(tmpDir, 'profiles.json')
+
+    with open(filename, 'w') as fh:
+      json.dump(
+        {
+          'https://check.shotgunstudio.com': {
+            'Shot': {
+              'description': 5,
+              'sg_cut_in': 1
+            }
+          }
+        },
+        fh
+      )
+
+    script = (
+      'import json, ShotgunORM\n'
+      'print json.dumps('
+      'sorted(ShotgunORM.SgSchema.defaultEntityQueryFields(\'default\', \'Shot\')))'
+    )
+
+    before = json.loads(runChild(script))
+    after = json.loads(
+      runChild(
+        script,
+        {
+          'PY_SGORM_FIELD_QUERY_PROFILE_FILE': filename,
+          'PY_SGORM_FIELD_QUERY_PROFILE_MIN_COUNT': '2'
+        }
+      )
+    )
+  finally:
+    shutil.rmtree(tmpDir, True)
+
+  check('description' not in before, 'description is already a default field')
+  check('description' in after, 'profile was not applied: %s' % after)
+  check('sg_cut_in' not in after, 'field below the min count was applied')
+  check(set(before).issubset(after), 'template fields were replaced')
+
+def checkReplayNewProcess(connection):
+  '''
+  A recording replays in a new process where the schema has to be built from
+  the recording.
+  '''
+
+  tmpDir = tempfile.mkdtemp()
+
+  try:
+    filename = os.path.join(tmpDir, 'requests.sgrec')
+
+    filters = [['id', 'less_than', 4]]
+
+    connection.startRecording(filename)
+
+    try:
+      expected = sorted([x['code'] for x in connection.find('Shot', filters, ['code'])])
+    finally:
+      connection.stopRecording()
+
+    script = (
+      'import json, time, ShotgunORM\n'
+      'sg = ShotgunORM.SgReplayConnection(\n'
+      '  \'https://replay.shotgunstudio.com\', \'check\', \'check\',\n'
+      '  ShotgunORM.SgRequestReplay(%r)\n'
+      ')\n'
+      'timeout = time.time() + 30\n'
+      'while not sg.classFactory().isInitialized() and time.time() < timeout:\n'
+      '  time.sleep(0.01)\n'
+      'print json.dumps(sorted([x[\'code\'] for x in sg.find(\'Shot\', %r, [\'code\'])]))'
+    ) % (filename, filters)
+
+    result = json.loads(runChild(script))
+  finally:
+    shutil.rmtree(tmpDir, True)
+
+  check(len(expected) == 3, 'expected 3 Shots got %d' % len(expected))
+  check(result == expected, 'replay returned %s expected %s' % (result, expected))
+
+def checkEntityViews(connection):
+  '''
+  Views compare equal to themselves and their Entity and can be used as search
+  filter values.
+  '''
+
+  filters = [['id', 'is', 1]]
+
+  view = connection.find('Shot', filters, ['code'], readOnly=True)[0]
+  other = connection.find('Shot', filters, ['code'], readOnly=True)[0]
+  entity = connection.findOne('Shot', filters, ['code'])
+
+  check(view == view, 'view does not equal itself')
+  check(view == other, 'views of the same Entity are not equal')
+  check(len(set([view, other])) == 1, 'set kept both views of the same Entity')
+  check(view in [other], 'view not found in a list of its equal')
+  check(view == entity and entity == view, 'view does not equal its Entity')
+
+  expected = connection.find('Task', [['entity', 'is', entity]], ['content'])
+  result = connection.find('Task', [['entity', 'is', view]], ['content'])
+
+  check(len(expected) > 0, 'no Tasks linked to %s' % entity)
+  check(
+    sorted([x['id'] for x in result]) == sorted([x['id'] for x in expected]),
+    'view filter returned %d Tasks expected %d' % (len(result), len(expected))
+  )
+
+def checkLazyModuleAttributes(connection):
+  '''
+  The lazily imported attributes of each lazy module match the modules
+  __all__.
+  '''
+
+  script = (
+    'import json, sys, ShotgunORM\n'
+    'result = {}\n'
+    'for name, attrs, flag in ShotgunORM._LAZY_MODULES:\n'
+    '  ShotgunORM._importLazyModule(name)\n'
+    '  module = sys.modules[\'ShotgunORM.\' + name]\n'
+    '  if set(attrs) != set(module.__all__):\n'
+    '    result[name] = sorted(set(attrs) ^ set(module.__all__))\n'
+    'print json.dumps(result)'
+  )
+
+  result = json.loads(runChild(script, {'PY_SGORM_LAZY_IMPORT': '1'}))
+
+  for name, attrs in sorted(result.items()):
+    check(False, '%s attributes differ from its __all__: %s' % (name, attrs))
+
+def checkLazySubmoduleImport(connection):
+  '''
+  Explicitly importing a lazy sub-module that shares its name with an exported
+  class keeps the class bound to the package.
+  '''
+
+  script = (
+    'import json, ShotgunORM\n'
+    'import ShotgunORM.SgEventWatcher\n'
+    'import ShotgunORM.SgEventWatcherHub\n'
+    'import ShotgunORM.SgScriptField\n'
+    'import ShotgunORM.SgScriptFields\n'
+    'from ShotgunORM.SgEventWatcher import SgEventHandler\n'
+    'print json.dumps([\n'
+    '  isinstance(getattr(ShotgunORM, x), type) for x in [\n'
+    '    \'SgEventWatcher\', \'SgEventWatcherHub\', \'SgScriptField\'\n'
+    '  ]\n'
+    '])'
+  )
+
+  result = json.loads(runChild(script, {'PY_SGORM_LAZY_IMPORT': '1'}))
+
+  check(all(result), 'sub-module bound over its class: %s' % result)
+
+CHECKS = [
+  ('failed_batch_chunk', checkFailedBatchChunk),
+  ('commit_queue_failure', checkCommitQueueFailure),
+  ('query_profile_templates', checkQueryProfileTemplates),
+  ('replay_new_process', checkReplayNewProcess),
+  ('entity_views', checkEntityViews),
+  ('lazy_module_attributes', checkLazyModuleAttributes),
+  ('lazy_submodule_import', checkLazySubmoduleImport)
+]
+
+def main():
+  parser = optparse.OptionParser()
+
+  parser.add_option(
+    '--only',
+    default=None,
+    help='comma separated list of checks to run'
+  )
+
+  options, args = parser.parse_args()
+
+  names = [x[0] for x in CHECKS]
+
+  if options.only != None:
+    names = [x.strip() for x in options.only.split(',')]
+
+    for name in names:
+      if name not in dict(CHECKS):
+        parser.error('unknown check "%s"' % name)
+
+  failures = 0
+
+  for name, func in CHECKS:
+    if not name in names:
+      continue
+
+    # Each check gets its own database so checks can modify it freely.
+    connection = connect(
+      ShotgunORM.SgMockDatabase(size=100),
+      'https://check-%s.shotgunstudio.com' % name.replace('_', '-')
+    )
+
+    try:
+      func(connection)
+    except Exception, e:
+      failures += 1
+
+      print '%-24s FAIL %s: %s' % (name, type(e).__name__, e)
+    else:
+      print '%-24s ok' % name
+
+  if failures > 0:
+    sys.exit(1)
+
+if __name__ == '__main__':
+  main()